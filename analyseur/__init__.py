@@ -0,0 +1,4 @@
+"""
+Analyseur Conformité - logique métier partagée par les apps Streamlit.
+Ce paquet ne dépend ni de streamlit ni de reportlab à l'import.
+"""
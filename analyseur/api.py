@@ -0,0 +1,249 @@
+"""
+API HTTP de scoring du Quiz AI Act, sans session Streamlit.
+
+Usage :
+    python -m analyseur.api --port 8080 --workers 1
+    curl -s localhost:8080/score -d '{"q1": 0, "q2": 1, ..., "q10": 2}'
+
+Routes :
+- POST /score        une soumission -> score, catégorie, recommandations
+- POST /score/batch  tableau de soumissions (ou {"submissions": [...]})
+- POST /report       une soumission (+ company_name, company_sector, company_size) -> PDF
+- GET  /health       vérification de vie
+
+Une soumission contient les réponses q1..q10 en libellés ou en indices
+d'option, comme pour `python -m analyseur.score`. Le service est sans état :
+chaque requête est indépendante, on peut lancer plusieurs processus
+(--workers) ou répliques derrière un équilibreur. Connexions HTTP/1.1
+keep-alive ; reportlab n'est importé qu'à la première requête /report.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+from analyseur.recommendations import get_recommendations
+from analyseur.score import InvalidAnswer, to_responses
+from analyseur.scoring import calculate_score, get_category
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = int(os.getenv("API_MAX_BATCH", "1000"))
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    # RECOMMENDATIONS est figé en MappingProxyType
+    try:
+        return dict(value)
+    except (TypeError, ValueError):
+        raise TypeError(f"{type(value).__name__} non sérialisable")
+
+
+def score_submission(submission, id_field="id"):
+    """Résultat JSON d'une soumission : id (si présent), score, catégorie, recommandations."""
+    if not isinstance(submission, dict):
+        raise TypeError(f"objet JSON attendu, reçu {type(submission).__name__}")
+    responses = to_responses(submission)
+    score = calculate_score(responses)
+    category = get_category(score)
+    result = {}
+    if id_field in submission:
+        result[id_field] = submission[id_field]
+    result.update(score=score, category=category,
+                  recommendations=get_recommendations(score, responses, category))
+    return result
+
+
+def score_batch_submissions(submissions, id_field="id"):
+    """Résultats d'un lot ; une soumission invalide donne une ligne d'erreur sans bloquer le lot."""
+    results = []
+    for index, submission in enumerate(submissions):
+        try:
+            results.append(score_submission(submission, id_field))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            error = {"index": index, "error": f"{type(e).__name__}: {e}"}
+            if isinstance(submission, dict) and id_field in submission:
+                error[id_field] = submission[id_field]
+            results.append(error)
+    return results
+
+
+def render_report(submission):
+    """(nom de fichier, PDF) pour une soumission ; import de reportlab au premier appel."""
+    from analyseur.report import get_quiz_report
+
+    score = calculate_score(to_responses(submission))
+    category = get_category(score)
+    company = [str(submission.get(field) or "") for field in ("company_name", "company_sector", "company_size")]
+    pdf_bytes = get_quiz_report(score, category, *company)
+    # même nom que le téléchargement du quiz (app.py)
+    filename = f"rapport_ai_act_{company[0].replace(' ', '_') if company[0] else 'conforme'}.pdf"
+    return filename, pdf_bytes
+
+
+def content_disposition(filename):
+    """
+    En-tête Content-Disposition d'une pièce jointe : filename ASCII réduit à [A-Za-z0-9_-]
+    (ni guillemets ni CRLF possibles), nom d'origine en UTF-8 dans filename* (RFC 5987).
+    """
+    stem, dot, extension = filename.rpartition(".")
+    if not dot:
+        stem, extension = filename, ""
+    safe = _UNSAFE_FILENAME.sub("_", stem).strip("_") or "rapport"
+    safe_extension = _UNSAFE_FILENAME.sub("", extension)
+    safe += f".{safe_extension}" if safe_extension else ""
+    return f"attachment; filename=\"{safe}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # En-têtes et corps partent en deux écritures : sans TCP_NODELAY, Nagle et
+    # l'ACK retardé du client ajoutent ~40 ms par réponse sur une connexion réutilisée
+    disable_nagle_algorithm = True
+    server_version = "AnalyseurAPI/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body, content_type, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self._send(status, data, "application/json; charset=utf-8")
+
+    def _read_json(self):
+        raw_length = (self.headers.get("Content-Length") or "0").strip()
+        if not raw_length.isdigit():
+            # Longueur illisible (ou négative) : le corps ne peut pas être délimité, la connexion
+            # est fermée pour que ses octets ne soient pas lus comme la requête suivante
+            self.close_connection = True
+            raise RequestError(400, f"Content-Length invalide : {raw_length!r}")
+        length = int(raw_length)
+        if length > MAX_BODY_BYTES:
+            # Corps non lu : la connexion ne peut pas être réutilisée
+            self.close_connection = True
+            raise RequestError(413, f"corps trop volumineux ({MAX_BODY_BYTES} octets max)")
+        body = self.rfile.read(length)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise RequestError(400, f"JSON invalide : {e}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": "route inconnue"})
+
+    def do_POST(self):
+        try:
+            if self.path not in ("/score", "/score/batch", "/report"):
+                # Route inconnue : corps non lu, la connexion est fermée après la réponse
+                self.close_connection = True
+                raise RequestError(404, "route inconnue")
+            payload = self._read_json()
+            if self.path == "/score":
+                self._reply(200, score_submission(payload))
+            elif self.path == "/score/batch":
+                submissions = payload.get("submissions") if isinstance(payload, dict) else payload
+                if not isinstance(submissions, list):
+                    raise RequestError(400, "tableau de soumissions attendu")
+                if len(submissions) > MAX_BATCH:
+                    raise RequestError(413, f"{MAX_BATCH} soumissions max par lot")
+                results = score_batch_submissions(submissions)
+                errors = sum("error" in r for r in results)
+                self._reply(200, {"results": results, "scored": len(results) - errors, "errors": errors})
+            else:
+                if not isinstance(payload, dict):
+                    raise RequestError(400, "objet JSON attendu")
+                filename, pdf_bytes = render_report(payload)
+                self._send(200, pdf_bytes, "application/pdf",
+                           [("Content-Disposition", content_disposition(filename))])
+        except RequestError as e:
+            self._reply(e.status, {"error": str(e)})
+        except InvalidAnswer as e:
+            self._reply(400, {"error": str(e)})
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._reply(422, {"error": f"{type(e).__name__}: {e}"})
+
+
+def make_server(host="127.0.0.1", port=0, reuse_port=False):
+    """Crée le serveur (port 0 = port libre) ; reuse_port permet à plusieurs processus de partager le port."""
+    server = ThreadingHTTPServer((host, port), ScoringHandler, bind_and_activate=False)
+    server.daemon_threads = True
+    if reuse_port:
+        server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.server_bind()
+    server.server_activate()
+    server.url = f"http://{host}:{server.server_port}"
+    return server
+
+
+def start_server(host="127.0.0.1", port=0):
+    """Démarre le serveur dans un thread ; retourne le serveur (server.url, server.shutdown())."""
+    server = make_server(host, port)
+    threading.Thread(target=server.serve_forever, name="scoring-api", daemon=True).start()
+    return server
+
+
+def _serve(host, port, reuse_port):
+    server = make_server(host, port, reuse_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analyseur.api", description="API HTTP de scoring du Quiz AI Act.")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8080")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")),
+                        help="processus partageant le port (SO_REUSEPORT, Linux)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"🚀 API de scoring sur http://{args.host}:{args.port} ({args.workers} processus)")
+    if args.workers <= 1:
+        _serve(args.host, args.port, False)
+        return
+
+    import multiprocessing
+
+    processes = [multiprocessing.Process(target=_serve, args=(args.host, args.port, True), daemon=True)
+                 for _ in range(args.workers)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Encodage des pièces jointes pour l'API Resend.
+
+L'ancien format `"content": list(pdf_bytes)` matérialise un int Python par
+octet puis un tableau JSON 3 à 4 fois plus gros que le PDF. Resend accepte
+le contenu en base64 : b64encode travaille directement sur le buffer, sans
+objet intermédiaire par octet, pour une charge utile de 4/3 de la taille.
+
+L'encodeur est choisi par nom (ATTACHMENT_ENCODING, défaut base64) ; chaque
+encodage alimente analyseur.metrics : histogramme
+`analyseur_stage_seconds{stage="attachment_encode"}` et compteurs
+`analyseur_attachment_bytes_total` / `analyseur_attachment_payload_bytes_total`,
+par encodage.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+
+from analyseur.metrics import increment, observe
+
+logger = logging.getLogger(__name__)
+
+
+def encode_base64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def encode_byte_list(data):
+    """Ancien format (tableau d'entiers), conservé pour comparaison."""
+    return list(data)
+
+
+ENCODERS = {
+    "base64": encode_base64,
+    "list": encode_byte_list,
+}
+
+
+def build_attachment(filename, data, encoding=None):
+    """
+    Retourne (pièce jointe Resend, stats) pour les bytes `data`.
+    stats : encoding, raw_bytes, payload_bytes (taille JSON du contenu), encode_ms.
+    """
+    encoding = encoding or os.getenv("ATTACHMENT_ENCODING", "base64")
+    encoder = ENCODERS[encoding]
+    start = time.perf_counter()
+    content = encoder(data)
+    encode_seconds = time.perf_counter() - start
+    if isinstance(content, str):
+        payload_bytes = len(content) + 2  # guillemets JSON
+    else:
+        payload_bytes = len(json.dumps(content))
+    stats = {
+        "encoding": encoding,
+        "raw_bytes": len(data),
+        "payload_bytes": payload_bytes,
+        "encode_ms": round(encode_seconds * 1000, 3),
+    }
+    observe("attachment_encode", encode_seconds, encoding=encoding)
+    increment("attachment_bytes", len(data), encoding=encoding)
+    increment("attachment_payload_bytes", payload_bytes, encoding=encoding)
+    logger.debug("pièce jointe %s : %s", filename, stats)
+    return {"filename": filename, "content": content}, stats
@@ -0,0 +1,617 @@
+"""
+Crawler asyncio du site analysé : ce que le site expose réellement (pages,
+formulaires, scripts, cookies, liens), au lieu d'une structure imaginée par le LLM.
+
+    site = crawl_site("https://exemple.com")
+    site.pages[0].forms, site.summary()
+
+- client HTTP httpx partagé : connexions keep-alive réutilisées, au plus
+  `per_host` requêtes simultanées par hôte
+- robots.txt respecté (User-agent du crawler ou *), URLs du sitemap
+  (robots.txt ou /sitemap.xml) ajoutées au premier niveau
+- parcours en largeur des liens de même origine, dans un budget de pages,
+  d'octets, de profondeur et de temps total
+- délai par requête, taille maximale par réponse (le reste est ignoré,
+  la page est marquée tronquée) ; le budget d'octets est décompté pendant
+  la lecture, requêtes simultanées comprises
+- seuls http et https sont explorés ; chaque hôte, redirections comprises,
+  est résolu avant la requête et refusé s'il pointe vers une adresse privée,
+  de bouclage, link-local ou réservée (pas d'accès au réseau interne du
+  serveur) ; allow_private=True pour le site de démonstration local
+
+Le modèle produit (SiteModel) est fait de NamedTuple : sérialisable, et
+résumé en texte pour les prompts par SiteModel.summary().
+"""
+
+import asyncio
+import ipaddress
+import re
+import socket
+import time
+from html.parser import HTMLParser
+from typing import NamedTuple, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+USER_AGENT = "AnalyseurConformite/1.0 (+https://onwastudio.com)"
+
+# Ressources jamais explorées : pas de HTML à analyser
+_SKIPPED_EXTENSIONS = re.compile(
+    r"\.(pdf|jpe?g|png|gif|webp|svg|ico|css|js|mjs|json|xml|zip|gz|mp[34]|webm|woff2?|ttf|eot|docx?|xlsx?|pptx?)$",
+    re.I,
+)
+_SITEMAP_LOC = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.I)
+_MAX_INLINE_SCRIPT = 10_000
+_MAX_FORM_TEXT = 500
+_NEARBY_TEXT = 300  # texte suivant un formulaire rattaché à celui-ci
+
+
+class CrawlLimits(NamedTuple):
+    max_pages: int = 20
+    max_depth: int = 3
+    max_bytes: int = 3 * 1024 * 1024  # total des corps téléchargés
+    max_page_bytes: int = 1024 * 1024
+    timeout: float = 10.0  # par requête
+    total_timeout: float = 45.0
+    per_host: int = 4
+    max_sitemap_urls: int = 50
+    user_agent: str = USER_AGENT
+
+
+class Field(NamedTuple):
+    tag: str  # input, select, textarea
+    type: str
+    name: str
+    id: str
+    autocomplete: str
+    label: str
+    placeholder: str
+    required: bool
+    checked: bool  # case pré-cochée
+
+
+class Form(NamedTuple):
+    action: str
+    method: str
+    fields: Tuple[Field, ...]
+    links: Tuple[str, ...]  # liens (href) présents dans le formulaire
+    text: str  # texte visible du formulaire, tronqué
+    nearby_links: Tuple[str, ...]  # liens juste après le formulaire (mention d'information, politique)
+    nearby_text: str
+
+
+class Script(NamedTuple):
+    src: str  # URL absolue, vide pour un script inline
+    inline: str  # contenu inline tronqué
+    type: str
+
+
+class Cookie(NamedTuple):
+    name: str
+    domain: str
+    path: str
+    secure: bool
+    httponly: bool
+    samesite: str
+    persistent: bool  # Expires ou Max-Age présent
+
+
+class Page(NamedTuple):
+    url: str
+    status: int
+    content_type: str
+    depth: int
+    title: str
+    html: str
+    links: Tuple[str, ...]  # même origine, absolues, sans fragment
+    external_links: Tuple[str, ...]
+    forms: Tuple[Form, ...]
+    scripts: Tuple[Script, ...]
+    iframes: Tuple[str, ...]
+    cookies: Tuple[Cookie, ...]
+    truncated: bool
+    elapsed_ms: float
+
+
+class SiteModel(NamedTuple):
+    start_url: str
+    pages: Tuple[Page, ...]
+    sitemap_urls: Tuple[str, ...]
+    robots_found: bool
+    errors: Tuple[Tuple[str, str], ...]  # (url, message)
+    stats: dict
+
+    def without_html(self):
+        """Copie sans le HTML des pages, pour la session une fois règles et extraits calculés."""
+        return self._replace(pages=tuple(page._replace(html="") for page in self.pages))
+
+    def summary(self, max_chars=4000):
+        """Résumé texte du site pour les prompts LLM."""
+        lines = [f"Site: {self.start_url}",
+                 f"Pages explorees: {len(self.pages)} (robots.txt: {'oui' if self.robots_found else 'non'}, "
+                 f"sitemap: {len(self.sitemap_urls)} URLs)"]
+        for page in self.pages:
+            lines.append(f"- {page.url} [{page.status}] {page.title!r}: {len(page.forms)} formulaire(s), "
+                         f"{len(page.scripts)} script(s)")
+        forms = sum(len(page.forms) for page in self.pages)
+        if forms:
+            # le détail (données collectées, consentement) vient de analyseur.forms.forms_summary
+            lines.append(f"Formulaires: {forms}")
+        third_party = sorted({urlsplit(s.src).netloc for page in self.pages for s in page.scripts
+                              if s.src and urlsplit(s.src).netloc != urlsplit(page.url).netloc})
+        if third_party:
+            lines.append("Scripts tiers: " + ", ".join(third_party))
+        cookies = sorted({c.name for page in self.pages for c in page.cookies})
+        if cookies:
+            lines.append("Cookies deposes sans interaction: " + ", ".join(cookies))
+        iframes = sorted({urlsplit(src).netloc for page in self.pages for src in page.iframes if src})
+        if iframes:
+            lines.append("Iframes: " + ", ".join(iframes))
+        if self.errors:
+            lines.append(f"Erreurs d'exploration: {len(self.errors)}")
+            lines.extend(f"- {url}: {message}" for url, message in self.errors[:3])
+        text = "\n".join(lines)
+        return text if len(text) <= max_chars else text[:max_chars] + "\n[...]"
+
+
+class PageParser(HTMLParser):
+    """Extraction en une passe : titre, liens, formulaires (champs et labels), scripts, iframes."""
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.title = ""
+        self.links = []
+        self.forms = []
+        self.scripts = []
+        self.iframes = []
+        self._in_title = False
+        self._script = None
+        self._form = None
+        self._after = None  # dernier formulaire fermé, tant que son texte voisin est collecté
+        self._unlabeled = None  # case sans <label> : le texte qui suit en tient lieu
+        self._labels_for = {}  # id -> texte du label
+        self._label = None  # [for, texte, champs contenus]
+
+    def _url(self, value):
+        return urljoin(self.base_url, value.strip()) if value else ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        if tag == "base" and attrs.get("href"):
+            self.base_url = self._url(attrs["href"])
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "a" and attrs.get("href"):
+            href = self._url(attrs["href"])
+            self.links.append(href)
+            if self._form is not None:
+                self._form["links"].append(href)
+            elif self._after is not None:
+                self._after["nearby_links"].append(href)
+        elif tag == "script":
+            self._script = {"src": self._url(attrs.get("src", "")), "type": attrs.get("type", ""), "text": []}
+        elif tag == "iframe":
+            self.iframes.append(self._url(attrs.get("src", "")))
+        elif tag == "form":
+            self._after = None
+            self._form = {"action": self._url(attrs.get("action", "")) or self.base_url,
+                          "method": (attrs.get("method") or "get").upper(), "fields": [], "links": [], "text": [],
+                          "size": 0, "nearby_links": [], "nearby_text": [], "nearby_size": 0}
+        elif tag == "label":
+            self._label = [attrs.get("for", ""), [], []]
+        elif tag in ("input", "select", "textarea"):
+            field = {
+                "tag": tag,
+                "type": (attrs.get("type") or ("text" if tag == "input" else tag)).lower(),
+                "name": attrs.get("name", ""),
+                "id": attrs.get("id", ""),
+                "autocomplete": attrs.get("autocomplete", ""),
+                "label": attrs.get("aria-label", ""),
+                "placeholder": attrs.get("placeholder", ""),
+                "required": "required" in attrs,
+                "checked": "checked" in attrs or "selected" in attrs,
+                "following": "",
+            }
+            if self._label is not None:
+                self._label[2].append(field)
+            elif field["type"] in ("checkbox", "radio"):
+                self._unlabeled = field
+            if self._form is not None:
+                self._form["fields"].append(field)
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script" and self._script is not None:
+            text = "".join(self._script["text"])
+            self.scripts.append(Script(self._script["src"], text[:_MAX_INLINE_SCRIPT], self._script["type"]))
+            self._script = None
+        elif tag == "label" and self._label is not None:
+            target, text, fields = self._label
+            text = " ".join("".join(text).split())
+            if target:
+                self._labels_for[target] = text
+            for field in fields:
+                field["label"] = field["label"] or text
+            self._label = None
+        elif tag == "form" and self._form is not None:
+            self._close_form()
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script["text"].append(data)
+            return
+        if self._in_title:
+            self.title += data
+        if self._label is not None:
+            self._label[1].append(data)
+        if self._unlabeled is not None and data.strip():
+            self._unlabeled["following"] = " ".join(data.split())[:200]
+            self._unlabeled = None
+        if self._form is not None:
+            if self._form["size"] < _MAX_FORM_TEXT:
+                self._form["text"].append(data)
+                self._form["size"] += len(data)
+        elif self._after is not None:
+            self._after["nearby_text"].append(data)
+            self._after["nearby_size"] += len(data.strip())
+            if self._after["nearby_size"] >= _NEARBY_TEXT:
+                self._after = None
+
+    def _close_form(self):
+        form = self._form
+        self._form = None
+        self._after = form
+        self.forms.append(form)
+
+    def close(self):
+        super().close()
+        if self._form is not None:
+            self._close_form()
+        # Labels `for=` déclarés après leur champ : résolus en fin de document
+        forms = []
+        for form in self.forms:
+            fields = []
+            for field in form["fields"]:
+                following = field.pop("following")
+                if not field["label"]:
+                    field["label"] = self._labels_for.get(field["id"]) or following
+                fields.append(Field(**field))
+            text = " ".join("".join(form["text"]).split())[:_MAX_FORM_TEXT]
+            nearby = " ".join("".join(form["nearby_text"]).split())[:_NEARBY_TEXT]
+            forms.append(Form(form["action"], form["method"], tuple(fields), tuple(form["links"]), text,
+                              tuple(form["nearby_links"]), nearby))
+        self.forms = forms
+
+
+def parse_cookie(header):
+    """Cookie d'un en-tête Set-Cookie (attributs seulement, la valeur n'est pas conservée)."""
+    parts = [part.strip() for part in header.split(";")]
+    name = parts[0].split("=", 1)[0].strip()
+    attributes = {}
+    for part in parts[1:]:
+        key, _, value = part.partition("=")
+        attributes[key.strip().lower()] = value.strip()
+    return Cookie(
+        name=name,
+        domain=attributes.get("domain", ""),
+        path=attributes.get("path", ""),
+        secure="secure" in attributes,
+        httponly="httponly" in attributes,
+        samesite=attributes.get("samesite", ""),
+        persistent="expires" in attributes or "max-age" in attributes,
+    )
+
+
+def canonical_url(url):
+    """URL sans fragment, chemin vide remplacé par / : une page = une URL."""
+    url = urldefrag(url)[0]
+    parts = urlsplit(url)
+    return url if parts.path else parts._replace(path="/").geturl()
+
+
+class UnsafeURL(ValueError):
+    """URL refusée : schéma autre que http(s), ou hôte résolu vers une adresse non publique."""
+
+
+def normalize_url(url):
+    """
+    URL saisie par l'utilisateur : https:// ajouté si le schéma manque, forme canonique.
+    ValueError si l'URL est malformée, UnsafeURL si le schéma n'est pas http(s).
+    """
+    url = url.strip()
+    scheme = re.match(r"^([a-z][a-z0-9+.-]*):(?://|(?=[^0-9]))", url, re.I)
+    if scheme and scheme.group(1).lower() not in ("http", "https"):
+        raise UnsafeURL(f"schéma non pris en charge : {scheme.group(1)}")
+    if not scheme:
+        url = "https://" + url
+    url = canonical_url(url)
+    if not urlsplit(url).hostname:
+        raise ValueError(f"URL sans hôte : {url}")
+    return url
+
+
+def _public(address):
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # fe80::1%eth0
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class _HostGuard:
+    """Hook httpx appelé avant chaque requête, redirections comprises : hôte résolu, adresses publiques seulement."""
+
+    def __init__(self, allow_private=False):
+        self.allow_private = allow_private
+        self._checked = {}  # hôte -> message de refus (vide si autorisé)
+
+    async def __call__(self, request):
+        if request.url.scheme not in ("http", "https"):
+            raise UnsafeURL(f"schéma non pris en charge : {request.url.scheme}")
+        if self.allow_private:
+            return
+        host = request.url.host
+        if host not in self._checked:
+            self._checked[host] = await self._resolve(host, request.url.port or 443)
+        if self._checked[host]:
+            raise UnsafeURL(self._checked[host])
+
+    async def _resolve(self, host, port):
+        try:
+            addresses = [host] if _is_ip(host) else [
+                info[4][0] for info in await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+        except socket.gaierror:
+            return ""  # hôte inconnu : httpx échouera avec une ConnectError
+        refused = [address for address in addresses if not _public(address)]
+        return f"hôte {host} résolu vers une adresse non publique ({refused[0]})" if refused else ""
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host.split("%", 1)[0])
+        return True
+    except ValueError:
+        return False
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return parts.scheme.lower(), parts.netloc.lower()
+
+
+# URL refusée (UnsafeURL), mal formée pour httpx (InvalidURL) ou erreur réseau
+_FETCH_ERRORS = (httpx.HTTPError, httpx.InvalidURL, ValueError)
+
+# Types analysés comme HTML ; "" : serveur sans Content-Type
+_HTML_TYPES = ("text/html", "application/xhtml+xml", "")
+
+
+def _content_type(response):
+    return response.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+class _Crawler:
+    def __init__(self, client, start_url, limits):
+        self.client = client
+        self.start_url = start_url
+        self.limits = limits
+        self.origins = {_origin(start_url)}
+        self.robots = None
+        self.robots_found = False
+        self.sitemap_urls = []
+        self.pages = []
+        self.fetched = set()  # URLs finales (après redirection)
+        self.errors = []
+        self.bytes = 0
+        self.requests = 0
+        self.skipped_robots = 0
+        self._host_limits = {}
+        self._deadline = time.monotonic() + limits.total_timeout
+
+    def _remaining(self):
+        return self._deadline - time.monotonic()
+
+    def _budget_left(self):
+        return (len(self.pages) < self.limits.max_pages and self.bytes < self.limits.max_bytes
+                and self._remaining() > 0)
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.limits.per_host)
+        return self._host_limits[host]
+
+    def _crawlable(self, url):
+        if _origin(url) not in self.origins or _SKIPPED_EXTENSIONS.search(urlsplit(url).path):
+            return False
+        if self.robots is not None and not self.robots.can_fetch(self.limits.user_agent, url):
+            self.skipped_robots += 1
+            return False
+        return True
+
+    async def _get(self, url, max_bytes, content_types=None):
+        """
+        (réponse, corps, tronqué) ; le corps est lu en flux et coupé à max_bytes, ou dès
+        que le budget d'octets du crawl (partagé entre requêtes simultanées) est épuisé.
+        content_types : types acceptés ; pour les autres (PDF, images...), corps non lu.
+        """
+        async with self._host_limit(url):
+            self.requests += 1
+            async with self.client.stream("GET", url) as response:
+                if content_types is not None and _content_type(response) not in content_types:
+                    return response, b"", False
+                body = bytearray()
+                truncated = False
+                async for chunk in response.aiter_bytes():
+                    room = min(max_bytes - len(body), self.limits.max_bytes - self.bytes)
+                    if len(chunk) > room:
+                        chunk = chunk[:max(room, 0)]
+                        truncated = True
+                    body += chunk
+                    self.bytes += len(chunk)
+                    if truncated:
+                        break
+                return response, bytes(body), truncated
+
+    async def _fetch_text(self, url, max_bytes=256 * 1024):
+        try:
+            response, body, _ = await self._get(url, max_bytes)
+        except _FETCH_ERRORS:
+            return None
+        if response.status_code != 200:
+            return None
+        return body.decode(response.charset_encoding or "utf-8", errors="replace")
+
+    async def load_robots(self):
+        origin = "{}://{}".format(*_origin(self.start_url))
+        text = await self._fetch_text(origin + "/robots.txt")
+        sitemaps = []
+        if text is not None:
+            self.robots_found = True
+            self.robots = RobotFileParser()
+            self.robots.parse(text.splitlines())
+            sitemaps = self.robots.site_maps() or []
+        for sitemap in sitemaps or [origin + "/sitemap.xml"]:
+            if len(self.sitemap_urls) >= self.limits.max_sitemap_urls:
+                break
+            text = await self._fetch_text(sitemap)
+            if text:
+                for loc in _SITEMAP_LOC.findall(text)[:self.limits.max_sitemap_urls - len(self.sitemap_urls)]:
+                    self.sitemap_urls.append(canonical_url(loc.replace("&amp;", "&")))
+
+    async def fetch_page(self, url, depth):
+        start = time.perf_counter()
+        try:
+            response, body, truncated = await self._get(url, self.limits.max_page_bytes, _HTML_TYPES)
+        except _FETCH_ERRORS as e:
+            self.errors.append((url, f"{type(e).__name__}: {str(e) or 'délai dépassé'}"))
+            return None
+        final_url = canonical_url(str(response.url))
+        if final_url in self.fetched:
+            return None  # redirection vers une page déjà explorée (ou explorée en parallèle)
+        self.fetched.add(final_url)
+        if depth == 0:
+            self.origins.add(_origin(final_url))  # redirection http -> https, www, etc.
+        content_type = _content_type(response)
+        cookies = tuple(parse_cookie(h) for h in response.headers.get_list("set-cookie"))
+        html = ""
+        parser = PageParser(final_url)
+        if content_type in _HTML_TYPES:
+            html = body.decode(response.charset_encoding or "utf-8", errors="replace")
+            parser.feed(html)
+        parser.close()
+
+        links, external = [], []
+        for link in dict.fromkeys(canonical_url(link) for link in parser.links):
+            if urlsplit(link).scheme not in ("http", "https"):
+                continue
+            (links if _origin(link) in self.origins else external).append(link)
+        return Page(
+            url=final_url,
+            status=response.status_code,
+            content_type=content_type,
+            depth=depth,
+            title=" ".join(parser.title.split()),
+            html=html,
+            links=tuple(links),
+            external_links=tuple(external),
+            forms=tuple(parser.forms),
+            scripts=tuple(parser.scripts),
+            iframes=tuple(parser.iframes),
+            cookies=cookies,
+            truncated=truncated,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+
+    async def run(self):
+        await asyncio.wait_for(self.load_robots(), timeout=max(self._remaining(), 0.001))
+        seen = {self.start_url}
+        frontier = [(self.start_url, 0)]
+        sitemap_pending = True
+        while frontier and self._budget_left():
+            batch = frontier[:self.limits.max_pages - len(self.pages)]
+            tasks = [asyncio.ensure_future(self.fetch_page(url, depth)) for url, depth in batch]
+            done, pending = await asyncio.wait(tasks, timeout=self._remaining())
+            for task in pending:
+                task.cancel()
+            for url, _ in [item for item, task in zip(batch, tasks) if task in pending]:
+                self.errors.append((url, "budget de temps dépassé"))
+
+            next_frontier = []
+            for task in tasks:
+                if task not in done or task.result() is None:
+                    continue
+                page = task.result()
+                self.pages.append(page)
+                if page.depth + 1 > self.limits.max_depth:
+                    continue
+                for link in page.links:
+                    if link not in seen:
+                        seen.add(link)
+                        if self._crawlable(link):
+                            next_frontier.append((link, page.depth + 1))
+            if sitemap_pending:
+                # URLs du sitemap après les liens de la page d'accueil : pages non liées
+                sitemap_pending = False
+                for link in self.sitemap_urls:
+                    if link not in seen:
+                        seen.add(link)
+                        if self._crawlable(link):
+                            next_frontier.append((link, 1))
+            # URLs au-delà du lot (pages en échec ou déjà vues) : déjà dans `seen`, elles passent
+            # avant la profondeur suivante pour ne pas être perdues et garder l'ordre en largeur
+            frontier = frontier[len(batch):] + next_frontier
+        return self.model()
+
+    def model(self):
+        return SiteModel(
+            start_url=self.start_url,
+            pages=tuple(self.pages),
+            sitemap_urls=tuple(self.sitemap_urls),
+            robots_found=self.robots_found,
+            errors=tuple(self.errors),
+            stats={
+                "pages": len(self.pages),
+                "requests": self.requests,
+                "bytes": self.bytes,
+                "skipped_robots": self.skipped_robots,
+                "truncated": sum(page.truncated for page in self.pages),
+                "elapsed_ms": round((time.monotonic() - self._deadline + self.limits.total_timeout) * 1000, 1),
+            },
+        )
+
+
+async def crawl(url, limits=None, transport=None, allow_private=False):
+    """
+    Explore le site à partir de `url` ; retourne un SiteModel, sans page et avec l'erreur
+    si l'URL est invalide ou refusée (jamais d'exception réseau ni d'URL).
+    allow_private=True autorise les adresses privées et locales (site de démonstration).
+    """
+    limits = limits or CrawlLimits()
+    try:
+        start_url = normalize_url(url)
+    except ValueError as e:
+        return SiteModel(url, (), (), False, ((url, f"URL invalide : {e}"),), {"pages": 0, "requests": 0, "bytes": 0})
+    client = httpx.AsyncClient(
+        headers={"User-Agent": limits.user_agent},
+        timeout=httpx.Timeout(limits.timeout),
+        limits=httpx.Limits(max_connections=limits.per_host * 2, max_keepalive_connections=limits.per_host),
+        follow_redirects=True,  # chaque saut passe par _HostGuard
+        event_hooks={"request": [_HostGuard(allow_private)]},
+        transport=transport,
+    )
+    crawler = _Crawler(client, start_url, limits)
+    async with client:
+        try:
+            return await crawler.run()
+        except asyncio.TimeoutError:
+            crawler.errors.append((start_url, "budget de temps dépassé"))
+            return crawler.model()
+
+
+def crawl_site(url, limits=None, allow_private=False):
+    """Version synchrone de crawl()."""
+    return asyncio.run(crawl(url, limits, allow_private=allow_private))
@@ -0,0 +1,341 @@
+"""
+Contenu des pages explorées réduit à ce qui sert au modèle, sous budget de tokens.
+
+    digest = digest_site(site)                     # une passe html.parser par page
+    digest.excerpt("ia", focus=AI_FOCUS)           # texte borné par PROMPT_BUDGET_IA
+    digest.summary()                               # HTML brut, contenu réduit, extraits par étape
+
+Chaque page est lue en une seule passe, sans arbre DOM (HTMLParser reçoit le
+HTML par morceaux) : scripts, styles, SVG, iframes, <select> et éléments
+masqués sont ignorés. Ne restent que des lignes courtes :
+- titres (# ...), blocs de texte, liens [texte](chemin)
+- un repère par formulaire : [formulaire POST /contact : nom, email, ...]
+- pour les pages légales (mentions, confidentialité, CGU, cookies) : les
+  titres seulement, leur contenu est déjà vérifié par analyseur.rgpd
+
+Un bloc déjà vu sur une page précédente (en-tête, menu, pied de page,
+newsletter) n'est gardé qu'une fois. Chaque étape reçoit un extrait borné
+par son budget (PROMPT_BUDGET_<ETAPE>, défauts dans BUDGETS) : titres et
+formulaires d'abord, puis les lignes du `focus`, puis le reste dans l'ordre
+des pages. Les tokens sont comptés par tiktoken s'il est installé avec son
+vocabulaire (LLM_TOKENIZER, défaut o200k_base), sinon estimés en découpant
+le texte comme le pré-tokenizer BPE (mots, nombres, ponctuation, espaces).
+Avant ce module, les prompts ne contenaient aucun texte des pages : chaque
+extrait s'ajoute au prompt précédent, et summary() l'indique comme tel. Les
+tokens réellement envoyés (prompt complet, hors réponses servies par le cache
+LLM) sont comptés par analyseur.pipeline : analyseur_prompt_tokens_total{step=...}.
+"""
+
+import functools
+import os
+import re
+from html.parser import HTMLParser
+from typing import NamedTuple, Tuple
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Tokens de contenu du site par étape (en plus des consignes du prompt)
+BUDGETS = {"ia": 1500, "rgpd": 800, "aiact": 600}
+
+AI_FOCUS = re.compile(r"intelligence artificielle|\bIA\b|\bAI\b|chatbot|assistant (?:virtuel|conversationnel)"
+                      r"|\bGPT|openai|mistral|g[ée]n[ée]r[ée] (?:automatiquement|par)|algorithm|recommandation"
+                      r"|apprentissage automatique|machine learning|d[ée]cision automatis[ée]e|profilage", re.I)
+PRIVACY_FOCUS = re.compile(r"donn[ée]es personnelles|cookie|traceur|consentement|confidentialit|rgpd|gdpr"
+                           r"|droit d.?acc[èe]s|responsable du traitement|dpo|mentions l[ée]gales|h[ée]bergeur", re.I)
+
+_LEGAL_PAGE = re.compile(r"mentions|legal|l[ée]gales|confidentialit|privacy|donnees-personnelles|vie-privee"
+                         r"|\bcgu\b|\bcgv\b|conditions|cookies?\b", re.I)
+
+_SKIPPED = {"script", "style", "svg", "noscript", "template", "iframe", "canvas", "object", "select", "title", "math"}
+_BLOCKS = {"p", "div", "section", "article", "aside", "header", "footer", "nav", "main", "li", "ul", "ol", "dl", "dt",
+           "dd", "button", "label", "form", "h1", "h2", "h3", "h4", "h5", "h6", "td", "th", "tr", "table", "br",
+           "dialog", "blockquote", "pre", "figcaption", "address", "summary", "details", "fieldset", "legend"}
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 3, "h5": 3, "h6": 3}
+_FIELDS = {"input", "select", "textarea"}
+_VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+_MAX_LINE = 600  # caractères par bloc de texte
+_CHUNK = 64 * 1024
+
+HEADING, TEXT = 0, 2  # priorités des lignes (les lignes du focus passent à 1)
+
+
+def _chunks(text, size=_CHUNK):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+# --- Comptage des tokens -----------------------------------------------------
+
+# Découpage du pré-tokenizer BPE : un mot avec son espace, un nombre par tranche
+# de 3 chiffres, une suite de ponctuation, une suite d'espaces
+_PIECE = re.compile(r"'(?:s|t|re|ve|m|ll|d)\b| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+")
+_LONG_WORD = re.compile(r"[^\W\d_]{9,}")  # au-delà de 8 lettres, environ un token par 5 lettres
+_SYMBOLS = re.compile(r"[^\s\w]{4,}")  # ponctuation : environ un token par 3 signes
+_WIDE = re.compile(r"[^\x00-\u024f\s]")  # hors alphabet latin (CJK, emoji) : environ un token par signe
+_EXACT_LIMIT = 32 * 1024
+_SAMPLES, _WINDOW = 64, 256  # 16 Ko comptés : écart de 2 à 3 % sur du HTML réel
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(os.getenv("LLM_TOKENIZER", "o200k_base"))
+    except Exception:  # vocabulaire absent et pas de réseau : estimation
+        return None
+
+
+def _count(text):
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    long_words = sum(-(-len(word) // 5) - 1 for word in _LONG_WORD.findall(text))
+    symbols = sum((len(run) - 1) // 3 for run in _SYMBOLS.findall(text))
+    return len(_PIECE.findall(text)) + long_words + symbols + len(_WIDE.findall(text))
+
+
+def estimate_tokens(text):
+    """
+    Tokens de `text` pour le modèle : tiktoken si disponible, sinon estimation par découpage BPE.
+    Au-delà de _EXACT_LIMIT caractères (HTML brut de plusieurs Mo), compte sur _SAMPLES
+    fenêtres réparties dans le texte, rapporté à sa longueur.
+    """
+    if len(text) <= _EXACT_LIMIT:
+        return _count(text)
+    step = len(text) // _SAMPLES
+    sample = sum(_count(text[start:start + _WINDOW]) for start in range(0, step * _SAMPLES, step))
+    return round(sample * len(text) / (_WINDOW * _SAMPLES))
+
+
+def budget(step):
+    """Budget de tokens de contenu d'une étape : PROMPT_BUDGET_<ETAPE> ou BUDGETS."""
+    return int(os.getenv(f"PROMPT_BUDGET_{step.upper()}", BUDGETS.get(step, 1000)))
+
+
+# --- Réduction d'une page ----------------------------------------------------
+
+class PageReducer(HTMLParser):
+    """Une passe sur le HTML d'une page ; lines : [(priorité, ligne)]."""
+
+    def __init__(self, url, legal=False):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.legal = legal
+        self.lines = []
+        self._origin = urlsplit(url)[:2]
+        self._text = []
+        self._size = 0
+        self._heading = 0
+        self._skip = None  # [balise ignorée, profondeur des balises de même nom]
+        self._link = None  # [href, position dans _text]
+        self._forms = []  # [position dans lines, méthode, action, champs]
+
+    def _path(self, href):
+        href = href.strip()
+        if not href or href.startswith(("#", "javascript:", "data:")):
+            return ""
+        if href.startswith(("mailto:", "tel:")):
+            return href
+        parts = urlsplit(urljoin(self.url, href))
+        if parts[:2] == self._origin:
+            return parts.path or "/"
+        return f"{parts.netloc}{parts.path}"  # sans requête : paramètres de suivi
+
+    def _wrap_link(self):
+        href, start = self._link
+        if href and "".join(self._text[start:]).strip():
+            self._text.insert(start, "[")
+            self._text.append(f"]({href})")
+
+    def _flush(self):
+        if self._link is not None:
+            # bloc fermé dans le lien (carte cliquable) : le lien est écrit sur chaque bloc
+            self._wrap_link()
+            self._link[1] = 0
+        if self._text:
+            text = " ".join("".join(self._text).split())
+            if self._heading:
+                self.lines.append((HEADING, f"{'#' * self._heading} {text[:200]}"))
+            elif text and not self.legal:
+                self.lines.append((TEXT, text if len(text) <= _MAX_LINE else text[:_MAX_LINE] + "…"))
+            self._text = []
+            self._size = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCKS:
+            self._flush()
+        attrs = dict(attrs)
+        if tag == "form":
+            self._forms.append([len(self.lines), (attrs.get("method") or "get").upper(),
+                                self._path(attrs.get("action") or "") or urlsplit(self.url).path or "/", []])
+        elif tag in _FIELDS and self._forms and attrs.get("type") not in ("hidden", "submit", "button", "image"):
+            name = attrs.get("name") or attrs.get("id")
+            if name:
+                self._forms[-1][3].append(name)
+        if self._skip is not None:
+            if tag == self._skip[0]:
+                self._skip[1] += 1
+        elif tag in _SKIPPED or "hidden" in attrs or attrs.get("aria-hidden") == "true":
+            if tag not in _VOID:
+                self._skip = [tag, 1]
+        elif tag in _HEADINGS:
+            self._heading = _HEADINGS[tag]
+        elif tag == "a":
+            self._link = [self._path(attrs.get("href") or ""), len(self._text)]
+
+    def handle_endtag(self, tag):
+        if self._skip is not None:
+            if tag == self._skip[0]:
+                self._skip[1] -= 1
+                if not self._skip[1]:
+                    self._skip = None
+            return
+        if tag == "a" and self._link is not None:
+            self._wrap_link()
+            self._link = None
+        if tag in _BLOCKS:
+            self._flush()
+        if tag in _HEADINGS:
+            self._heading = 0
+        if tag == "form" and self._forms:
+            self._close_form()
+
+    def _close_form(self):
+        position, method, action, fields = self._forms.pop()
+        line = f"[formulaire {method} {action}" + (f" : {', '.join(dict.fromkeys(fields))}]" if fields else "]")
+        self.lines.insert(position, (HEADING, line))
+
+    def handle_data(self, data):
+        if self._skip is not None or self._size > _MAX_LINE:
+            return
+        self._text.append(data)
+        self._size += len(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._forms:
+            self._close_form()
+
+
+# --- Site ----------------------------------------------------------------------
+
+class Excerpt(NamedTuple):
+    text: str
+    tokens: int
+    omitted: int  # lignes écartées par le budget
+
+
+class PageDigest(NamedTuple):
+    url: str
+    title: str
+    legal: bool
+    lines: Tuple[Tuple[int, str], ...]
+
+
+class SiteDigest:
+    def __init__(self, pages, raw_tokens, duplicates):
+        self.pages = pages
+        self.raw_tokens = raw_tokens  # HTML brut des pages
+        self.duplicates = duplicates  # blocs répétés écartés
+        self.tokens = estimate_tokens(self.text())  # contenu réduit complet
+        self.excerpts = {}  # étape -> tokens de l'extrait ajouté à son prompt
+
+    def text(self):
+        return "\n".join(self._header(p) + "\n" + "\n".join(line for _, line in page.lines)
+                         for p, page in enumerate(self.pages))
+
+    def excerpt(self, step, focus=None, only_focus=False, limit=None):
+        """
+        Contenu des pages dans le budget de l'étape (ou `limit` tokens) : titres et
+        formulaires, puis lignes du focus, puis le reste. only_focus=True : seulement
+        les titres des pages légales et les lignes du focus (vide si rien ne correspond).
+        """
+        limit = budget(step) if limit is None else limit
+        candidates = []  # (priorité, page, ligne, texte)
+        for p, page in enumerate(self.pages):
+            for n, (priority, line) in enumerate(page.lines):
+                if focus is not None and focus.search(line):
+                    priority = min(priority, 1)
+                elif only_focus and not (page.legal and priority == HEADING):
+                    continue
+                candidates.append((priority, p, n, line))
+        if only_focus and not any(priority == 1 for priority, *_ in candidates):
+            candidates = []
+        kept, pages, used = [], set(), 0
+        for priority, p, n, line in sorted(candidates):
+            header = 0 if p in pages else estimate_tokens(self._header(p)) + 1
+            cost = estimate_tokens(line) + 1 + header
+            if used + cost <= limit:
+                kept.append((p, n))
+                pages.add(p)
+                used += cost
+        text = self._render(kept)
+        tokens = estimate_tokens(text)
+        while tokens > limit and kept:
+            # les coûts ligne à ligne sont des estimations : on retire les dernières lignes retenues
+            kept.pop()
+            text = self._render(kept)
+            tokens = estimate_tokens(text)
+        excerpt = Excerpt(text, tokens, len(candidates) - len(kept))
+        self.excerpts[step] = excerpt.tokens
+        return excerpt
+
+    def _render(self, kept):
+        kept = set(kept)
+        blocks = []
+        for p, page in enumerate(self.pages):
+            lines = [line for n, (_, line) in enumerate(page.lines) if (p, n) in kept]
+            if lines:
+                blocks.append(self._header(p) + "\n" + "\n".join(lines))
+        return "\n".join(blocks)
+
+    def _header(self, p):
+        page = self.pages[p]
+        # le chemin suffit : l'URL du site est déjà dans le prompt
+        return f"## {urlsplit(page.url).path or '/'}" + (f" - {page.title}" if page.title else "")
+
+    def summary(self):
+        """Une ligne : tokens du HTML brut, du contenu réduit, et des extraits ajoutés aux prompts."""
+        excerpts = ", ".join(f"{step} {tokens}" for step, tokens in self.excerpts.items()) or "aucun"
+        # référence : les prompts précédents, sans texte des pages ; le HTML brut n'a jamais été envoyé
+        added = sum(self.excerpts.values())
+        return (f"Contenu du site : {self.raw_tokens} tokens de HTML brut, {self.tokens} apres reduction "
+                f"({self.duplicates} blocs repetes ecartes) ; extraits ajoutes aux prompts : {excerpts} ; "
+                f"+{added} tokens par rapport aux prompts sans contenu de page")
+
+
+def digest_page(url, html, title="", seen=None):
+    """(lignes, blocs répétés écartés) d'une page ; seen : blocs déjà vus sur les pages précédentes."""
+    reducer = PageReducer(url, legal=bool(_LEGAL_PAGE.search(f"{urlsplit(url).path} {title}")))
+    for chunk in _chunks(html):
+        reducer.feed(chunk)
+    reducer.close()
+    seen = set() if seen is None else seen
+    lines, duplicates = [], 0
+    for priority, line in reducer.lines:
+        key = line.lower()
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        lines.append((priority, line))
+    return PageDigest(url, title, reducer.legal, tuple(lines)), duplicates
+
+
+def digest_site(site):
+    """SiteDigest des pages HTML d'un SiteModel (analyseur.crawler)."""
+    pages, seen, duplicates, raw_tokens = [], set(), 0, 0
+    for page in site.pages if site else ():
+        if not page.html:
+            continue
+        digest, repeated = digest_page(page.url, page.html, page.title, seen)
+        pages.append(digest)
+        duplicates += repeated
+        raw_tokens += estimate_tokens(page.html)
+    return SiteDigest(tuple(pages), raw_tokens, duplicates)
@@ -0,0 +1,256 @@
+"""
+Serveur local compatible Resend, pour tester et mesurer le chemin email sans réseau.
+
+Usage :
+    python -m analyseur.fake_resend --port 8025 --latency 0.05 --rate-429 0.02 --rate-5xx 0.01
+    RESEND_API_URL=http://127.0.0.1:8025 streamlit run app.py
+
+Routes :
+- POST /emails        un email (payload Resend)
+- POST /emails/batch  tableau d'emails
+- GET  /stats         statistiques de débit (JSON)
+- POST /stats/reset   remise à zéro des statistiques
+
+Les payloads sont validés comme par l'API (from, to, subject, html ou text,
+pièces jointes base64 ou tableau d'octets). Latence, 429 et 5xx sont injectés
+selon la configuration ; aucun email n'est envoyé.
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_ATTACHMENTS_BYTES = 40 * 1024 * 1024  # limite Resend : 40 Mo par email
+MAX_BATCH = 100
+
+
+class FakeResendConfig:
+    def __init__(self, latency=0.0, jitter=0.0, rate_429=0.0, rate_5xx=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.random = random.Random(seed)
+
+
+class FakeResendStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.requests = 0
+            self.emails_accepted = 0
+            self.rejected_4xx = 0
+            self.injected_429 = 0
+            self.injected_5xx = 0
+            self.bytes_received = 0
+            self.attachment_bytes = 0
+            self.handling_ms = []
+
+    def record(self, **counters):
+        with self._lock:
+            for name, value in counters.items():
+                if name == "handling_ms":
+                    self.handling_ms.append(value)
+                else:
+                    setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.time() - self.started_at
+            timings = sorted(self.handling_ms)
+
+            def percentile(p):
+                return round(timings[min(len(timings) - 1, int(p / 100 * len(timings)))], 2) if timings else None
+
+            return {
+                "elapsed_s": round(elapsed, 3),
+                "requests": self.requests,
+                "emails_accepted": self.emails_accepted,
+                "emails_per_s": round(self.emails_accepted / elapsed, 2) if elapsed else 0.0,
+                "rejected_4xx": self.rejected_4xx,
+                "injected_429": self.injected_429,
+                "injected_5xx": self.injected_5xx,
+                "bytes_received": self.bytes_received,
+                "attachment_bytes": self.attachment_bytes,
+                "handling_ms_p50": percentile(50),
+                "handling_ms_p95": percentile(95),
+                "handling_ms_p99": percentile(99),
+            }
+
+
+class ValidationError(Exception):
+    pass
+
+
+def _attachment_size(attachment):
+    """Valide une pièce jointe et retourne sa taille décodée."""
+    if not isinstance(attachment, dict) or not attachment.get("filename"):
+        raise ValidationError("attachments[].filename est requis")
+    content = attachment.get("content")
+    if isinstance(content, str):
+        try:
+            return len(base64.b64decode(content, validate=True))
+        except (binascii.Error, ValueError):
+            raise ValidationError(f"contenu base64 invalide pour {attachment['filename']}")
+    if isinstance(content, list):
+        if not all(isinstance(b, int) and 0 <= b <= 255 for b in content):
+            raise ValidationError(f"tableau d'octets invalide pour {attachment['filename']}")
+        return len(content)
+    if attachment.get("path"):
+        return 0
+    raise ValidationError(f"attachments[].content ou path est requis pour {attachment['filename']}")
+
+
+def validate_email(payload):
+    """Valide un payload d'email ; retourne la taille totale des pièces jointes."""
+    if not isinstance(payload, dict):
+        raise ValidationError("objet JSON attendu")
+    for field in ("from", "to", "subject"):
+        if not payload.get(field):
+            raise ValidationError(f"le champ `{field}` est requis")
+    to = payload["to"]
+    recipients = [to] if isinstance(to, str) else to
+    if not isinstance(recipients, list) or not all(isinstance(r, str) and "@" in r for r in recipients):
+        raise ValidationError("`to` doit être une adresse ou une liste d'adresses")
+    if not (payload.get("html") or payload.get("text")):
+        raise ValidationError("`html` ou `text` est requis")
+    size = sum(_attachment_size(a) for a in payload.get("attachments") or [])
+    if size > MAX_ATTACHMENTS_BYTES:
+        raise ValidationError("pièces jointes trop volumineuses (40 Mo max)")
+    return size
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, comme l'API réelle
+    server_version = "FakeResend/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, name, message):
+        self._reply(status, {"statusCode": status, "name": name, "message": message})
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(200, self.server.stats.snapshot())
+        else:
+            self._error(404, "not_found", "route inconnue")
+
+    def do_POST(self):
+        start = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/stats/reset":
+            self.server.stats.reset()
+            self._reply(200, {"ok": True})
+            return
+        if self.path not in ("/emails", "/emails/batch"):
+            self._error(404, "not_found", "route inconnue")
+            return
+
+        stats = self.server.stats
+        config = self.server.config
+        stats.record(requests=1, bytes_received=len(body))
+
+        delay = config.latency + config.random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+
+        roll = config.random.random()
+        if roll < config.rate_429:
+            stats.record(injected_429=1)
+            self._error(429, "rate_limit_exceeded", "Too many requests")
+            return
+        if roll < config.rate_429 + config.rate_5xx:
+            stats.record(injected_5xx=1)
+            self._error(500, "application_error", "Erreur injectée")
+            return
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            stats.record(rejected_4xx=1)
+            self._error(401, "missing_api_key", "Missing API key")
+            return
+
+        try:
+            payload = json.loads(body)
+            if self.path == "/emails/batch":
+                if not isinstance(payload, list) or not 0 < len(payload) <= MAX_BATCH:
+                    raise ValidationError(f"tableau de 1 à {MAX_BATCH} emails attendu")
+                if any(e.get("attachments") for e in payload if isinstance(e, dict)):
+                    raise ValidationError("les pièces jointes ne sont pas supportées en batch")
+                sizes = [validate_email(e) for e in payload]
+            else:
+                sizes = [validate_email(payload)]
+        except (ValueError, ValidationError) as e:
+            stats.record(rejected_4xx=1)
+            self._error(422, "validation_error", str(e))
+            return
+
+        ids = [str(uuid.uuid4()) for _ in sizes]
+        stats.record(emails_accepted=len(ids), attachment_bytes=sum(sizes),
+                     handling_ms=(time.perf_counter() - start) * 1000)
+        if self.path == "/emails/batch":
+            self._reply(200, {"data": [{"id": i} for i in ids]})
+        else:
+            self._reply(200, {"id": ids[0]})
+
+
+def make_server(host="127.0.0.1", port=0, **config):
+    """Crée le serveur (port 0 = port libre) ; config : latency, jitter, rate_429, rate_5xx, seed."""
+    server = ThreadingHTTPServer((host, port), FakeResendHandler)
+    server.daemon_threads = True
+    server.config = FakeResendConfig(**config)
+    server.stats = FakeResendStats()
+    server.url = f"http://{host}:{server.server_port}"
+    return server
+
+
+def start_server(host="127.0.0.1", port=0, **config):
+    """Démarre le serveur dans un thread ; retourne le serveur (server.url, server.shutdown())."""
+    server = make_server(host, port, **config)
+    threading.Thread(target=server.serve_forever, name="fake-resend", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analyseur.fake_resend", description="Serveur local compatible Resend.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.0, help="latence fixe par requête (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latence aléatoire ajoutée, 0..jitter (s)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="proportion de réponses 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="proportion de réponses 500")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                         rate_429=args.rate_429, rate_5xx=args.rate_5xx, seed=args.seed)
+    print(f"📧 Faux Resend sur {server.url} (RESEND_API_URL) - stats : GET /stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot(), indent=2))
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Site web local de démonstration, pour tester et mesurer le crawler sans réseau.
+
+Usage :
+    python -m analyseur.fixture_site --port 8030 --slow 3
+    python -c "from analyseur.crawler import crawl_site; print(crawl_site('http://127.0.0.1:8030', allow_private=True).summary())"
+
+Le site (une PME fictive) contient ce que l'analyse doit trouver ou éviter :
+- robots.txt (/prive/ interdit) et sitemap.xml (dont une page non liée : /mentions-legales)
+- formulaires : contact (consentement + lien politique), newsletter (sans consentement)
+- scripts tiers (Google Tag Manager, Meta Pixel, widget de chat IA), iframe YouTube
+- cookies déposés dès la page d'accueil (_ga persistant, session HttpOnly)
+- une redirection 301, un PDF, une page lente (/lent) et une page énorme (/enorme)
+- des articles de blog chaînés, pour épuiser un budget de pages
+
+GET /stats retourne les compteurs (requêtes, connexions : keep-alive).
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LAYOUT = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{title} - Atelier Dupont</title>
+<script async src="https://www.googletagmanager.com/gtag/js?id=G-TEST123"></script>
+<script>
+  window.dataLayer = window.dataLayer || [];
+  function gtag(){{dataLayer.push(arguments);}}
+  gtag('js', new Date()); gtag('config', 'G-TEST123');
+</script>
+</head>
+<body>
+<header>
+  <nav>
+    <a href="/">Accueil</a> <a href="/services">Services</a> <a href="/blog">Blog</a>
+    <a href="/contact">Contact</a> <a href="/prive/admin">Espace pro</a>
+  </nav>
+</header>
+<main>
+{content}
+</main>
+<footer>
+  <p>&copy; Atelier Dupont - 12 rue des Lilas, 75011 Paris</p>
+  <a href="/politique-confidentialite">Politique de confidentialité</a>
+  <a href="https://www.linkedin.com/company/atelier-dupont">LinkedIn</a>
+</footer>
+</body>
+</html>
+"""
+
+_PAGES = {
+    "/": ("Accueil", """
+<h1>Atelier Dupont, menuiserie sur mesure</h1>
+<p>Cuisines, dressings et agencements depuis 1987.</p>
+<script>
+  !function(f,b,e,v,n,t,s){if(f.fbq)return;n=f.fbq=function(){n.callMethod?
+  n.callMethod.apply(n,arguments):n.queue.push(arguments)};}(window,document,'script',
+  'https://connect.facebook.net/en_US/fbevents.js');
+  fbq('init', '1234567890'); fbq('track', 'PageView');
+</script>
+<script src="https://widget.intercom.io/widget/abc123"></script>
+<form action="/newsletter" method="post">
+  <input type="email" name="email" placeholder="Votre email">
+  <button type="submit">S'abonner</button>
+</form>
+<a href="/ancienne-page">Nos réalisations</a> <a href="/catalogue.pdf">Catalogue (PDF)</a>
+<a href="mailto:contact@atelier-dupont.fr">Écrire</a> <a href="#haut">Haut de page</a>
+"""),
+    "/services": ("Services", """
+<h1>Nos services</h1>
+<p>Étude, fabrication et pose.</p>
+<iframe src="https://www.youtube.com/embed/dQw4w9WgXcQ"></iframe>
+<a href="/lent">Simulateur de devis</a>
+"""),
+    "/contact": ("Contact", """
+<h1>Contact</h1>
+<form action="/contact" method="post">
+  <input type="hidden" name="csrf" value="x1y2z3">
+  <label for="nom">Nom complet</label>
+  <input type="text" id="nom" name="nom" autocomplete="name" required>
+  <label>Email <input type="email" name="courriel" autocomplete="email" required></label>
+  <label for="tel">Téléphone</label>
+  <input type="tel" id="tel" name="telephone">
+  <label for="message">Votre projet</label>
+  <textarea id="message" name="message"></textarea>
+  <input type="checkbox" id="rgpd" name="consentement" required>
+  <label for="rgpd">J'accepte que mes données soient utilisées pour me recontacter, voir la
+  <a href="/politique-confidentialite">politique de confidentialité</a>.</label>
+  <button type="submit">Envoyer</button>
+</form>
+"""),
+    "/politique-confidentialite": ("Politique de confidentialité", """
+<h1>Politique de confidentialité</h1>
+<p>Responsable du traitement : Atelier Dupont SARL. Vous disposez d'un droit d'accès,
+de rectification et d'effacement : dpo@atelier-dupont.fr.</p>
+"""),
+    "/mentions-legales": ("Mentions légales", """
+<h1>Mentions légales</h1>
+<p>SARL au capital de 10 000 EUR - RCS Paris 123 456 789 - Hébergeur : OVH.</p>
+"""),
+    "/prive/admin": ("Administration", "<h1>Espace réservé</h1>"),
+}
+
+
+def _blog(articles):
+    items = "".join(f'<li><a href="/blog/article-{i}">Article {i}</a></li>' for i in range(1, min(articles, 3) + 1))
+    return "Blog", f'<h1>Blog</h1><ul>{items}</ul><a href="/enorme">Archives complètes</a>'
+
+
+def _article(number, articles):
+    following = f'<a href="/blog/article-{number + 1}">Article suivant</a>' if number < articles else ""
+    return f"Article {number}", f"<h1>Article {number}</h1><p>{'Contenu. ' * 50}</p>{following}"
+
+
+class FixtureStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.paths = {}
+
+    def record(self, path=None, connection=False):
+        with self._lock:
+            if connection:
+                self.connections += 1
+            if path is not None:
+                self.requests += 1
+                self.paths[path] = self.paths.get(path, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"requests": self.requests, "connections": self.connections, "paths": dict(self.paths)}
+
+
+class FixtureSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FixtureSite/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.stats.record(connection=True)
+
+    def _reply(self, status, body, content_type="text/html; charset=utf-8", headers=()):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client parti (délai du crawler dépassé)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        config = self.server.config
+        if path == "/stats":
+            self._reply(200, json.dumps(self.server.stats.snapshot()), "application/json")
+            return
+        self.server.stats.record(path)
+        base = f"http://{self.headers.get('Host', 'localhost')}"
+
+        if path == "/robots.txt":
+            self._reply(200, f"User-agent: *\nDisallow: /prive/\n\nSitemap: {base}/sitemap.xml\n", "text/plain")
+        elif path == "/sitemap.xml":
+            locs = "".join(f"<url><loc>{base}{p}</loc></url>" for p in ("/", "/services", "/contact", "/mentions-legales"))
+            self._reply(200, f'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>',
+                        "application/xml")
+        elif path == "/ancienne-page":
+            self._reply(301, "", headers=[("Location", "/services")])
+        elif path == "/catalogue.pdf":
+            self._reply(200, b"%PDF-1.4\n%fixture\n", "application/pdf")
+        elif path == "/lent":
+            time.sleep(config["slow"])
+            self._reply(200, _LAYOUT.format(title="Simulateur", content="<h1>Simulateur de devis</h1>"))
+        elif path == "/enorme":
+            filler = "<p>" + "Archive. " * 100 + "</p>\n"
+            content = "<h1>Archives</h1>" + filler * (config["large_bytes"] // len(filler) + 1)
+            self._reply(200, _LAYOUT.format(title="Archives", content=content))
+        elif path == "/blog" or path.startswith("/blog/article-"):
+            if path == "/blog":
+                title, content = _blog(config["articles"])
+            else:
+                number = path.rsplit("-", 1)[1]
+                if not number.isdigit() or not 1 <= int(number) <= config["articles"]:
+                    self._reply(404, "<h1>Page introuvable</h1>")
+                    return
+                title, content = _article(int(number), config["articles"])
+            self._reply(200, _LAYOUT.format(title=title, content=content))
+        elif path in _PAGES:
+            title, content = _PAGES[path]
+            headers = []
+            if path == "/":
+                # Déposés sans consentement préalable
+                headers = [("Set-Cookie", "_ga=GA1.1.123.456; Max-Age=63072000; Path=/; SameSite=Lax"),
+                           ("Set-Cookie", "session=abc; Path=/; HttpOnly; Secure; SameSite=Strict")]
+            self._reply(200, _LAYOUT.format(title=title, content=content), headers=headers)
+        else:
+            self._reply(404, "<h1>Page introuvable</h1>")
+
+
+def make_server(host="127.0.0.1", port=0, slow=3.0, large_bytes=2 * 1024 * 1024, articles=30):
+    """Crée le serveur (port 0 = port libre) ; slow : délai de /lent (s), large_bytes : taille de /enorme."""
+    server = ThreadingHTTPServer((host, port), FixtureSiteHandler)
+    server.daemon_threads = True
+    server.config = {"slow": slow, "large_bytes": large_bytes, "articles": articles}
+    server.stats = FixtureStats()
+    server.url = f"http://{host}:{server.server_port}"
+    return server
+
+
+def start_server(host="127.0.0.1", port=0, **config):
+    """Démarre le serveur dans un thread ; retourne le serveur (server.url, server.shutdown())."""
+    server = make_server(host, port, **config)
+    threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analyseur.fixture_site", description="Site web local de démonstration.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8030)
+    parser.add_argument("--slow", type=float, default=3.0, help="délai de réponse de /lent (s)")
+    parser.add_argument("--large-bytes", type=int, default=2 * 1024 * 1024, help="taille de /enorme (octets)")
+    parser.add_argument("--articles", type=int, default=30, help="nombre d'articles de blog chaînés")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, slow=args.slow, large_bytes=args.large_bytes, articles=args.articles)
+    print(f"🌐 Site de démonstration sur {server.url} - stats : GET /stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot(), indent=2))
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Analyse RGPD formulaire par formulaire : données personnelles collectées,
+consentement, information, sécurité de l'envoi.
+
+    findings = analyse_forms(site)
+    forms_summary(findings)      # une ligne par formulaire, pour les prompts
+
+Chaque champ (analyseur.crawler.Field) est classé d'après son attribut
+autocomplete (jetons normalisés HTML), son type, puis une expression compilée
+(une alternative nommée par catégorie) sur name, id, label et placeholder.
+Le coût est linéaire : une recherche par champ, sur quelques dizaines de
+caractères, quel que soit le poids de la page.
+
+Pour chaque formulaire collectant des données personnelles :
+- case de consentement (label ou nom), pré-cochée ou non
+- lien vers la politique de confidentialité dans le formulaire, simple mention
+  d'information, ou seulement un lien juste après (pied de page : ambigu)
+- données sensibles (art. 9 : santé, opinions, religion...) : consentement
+  explicite exigé
+- envoi en clair (action http://) ou en GET (données dans l'URL)
+"""
+
+import re
+from typing import NamedTuple, Tuple
+from urllib.parse import urlsplit
+
+CONFORME = "conforme"
+NON_CONFORME = "non conforme"
+AMBIGU = "ambigu"
+
+
+class Category(NamedTuple):
+    key: str
+    label: str
+    sensitive: bool  # données sensibles (art. 9 RGPD) ou à risque (paiement, identifiant national)
+
+
+CATEGORIES = {c.key: c for c in (
+    Category("email", "email", False),
+    Category("telephone", "telephone", False),
+    Category("identite", "nom / prenom", False),
+    Category("naissance", "date de naissance", False),
+    Category("adresse", "adresse postale", False),
+    Category("identifiants", "identifiants de connexion", False),
+    Category("document", "document joint", False),
+    Category("message", "message libre", False),
+    Category("paiement", "donnees de paiement", True),
+    Category("identifiant_national", "numero d'identification national", True),
+    Category("sante", "donnees de sante", True),
+    Category("sensible", "donnees sensibles (art. 9)", True),
+)}
+
+# Jetons autocomplete (HTML) -> catégorie
+_AUTOCOMPLETE = {
+    "email": "email", "tel": "telephone", "tel-national": "telephone", "tel-local": "telephone",
+    "name": "identite", "given-name": "identite", "family-name": "identite", "additional-name": "identite",
+    "honorific-prefix": "identite", "nickname": "identite", "sex": "identite",
+    "bday": "naissance", "bday-day": "naissance", "bday-month": "naissance", "bday-year": "naissance",
+    "street-address": "adresse", "address-line1": "adresse", "address-line2": "adresse", "address-line3": "adresse",
+    "address-level1": "adresse", "address-level2": "adresse", "postal-code": "adresse", "country": "adresse",
+    "country-name": "adresse",
+    "username": "identifiants", "current-password": "identifiants", "new-password": "identifiants",
+    "cc-name": "paiement", "cc-number": "paiement", "cc-exp": "paiement", "cc-csc": "paiement", "cc-type": "paiement",
+}
+
+_TYPES = {"email": "email", "tel": "telephone", "password": "identifiants", "file": "document"}
+
+# name, id, label, placeholder (séparateurs remplacés par des espaces, en minuscules) ;
+# l'ordre compte : le premier groupe qui correspond à une position l'emporte
+_FIELD = re.compile("|".join(f"(?P<{key}>{pattern})" for key, pattern in (
+    ("sante", r"sant[ée]|health|m[ée]dic|maladie|allergi|handicap|patholog|traitement m[ée]dical|grossesse|mutuelle"
+              r"|ordonnance|sympt[ôo]me|groupe sanguin"),
+    ("sensible", r"religi|confession|ethni|origine raciale|orientation sexuelle|opinions? politique|syndica"
+                 r"|biom[ée]tri|casier judiciaire|condamnation"),
+    ("identifiant_national", r"s[ée]curit[ée] sociale|\bnir\b|\bssn\b|passeport|passport|carte d.?identit[ée]"
+                             r"|\bcni\b|permis de conduire|num[ée]ro fiscal"),
+    ("paiement", r"\biban\b|\bbic\b|\brib\b|carte bancaire|credit ?card|card ?number|num[ée]ro de carte|\bcvv\b|\bcvc\b"
+                 r"|cryptogramme|expiration"),
+    ("identifiants", r"password|mot de passe|\bmdp\b|\bpass\b|username|\blogin\b|identifiant"),
+    ("email", r"e ?mail|courriel|\bmel\b"),
+    ("telephone", r"t[ée]l[ée]phone|\bt[ée]l\b|phone|mobile|portable|\bgsm\b"),
+    ("naissance", r"naissance|birth|\bdob\b|\bbday\b|\b[âa]ge\b"),
+    ("adresse", r"adresse|address|\brue\b|street|code postal|postal|\bzip\b|\bcp\b|\bville\b|\bcity\b"),
+    ("identite", r"\bnom\b|pr[ée]nom|first ?name|last ?name|full ?name|sur ?name|\bname\b|your ?name|civilit[ée]"
+                 r"|\bsexe\b|\bgenre\b|gender"),
+)), re.I)
+_SEPARATORS = re.compile(r"[\W_]+")
+
+_CONSENT = re.compile(r"j.?accepte|consen|j.?autorise|accord|rgpd|gdpr|donn[ée]es|confidentialit|privacy"
+                      r"|politique|conditions|cgu|cgv|i agree", re.I)
+_OPTIN = re.compile(r"newsletter|offres?|actualit[ée]s|informations commerciales|partenaires|marketing|promotion", re.I)
+_POLICY_LINK = re.compile(r"confidentialit|privacy|donnees-personnelles|donn[ée]es personnelles|vie-priv|rgpd|gdpr"
+                          r"|protection-des-donnees", re.I)
+# phrase d'information (le simple intitulé d'un lien de pied de page ne compte pas)
+_NOTICE = re.compile(r"donn[ée]es (?:personnelles|collect[ée]es|sont)|traitement|rgpd|droit d.?acc[èe]s|d[ée]sinscri", re.I)
+
+
+def classify_field(field):
+    """Catégories de données personnelles d'un champ (set de clés de CATEGORIES)."""
+    if field.type in ("hidden", "submit", "button", "reset", "image", "checkbox", "radio"):
+        return set()
+    tokens = field.autocomplete.lower().split()
+    for token in reversed(tokens):  # "section-x shipping tel" : le dernier jeton porte le sens
+        if token in _AUTOCOMPLETE:
+            return {_AUTOCOMPLETE[token]}
+    categories = set()
+    if field.type in _TYPES:
+        categories.add(_TYPES[field.type])
+    text = _SEPARATORS.sub(" ", f"{field.name} {field.id} {field.label} {field.placeholder}").lower()
+    categories.update(match.lastgroup for match in _FIELD.finditer(text))
+    if not categories and field.tag == "textarea":
+        categories.add("message")
+    if not categories and field.type == "date":
+        categories.add("naissance")
+    return categories
+
+
+class FormFinding(NamedTuple):
+    page: str
+    action: str
+    method: str
+    purpose: str  # connexion, newsletter, paiement, contact / collecte
+    data: Tuple[str, ...]  # clés de CATEGORIES
+    consent: str  # label de la case de consentement, vide si absente
+    optin: str  # label de la case d'abonnement commercial, vide si absente
+    prechecked: bool
+    policy_link: str
+    status: str
+    issues: Tuple[str, ...]
+    pages: int  # pages où le formulaire apparaît
+
+    def sensitive(self):
+        return [key for key in self.data if CATEGORIES[key].sensitive]
+
+    def line(self):
+        """Résumé d'une ligne du formulaire et de son constat."""
+        data = ", ".join(CATEGORIES[key].label for key in self.data)
+        extras = []
+        if self.consent:
+            extras.append("case de consentement" + (" pre-cochee" if self.prechecked else ""))
+        if self.optin:
+            extras.append("case newsletter")
+        if self.policy_link:
+            extras.append("lien politique")
+        where = self.page + (f" (+{self.pages - 1} pages)" if self.pages > 1 else "")
+        page, action = urlsplit(self.page), urlsplit(self.action)
+        # même origine : le chemin suffit, l'URL de la page est déjà dans la ligne
+        target = action.path or "/" if (action.scheme, action.netloc) == (page.scheme, page.netloc) else self.action
+        detail = f" - {'; '.join(self.issues)}" if self.issues else ""
+        return (f"{where} : formulaire {self.purpose} {self.method} {target} [{data}]"
+                f"{' | ' + ', '.join(extras) if extras else ''} : {self.status.upper()}{detail}")
+
+
+def _purpose(form, data, optin):
+    names = " ".join(f"{form.action} {form.text[:200]}".lower().split())
+    if "identifiants" in data and len(set(data) - {"email", "identifiants"}) == 0:
+        return "connexion"
+    if "paiement" in data:
+        return "paiement"
+    if set(data) <= {"email", "identite"} and (optin or "newsletter" in names or "abonn" in names or "inscri" in names):
+        return "newsletter"
+    return "contact / collecte"
+
+
+def analyse_form(page_url, form, pages=1):
+    """Constat d'un formulaire ; None s'il ne collecte pas de données personnelles."""
+    data = set()
+    for field in form.fields:
+        data |= classify_field(field)
+    if not data or data == {"message"}:
+        return None
+    data = tuple(key for key in CATEGORIES if key in data)
+
+    consent, optin, prechecked = "", "", False
+    for field in form.fields:
+        if field.type != "checkbox":
+            continue
+        text = f"{field.label} {field.name} {field.id}"
+        if _CONSENT.search(text):
+            consent = consent or field.label or field.name
+            prechecked = prechecked or field.checked
+        elif _OPTIN.search(text):
+            optin = optin or field.label or field.name
+            prechecked = prechecked or field.checked
+    inside = [link for link in form.links if _POLICY_LINK.search(link)]
+    # juste sous le formulaire : premier lien qui le suit (pas le pied de page après d'autres liens)
+    nearby = [link for link in form.nearby_links[:1] if _POLICY_LINK.search(link)]
+    policy_link = (inside or nearby or [""])[0]
+    notice = _NOTICE.search(f"{form.text} {form.nearby_text}")
+    purpose = _purpose(form, data, optin)
+
+    critical, doubts = [], []
+    sensitive = [CATEGORIES[key].label for key in data if CATEGORIES[key].sensitive]
+    if form.action.startswith("http://") and page_url.startswith("https://"):
+        critical.append("envoi non chiffre depuis une page HTTPS (action http://)")
+    if form.method == "GET" and purpose != "connexion" and (sensitive or "identifiants" in data or len(data) > 1):
+        critical.append("donnees transmises dans l'URL (GET)")
+    if prechecked:
+        critical.append("case pre-cochee : le consentement n'est pas un acte positif")
+    if any(CATEGORIES[key].sensitive and key not in ("paiement",) for key in data) and not consent:
+        critical.append(f"{', '.join(sensitive)} sans consentement explicite")
+    if purpose == "connexion":
+        pass  # exécution du contrat : ni case ni mention exigées au formulaire
+    elif not (consent or inside or notice):
+        if nearby:
+            # lien dans le pied de page juste après le formulaire : information peu visible
+            doubts.append(f"ni case ni mention, seulement un lien a proximite : {nearby[0]}")
+        else:
+            critical.append("ni case de consentement, ni lien vers la politique, ni mention d'information")
+    elif not (consent or inside):
+        doubts.append(f"mention sans case ni lien : {notice.string[max(notice.start() - 40, 0):notice.end() + 60].strip()}")
+
+    status = NON_CONFORME if critical else AMBIGU if doubts else CONFORME
+    return FormFinding(page_url, form.action, form.method, purpose, data, consent[:120], optin[:120], prechecked,
+                       policy_link, status, tuple(critical + doubts), pages)
+
+
+def analyse_forms(site):
+    """Constats de tous les formulaires de données personnelles du site, un par formulaire distinct."""
+    found = {}
+    for page in site.pages if site else ():
+        for form in page.forms:
+            # un même formulaire répété sur chaque page (newsletter du pied de page) : un constat
+            key = (form.action, form.method, tuple(f.name for f in form.fields))
+            if key in found:
+                found[key][2] += 1
+            else:
+                found[key] = [page.url, form, 1]
+    findings = (analyse_form(url, form, pages) for url, form, pages in found.values())
+    return tuple(finding for finding in findings if finding is not None)
+
+
+def forms_summary(findings, max_forms=15):
+    """Constats des formulaires, une ligne chacun, pour les prompts (remplace le détail des champs)."""
+    if not findings:
+        return "Formulaires: aucun formulaire collectant des donnees personnelles."
+    lines = [f"Formulaires collectant des donnees personnelles: {len(findings)}"]
+    lines.extend(f"- {finding.line()}" for finding in findings[:max_forms])
+    if len(findings) > max_forms:
+        lines.append(f"- ... {len(findings) - max_forms} autre(s)")
+    return "\n".join(lines)
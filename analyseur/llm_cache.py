@@ -0,0 +1,136 @@
+"""
+Cache persistant des réponses LLM (SQLite sur disque local).
+
+À entrées identiques (déploiement, prompt, paramètres), une réponse déjà
+obtenue est réutilisée au lieu de refaire l'appel Azure OpenAI : les sites
+populaires sont analysés des dizaines de fois par jour. Lecture cache-aside
+dans analyseur.pipeline.run_pipeline, avant chaque appel ; les méthodes sont
+synchrones (sqlite3) et y sont appelées via asyncio.to_thread.
+
+- expiration : une entrée plus vieille que `ttl` secondes est ignorée et supprimée
+- taille : au plus `max_entries` entrées, éviction LRU (dernière lecture)
+- métriques : compteur analyseur_llm_cache_total{result="hit|miss|expired"}
+  et stats() (taux de succès du processus, nombre d'entrées)
+
+Configuration : LLM_CACHE_DB (défaut llm_cache.sqlite3), LLM_CACHE_TTL
+(secondes, défaut 86400, 0 désactive le cache), LLM_CACHE_MAX_ENTRIES
+(défaut 5000).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from analyseur.metrics import increment
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_used_at);
+"""
+
+
+def llm_params(llm):
+    """
+    Paramètres d'un client LangChain qui influencent la réponse (point d'accès, déploiement,
+    modèle, température...) : un même nom de déploiement sur deux ressources Azure n'est
+    pas forcément le même modèle.
+    """
+    params = {}
+    for attribute in ("azure_endpoint", "openai_api_base", "deployment_name", "model_name",
+                      "openai_api_version", "temperature", "max_tokens", "top_p", "seed"):
+        value = getattr(llm, attribute, None)
+        if value is not None:
+            params[attribute] = value
+    return params
+
+
+def cache_key(prompt, params):
+    data = json.dumps({"prompt": prompt, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path, ttl=86400.0, max_entries=5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.expired = 0
+        with self._transaction() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls):
+        """Cache configuré par LLM_CACHE_DB, LLM_CACHE_TTL et LLM_CACHE_MAX_ENTRIES ; None si TTL = 0."""
+        ttl = float(os.getenv("LLM_CACHE_TTL", "86400"))
+        if ttl <= 0:
+            return None
+        return cls(os.getenv("LLM_CACHE_DB", "llm_cache.sqlite3"), ttl=ttl,
+                   max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")))
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connect()
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _count(self, attribute, result):
+        with self._lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+        increment("llm_cache", result=result)
+
+    def get(self, key):
+        """Réponse en cache (texte) ou None ; une lecture rafraîchit la position LRU."""
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses", "miss")
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl:
+                db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._count("expired", "expired")
+                return None
+            db.execute("UPDATE llm_cache SET last_used_at = ? WHERE key = ?", (now, key))
+        self._count("hits", "hit")
+        return response
+
+    def put(self, key, response):
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                       (key, response, now, now))
+            db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+            db.execute("DELETE FROM llm_cache WHERE key IN ("
+                       "SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                       (self.max_entries,))
+
+    def stats(self):
+        with self._transaction() as db:
+            entries = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses + self.expired
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -0,0 +1,109 @@
+"""
+Déploiement local multi-répliques de app.py, pour tester et charger le mode sans état.
+
+Usage :
+    python -m analyseur.local_cluster --replicas 3 --port 8500
+    # puis http://127.0.0.1:8500 (ou un outil de charge sur ce port)
+
+Lance N processus `streamlit run app.py` (ports port+1 .. port+N) qui
+partagent un dossier de données (--data-dir) :
+- STORAGE_URL     soumissions et rapports (SQLite)
+- OUTBOX_DB       file d'envoi des emails, consommée par toutes les répliques
+- PDF_CACHE_DIR   cache disque des PDF
+- PDF_DOWNLOAD    inline : le PDF ne passe pas par le gestionnaire de médias
+
+Devant eux, un répartiteur TCP envoie chaque nouvelle connexion à la réplique
+suivante (round robin, sans affinité), comme un équilibreur de charge
+public : les requêtes HTTP et le websocket d'une même page peuvent arriver
+sur des processus différents. Les variables déjà définies dans
+l'environnement (RESEND_API_URL vers le faux Resend, par exemple) sont
+transmises telles quelles.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def replica_env(data_dir):
+    env = dict(os.environ)
+    env.setdefault("STORAGE_URL", "sqlite:///" + os.path.join(data_dir, "storage.sqlite3"))
+    env.setdefault("OUTBOX_DB", os.path.join(data_dir, "outbox.sqlite3"))
+    env.setdefault("PDF_CACHE_DIR", os.path.join(data_dir, "pdf_cache"))
+    env.setdefault("PDF_DOWNLOAD", "inline")
+    return env
+
+
+def start_replicas(count, base_port, data_dir, script="app.py"):
+    """Démarre les répliques ; retourne [(port, Popen)]."""
+    os.makedirs(data_dir, exist_ok=True)
+    env = replica_env(data_dir)
+    replicas = []
+    for port in range(base_port + 1, base_port + count + 1):
+        command = [sys.executable, "-m", "streamlit", "run", script,
+                   "--server.port", str(port), "--server.address", "127.0.0.1",
+                   "--server.headless", "true"]
+        replicas.append((port, subprocess.Popen(command, cwd=ROOT, env=env)))
+    return replicas
+
+
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_balancer(host, port, backend_ports):
+    """Répartiteur TCP round robin par connexion."""
+    backends = itertools.cycle(backend_ports)
+
+    async def handle(client_reader, client_writer):
+        backend_port = next(backends)
+        try:
+            backend_reader, backend_writer = await asyncio.open_connection("127.0.0.1", backend_port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(_pipe(client_reader, backend_writer), _pipe(backend_reader, client_writer))
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analyseur.local_cluster",
+                                     description="Plusieurs répliques de app.py derrière un répartiteur local.")
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8500, help="port du répartiteur ; répliques sur les ports suivants")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, ".cluster"), help="données partagées entre répliques")
+    parser.add_argument("--script", default="app.py")
+    args = parser.parse_args(argv)
+
+    replicas = start_replicas(args.replicas, args.port, args.data_dir, args.script)
+    ports = [port for port, _ in replicas]
+    print(f"⚖️ Répartiteur sur http://{args.host}:{args.port} -> répliques {ports} (données : {args.data_dir})")
+    try:
+        asyncio.run(serve_balancer(args.host, args.port, ports))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for _, process in replicas:
+            process.terminate()
+        for _, process in replicas:
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
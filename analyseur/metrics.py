@@ -0,0 +1,166 @@
+"""
+Mesure de latence par étape et export au format texte Prometheus.
+
+    from analyseur.metrics import span
+
+    with span("pdf"):
+        pdf_bytes = get_quiz_report(...)
+
+Chaque span alimente l'histogramme `analyseur_stage_seconds{stage="pdf"}`
+(buckets cumulés, somme, nombre). increment("llm_cache", result="hit")
+alimente le compteur `analyseur_llm_cache_total{result="hit"}`. Export, au choix :
+- METRICS_PORT : serveur HTTP annexe, GET /metrics
+- METRICS_FILE : fichier réécrit toutes les METRICS_INTERVAL secondes (défaut 15),
+  pour le textfile collector de node_exporter par exemple
+
+Les métriques sont propres au processus : avec plusieurs répliques, chacune
+expose les siennes (port ou fichier distinct).
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Secondes : du scoring (µs) aux appels LLM (dizaines de secondes)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # dernier : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self, name="analyseur_stage_seconds", help="Durée des étapes, en secondes.", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.prefix = name.split("_")[0]
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, **labels):
+        key = (stage, *sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, counter, amount=1, **labels):
+        key = (counter, *sorted(labels.items()))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Mesure la durée du bloc, y compris s'il lève une exception."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def render(self):
+        """Histogrammes et compteurs au format texte d'exposition Prometheus."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            for (stage, *labels), histogram in histograms:
+                base = ",".join(f'{k}="{_escape(v)}"' for k, v in [("stage", stage), *labels])
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+                lines.append(f"{self.name}_sum{{{base}}} {histogram.sum:.6f}")
+                lines.append(f"{self.name}_count{{{base}}} {histogram.count}")
+            declared = set()
+            for (counter, *labels), value in sorted(self._counters.items()):
+                name = f"{self.prefix}_{counter}_total"
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{{{base}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+span = REGISTRY.span
+observe = REGISTRY.observe
+increment = REGISTRY.increment
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        data = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_http_exporter(port, host="0.0.0.0", registry=REGISTRY):
+    """Sert GET /metrics sur un port annexe, dans un thread ; retourne le serveur."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_metrics_file(path, registry=REGISTRY):
+    # Écriture atomique : un collecteur ne lit jamais un fichier partiel
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def start_file_exporter(path, interval=15.0, registry=REGISTRY):
+    """Réécrit `path` toutes les `interval` secondes, dans un thread ; retourne le thread."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            write_metrics_file(path, registry)
+
+    thread = threading.Thread(target=loop, name="metrics-file", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_exporters_from_env(registry=REGISTRY):
+    """Démarre les exports configurés (METRICS_PORT, METRICS_FILE) ; à appeler une fois par processus."""
+    exporters = []
+    if os.getenv("METRICS_PORT"):
+        exporters.append(start_http_exporter(int(os.environ["METRICS_PORT"]), registry=registry))
+    if os.getenv("METRICS_FILE"):
+        exporters.append(start_file_exporter(os.environ["METRICS_FILE"],
+                                             float(os.getenv("METRICS_INTERVAL", "15")), registry))
+    return exporters
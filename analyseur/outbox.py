@@ -0,0 +1,259 @@
+"""
+File d'envoi (outbox) des emails, hors du chemin de la requête.
+
+Les soumissions déposent un job (payload Resend) dans une table SQLite
+locale ; un pool de threads de fond les délivre avec reprises, backoff
+exponentiel et liste de rejet (dead letters). L'UI ne fait qu'enqueue()
+puis consulte status(), sans attendre Resend.
+
+Statuts : queued -> sending -> sent | queued (nouvel essai) | dead
+
+Un job envoyé perd aussitôt son payload (PDF en base64, adresse) ; sa ligne
+est supprimée après OUTBOX_RETENTION secondes. Un dead letter garde le sien
+pour requeue() pendant le même délai, puis est supprimé à son tour.
+"""
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    provider_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt_at);
+"""
+
+
+class PermanentError(Exception):
+    """Erreur d'envoi non récupérable : le job part directement en dead letter."""
+
+
+def resend_sender(payload):
+    """Envoi via le SDK Resend (RESEND_API_URL permet de viser un serveur local)."""
+    import resend
+    from resend.exceptions import ResendError
+
+    try:
+        result = resend.Emails.send(payload)
+    except ResendError as e:
+        code = int(e.code) if str(e.code).isdigit() else 0
+        if 400 <= code < 500 and code != 429:
+            raise PermanentError(f"{code}: {e}") from e
+        raise
+    return (result or {}).get("id")
+
+
+class Outbox:
+    def __init__(self, path, send=resend_sender, workers=2, max_attempts=5,
+                 base_delay=2.0, max_delay=300.0, poll_interval=1.0, stale_after=300.0,
+                 retention=7 * 86400, purge_interval=3600.0):
+        self.path = path
+        self.send = send
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads = []
+        with self._transaction() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls, send=resend_sender):
+        """Configuration via OUTBOX_DB, OUTBOX_WORKERS, OUTBOX_MAX_ATTEMPTS et OUTBOX_RETENTION (secondes)."""
+        return cls(
+            os.getenv("OUTBOX_DB", "outbox.sqlite3"),
+            send=send,
+            workers=int(os.getenv("OUTBOX_WORKERS", "2")),
+            max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5")),
+            retention=float(os.getenv("OUTBOX_RETENTION", str(7 * 86400))),
+        )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connect()
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # ----- côté soumission -----
+
+    def enqueue(self, payload):
+        """Dépose un email (payload Resend, sérialisable en JSON) ; retourne l'id du job."""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO outbox (payload, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (json.dumps(payload), now, now, now),
+            )
+            job_id = cursor.lastrowid
+        self._wakeup.set()
+        return job_id
+
+    def status(self, job_id):
+        """Retourne {status, attempts, last_error, provider_id} ou None si job inconnu."""
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT status, attempts, last_error, provider_id FROM outbox WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("status", "attempts", "last_error", "provider_id"), row))
+
+    def dead_letters(self, limit=100):
+        """Jobs abandonnés, les plus récents d'abord."""
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, attempts, last_error, payload FROM outbox WHERE status = 'dead' ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"id": job_id, "attempts": attempts, "last_error": error, "payload": json.loads(payload)}
+            for job_id, attempts, error, payload in rows
+        ]
+
+    def requeue(self, job_id):
+        """Remet un dead letter en file (compteur d'essais remis à zéro)."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE outbox SET status = 'queued', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'dead'",
+                (now, now, job_id),
+            )
+        self._wakeup.set()
+
+    def counts(self):
+        with self._transaction() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def purge(self, now=None):
+        """Supprime les jobs envoyés ou abandonnés depuis plus de `retention` secondes ; retourne le nombre de lignes."""
+        now = time.time() if now is None else now
+        with self._transaction() as db:
+            return db.execute(
+                "DELETE FROM outbox WHERE status IN ('sent', 'dead') AND updated_at < ?", (now - self.retention,)
+            ).rowcount
+
+    # ----- workers -----
+
+    def start(self):
+        """Démarre le pool de workers (idempotent) ; retourne self."""
+        if self._threads:
+            return self
+        now = time.time()
+        with self._transaction() as db:
+            # Jobs restés en 'sending' après un arrêt brutal
+            db.execute(
+                "UPDATE outbox SET status = 'queued', updated_at = ? WHERE status = 'sending' AND updated_at < ?",
+                (now, now - self.stale_after),
+            )
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._purge_due()
+                job = self._claim()
+            except sqlite3.Error:
+                logger.exception("outbox: lecture de la file impossible")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._deliver(*job)
+
+    def _purge_due(self):
+        # au plus une purge par purge_interval et par processus ; DELETE idempotent entre répliques
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        purged = self.purge(now)
+        if purged:
+            logger.info("outbox: %d job(s) envoyé(s) ou abandonné(s) purgé(s)", purged)
+
+    def _claim(self):
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT id, payload, attempts FROM outbox WHERE status = 'queued' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                db.execute("UPDATE outbox SET status = 'sending', updated_at = ? WHERE id = ?", (now, row[0]))
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return row
+
+    def _backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _deliver(self, job_id, payload, attempts):
+        attempts += 1
+        try:
+            provider_id = self.send(json.loads(payload))
+        except Exception as e:
+            now = time.time()
+            error = f"{type(e).__name__}: {e}"
+            dead = isinstance(e, PermanentError) or attempts >= self.max_attempts
+            with self._transaction() as db:
+                db.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    ("dead" if dead else "queued", attempts, error,
+                     now if dead else now + self._backoff(attempts), now, job_id),
+                )
+            return
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE outbox SET status = 'sent', payload = '', attempts = ?, last_error = NULL, provider_id = ?, "
+                "updated_at = ? WHERE id = ?",
+                (attempts, provider_id, time.time(), job_id),
+            )
@@ -0,0 +1,183 @@
+"""
+Cache adressé par contenu des rapports PDF générés.
+
+Un rapport de quiz ne dépend que de (score, catégorie, entreprise, secteur,
+taille) : la clé est un hash SHA-256 de ces entrées. Deux niveaux :
+- mémoire : LRU bornée en nombre d'entrées
+- disque (optionnel) : un fichier par clé, éviction des moins récemment
+  utilisés quand la taille totale dépasse la limite
+Thread-safe : partagé entre toutes les sessions Streamlit du processus. Le
+verrou ne protège que la LRU mémoire et les compteurs ; les lectures et
+écritures de fichiers se font hors verrou (écriture dans un fichier
+temporaire puis rename atomique). PDF_CACHE_DIR pouvant être partagé entre
+répliques, la taille du disque est recalculée en le parcourant à chaque
+éviction, et au moins toutes les `rescan_interval` secondes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def report_key(*parts):
+    """Clé de cache stable pour une liste d'entrées sérialisables en JSON."""
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, max_items=256, directory=None, max_disk_bytes=100 * 1024 * 1024, rescan_interval=30.0):
+        self.max_items = max_items
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.rescan_interval = rescan_interval
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._disk_bytes = 0
+        self._next_rescan = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._evict_disk()
+
+    @classmethod
+    def from_env(cls):
+        """Configuration via PDF_CACHE_MAX_ITEMS, PDF_CACHE_DIR et PDF_CACHE_MAX_BYTES."""
+        return cls(
+            max_items=int(os.getenv("PDF_CACHE_MAX_ITEMS", "256")),
+            directory=os.getenv("PDF_CACHE_DIR") or None,
+            max_disk_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(100 * 1024 * 1024))),
+        )
+
+    # ----- disque -----
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _disk_entries(self):
+        """(mtime, chemin, taille) de chaque fichier du cache disque."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".pdf"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # évincé entre-temps par une autre réplique
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _disk_get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mtime = dernier accès, pour l'éviction LRU
+        except OSError:
+            pass
+        return data
+
+    def _disk_put(self, key, data):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._disk_bytes += len(data)
+            due = self._disk_bytes > self.max_disk_bytes or time.monotonic() >= self._next_rescan
+        if due:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Recalcule la taille du disque (écritures des autres répliques comprises) et évince au besoin."""
+        # un seul parcours à la fois dans le processus ; les autres threads n'attendent pas
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            entries = sorted(self._disk_entries())
+            total = sum(size for _, _, size in entries)
+            for _, path, size in entries:
+                if total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # évincé par une autre réplique
+                total -= size
+            with self._lock:
+                self._disk_bytes = total
+                self._next_rescan = time.monotonic() + self.rescan_interval
+        finally:
+            self._evict_lock.release()
+
+    # ----- API -----
+
+    def get(self, key):
+        """Retourne les bytes en cache ou None ; met à jour les compteurs."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self._disk_get(key) if self.directory else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self._remember(key, data)
+            self.hits += 1
+            self.disk_hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+        if self.directory:
+            self._disk_put(key, data)
+
+    def _remember(self, key, data):
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get_or_build(self, key, build):
+        """Cache-aside : retourne l'entrée en cache, sinon appelle build() et la stocke."""
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
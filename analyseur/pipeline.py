@@ -0,0 +1,119 @@
+"""
+Exécution des étapes LLM de l'analyseur sous forme de graphe de dépendances.
+
+Chaque étape déclare les étapes dont elle lit le résultat ; le planificateur
+asyncio lance une étape dès que ses dépendances sont terminées. Les étapes
+indépendantes (détection IA et RGPD, qui ne lisent que le crawl) tournent en
+parallèle : la durée totale suit le chemin critique, plus la somme des appels.
+Une étape peut aussi être une coroutine locale (`run`) au lieu d'un appel LLM :
+le crawl HTTP réel du site, ou les vérifications RGPD déterministes qui ne
+consultent le LLM (via `ask`) que pour les points ambigus.
+
+    crawl ─┬─> ia ──> aiact ─┬─> rapport
+           └─> rgpd ─────────┘
+"""
+
+import asyncio
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from analyseur.digest import estimate_tokens
+from analyseur.llm_cache import cache_key, llm_params
+from analyseur.metrics import increment, span
+
+
+class Step(NamedTuple):
+    name: str
+    deps: Tuple[str, ...]
+    label: str  # affiché au démarrage de l'étape
+    done: str  # affiché à la fin de l'étape
+    prompt: Optional[Callable]  # results -> prompt, results ne contient que les dépendances terminées
+    run: Optional[Callable] = None  # coroutine (results, ask) -> texte, remplace l'appel LLM
+
+
+def ordered(steps):
+    """Étapes triées topologiquement ; ValueError si dépendance inconnue ou cycle."""
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        unknown = set(step.deps) - set(by_name)
+        if unknown:
+            raise ValueError(f"étape {step.name} : dépendances inconnues {sorted(unknown)}")
+    result, visiting, visited = [], set(), set()
+
+    def visit(step):
+        if step.name in visited:
+            return
+        if step.name in visiting:
+            raise ValueError(f"cycle de dépendances autour de {step.name}")
+        visiting.add(step.name)
+        for dep in step.deps:
+            visit(by_name[dep])
+        visiting.discard(step.name)
+        visited.add(step.name)
+        result.append(step)
+
+    for step in steps:
+        visit(step)
+    return result
+
+
+async def run_dag(steps, run_step, on_event=None):
+    """
+    Exécute les étapes ; run_step(step, prompt) est une coroutine qui retourne le texte
+    (les étapes avec `run` sont exécutées directement ; leur second argument, ask(prompt),
+    passe par run_step).
+    on_event(event, step) est appelé dans la boucle ("start" puis "done") : sur le
+    thread appelant, donc utilisable pour mettre à jour un st.status.
+    Retourne {nom: texte}. La première erreur annule les étapes en cours.
+    """
+    results = {}
+    tasks = {}
+
+    async def execute(step):
+        for dep in step.deps:
+            await tasks[dep]
+        if on_event:
+            on_event("start", step)
+        if step.run is not None:
+            with span("step", step=step.name):
+                results[step.name] = await step.run(results, lambda prompt: run_step(step, prompt))
+        else:
+            results[step.name] = await run_step(step, step.prompt(results))
+        if on_event:
+            on_event("done", step)
+
+    for step in ordered(steps):
+        tasks[step.name] = asyncio.ensure_future(execute(step))
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    return results
+
+
+def run_pipeline(steps, llm, on_event=None, cache=None, refresh=False):
+    """
+    Exécute le pipeline avec llm.ainvoke (une span de latence par étape) ; retourne {nom: texte}.
+    cache : LLMCache consulté avant chaque appel (cache-aside) ; refresh=True ignore
+    les réponses en cache mais y enregistre les nouvelles.
+    """
+    params = llm_params(llm)
+
+    async def run_step(step, prompt):
+        key = cache_key(prompt, params) if cache else None
+        # SQLite est bloquant (jusqu'à 30 s d'attente de verrou) : hors de la boucle pour
+        # ne pas suspendre les étapes en vol
+        if cache and not refresh:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
+        # tokens comptés seulement pour un prompt réellement envoyé (pas pour un succès du cache)
+        increment("prompt_tokens", estimate_tokens(prompt), step=step.name)
+        with span("llm", step=step.name):
+            response = await llm.ainvoke(prompt)
+        if cache:
+            await asyncio.to_thread(cache.put, key, response.content)
+        return response.content
+
+    return asyncio.run(run_dag(steps, run_step, on_event))
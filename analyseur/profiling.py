@@ -0,0 +1,166 @@
+"""
+Profilage à la demande d'un run de script Streamlit (ou d'un pipeline d'analyse).
+
+    run_profile = start_run("quiz", requested=st.query_params.get("profile"))
+    try:
+        ...  # le run
+    finally:
+        if run_profile:
+            run_profile.stop()
+
+stop() doit être appelé même si le run lève ou est interrompu par un rerun
+Streamlit (RerunException, StopException) : sinon cProfile et tracemalloc
+restent actifs pour toutes les sessions du processus.
+
+Un run profilé est exécuté sous cProfile (thread du script) avec tracemalloc
+actif ; à la fin, trois fichiers sont écrits dans PROFILE_DIR :
+- <préfixe>.pstats      pour pstats, snakeviz ou flameprof (flamegraph SVG)
+- <préfixe>.tracemalloc snapshot mémoire (tracemalloc.Snapshot.load)
+- <préfixe>.txt         résumé : top fonctions (temps cumulé), top allocations
+
+Configuration (profilage désactivé si PROFILE_DIR n'est pas défini) :
+- PROFILE_SAMPLE_RATE  proportion des runs profilés automatiquement (défaut 0)
+- PROFILE_TOKEN        ?profile=<token> force le profilage de ce run
+- PROFILE_MAX_PER_HOUR plafond par processus, toutes sources confondues (défaut 12)
+
+Un seul run profilé à la fois par processus (tracemalloc est global) : les
+demandes concurrentes sont ignorées, comme celles au-delà du plafond.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+TRACEMALLOC_FRAMES = 10
+
+# Filet de sécurité si stop() n'a pas été appelé (appelant sans finally, thread
+# du script tué) : passé ce délai, le profil est abandonné pour libérer la place.
+STALE_AFTER = 300.0
+
+
+class _Limiter:
+    """Au plus `max_runs` profils par fenêtre glissante d'une heure, un seul à la fois."""
+
+    def __init__(self, max_runs):
+        self.max_runs = max_runs
+        self.active = threading.Lock()
+        self.current = None
+        self._starts = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        current = self.current
+        if current is not None and time.time() - current.started_at > STALE_AFTER:
+            current.abandon()
+        if not self.active.acquire(blocking=False):
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._starts and now - self._starts[0] > 3600:
+                self._starts.popleft()
+            if len(self._starts) >= self.max_runs:
+                self.active.release()
+                return False
+            self._starts.append(now)
+        return True
+
+
+_limiter = _Limiter(int(os.getenv("PROFILE_MAX_PER_HOUR", "12")))
+
+
+class RunProfile:
+    def __init__(self, name, directory):
+        self.name = name
+        self.directory = directory
+        self.started_at = time.time()
+        self._stopped = False
+        self._tracemalloc_owner = not tracemalloc.is_tracing()
+        if self._tracemalloc_owner:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _finish(self):
+        """Marque le profil terminé et libère la place ; False s'il l'était déjà."""
+        with _limiter._lock:
+            if self._stopped:
+                return False
+            self._stopped = True
+            _limiter.current = None
+        return True
+
+    def stop(self):
+        """Arrête le profilage et écrit les fichiers ; retourne le préfixe des chemins."""
+        if not self._finish():
+            return None
+        try:
+            self._profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if self._tracemalloc_owner:
+                tracemalloc.stop()
+            return self._write(snapshot)
+        finally:
+            _limiter.active.release()
+
+    def abandon(self):
+        """Libère un profil jamais arrêté (appelé depuis un autre thread : rien n'est écrit)."""
+        if not self._finish():
+            return
+        if self._tracemalloc_owner:
+            tracemalloc.stop()
+        logger.warning("profil %s abandonné (run interrompu avant stop())", self.name)
+        _limiter.active.release()
+
+    def _write(self, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at)) + f".{int(self.started_at * 1000) % 1000:03d}"
+        prefix = os.path.join(self.directory, f"{stamp}-{self.name}-{os.getpid()}-{threading.get_ident()}")
+        elapsed = time.time() - self.started_at
+
+        self._profiler.dump_stats(prefix + ".pstats")
+        snapshot.dump(prefix + ".tracemalloc")
+
+        summary = io.StringIO()
+        summary.write(f"{self.name} : {elapsed * 1000:.1f} ms\n\n")
+        pstats.Stats(self._profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+        summary.write("\nAllocations (top 30, lignes) :\n")
+        for stat in snapshot.statistics("lineno")[:30]:
+            summary.write(f"{stat}\n")
+        with open(prefix + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+
+        logger.info("profil %s écrit : %s.{pstats,tracemalloc,txt}", self.name, prefix)
+        return prefix
+
+
+def should_profile(requested=None):
+    """Décide si ce run est profilé : jeton ?profile= valide, ou tirage selon PROFILE_SAMPLE_RATE."""
+    if not os.getenv("PROFILE_DIR"):
+        return False
+    token = os.getenv("PROFILE_TOKEN")
+    if requested and token and hmac.compare_digest(str(requested), token):
+        return True
+    return random.random() < float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+
+def start_run(name, requested=None):
+    """Démarre le profilage de ce run si demandé et autorisé ; retourne un RunProfile ou None."""
+    if not should_profile(requested) or not _limiter.acquire():
+        return None
+    try:
+        profile = RunProfile(name, os.environ["PROFILE_DIR"])
+    except Exception:
+        _limiter.active.release()
+        raise
+    _limiter.current = profile
+    return profile
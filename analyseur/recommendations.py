@@ -0,0 +1,144 @@
+"""
+Catalogue des recommandations du Quiz AI Act, par catégorie de score.
+
+Construit une seule fois à l'import, en structure immuable (mappings en
+lecture seule, tuples) : get_recommendations() est un simple accès O(1),
+sans réallouer les textes à chaque soumission.
+"""
+
+from types import MappingProxyType
+
+
+_CATALOGUE = {
+    "excellent": {
+        "emoji": "🟢",
+        "title": "EXCELLENT (80-100%)",
+        "description": "Félicitations ! Votre organisation démontre une maturité élevée en conformité AI Act (Règlement UE 2024/1689).",
+        "strengths": [
+            "Documentation complète de vos systèmes IA",
+            "Processus d'évaluation des risques établi",
+            "Gouvernance IA structurée avec contrôle humain",
+            "Transparence envers les utilisateurs"
+        ],
+        "next_steps": [
+            "Maintenir vos processus de surveillance post-marché continue",
+            "Préparer la certification formelle avant août 2026",
+            "Former vos équipes sur les mises à jour réglementaires",
+            "Documenter les cas limites et exceptions",
+            "Vérifier l'absence de pratiques interdites (Article 5)"
+        ],
+        "cta": "Besoin d'un audit final avant certification ? Contactez-nous pour valider votre conformité complète."
+    },
+
+    "moyen": {
+        "emoji": "🟡",
+        "title": "MOYEN (60-79%)",
+        "description": "Votre organisation est partiellement conforme mais présente des lacunes importantes.",
+        "strengths": [
+            "Bases de conformité présentes",
+            "Conscience des enjeux IA",
+            "Certains processus en place"
+        ],
+        "gaps": [
+            "Documentation technique incomplète ou non à jour",
+            "Processus d'évaluation des risques à formaliser",
+            "Surveillance post-marché absente ou insuffisante",
+            "Gouvernance IA à structurer",
+            "Transparence à améliorer"
+        ],
+        "risks": [
+            "Amendes potentielles en cas d'audit (jusqu'à 35M€ ou 7% du CA mondial)",
+            "Non-conformité lors du déploiement de nouveaux systèmes",
+            "Incapacité à démontrer la conformité aux autorités",
+            "Violation possible de l'Article 5 (pratiques interdites)"
+        ],
+        "next_steps": [
+            "Réaliser un audit complet de vos systèmes IA (classification Annexe III)",
+            "Vérifier l'absence de pratiques interdites (manipulation, scoring social, émotions)",
+            "Établir un plan d'action priorisé",
+            "Mettre en place documentation technique conforme (Article 11)",
+            "Former vos opérateurs de systèmes haut risque"
+        ],
+        "cta": "Nous pouvons vous aider avec un plan d'action sur-mesure adapté à votre situation."
+    },
+
+    "faible": {
+        "emoji": "🟠",
+        "title": "FAIBLE (40-59%)",
+        "description": "⚠️ ATTENTION : Votre organisation présente des lacunes critiques en conformité AI Act.",
+        "gaps": [
+            "Absence de documentation technique (Article 11)",
+            "Aucun processus d'évaluation des risques (Article 9)",
+            "Pas de surveillance post-marché (Article 72)",
+            "Pas de gouvernance IA ni contrôle humain (Articles 14 et 17)",
+            "Manque de transparence vis-à-vis des utilisateurs (Article 50)",
+            "Aucune formation des opérateurs",
+            "Possibles violations de l'Article 5 (pratiques interdites)"
+        ],
+        "risks": [
+            "🚨 Amendes très élevées en cas d'inspection (jusqu'à 35M€ ou 7% CA mondial)",
+            "🚨 Interdiction de mise sur le marché de vos systèmes IA",
+            "🚨 Responsabilité juridique en cas d'incident",
+            "🚨 Perte de confiance clients et partenaires",
+            "🚨 Violation Article 5 = amendes jusqu'à 35M€ ou 7% CA"
+        ],
+        "urgent_actions": [
+            "IMMÉDIAT : Vérifier absence de pratiques interdites (Article 5)",
+            "SEMAINE 1 : Identifier tous vos systèmes IA et classifier selon Annexe III",
+            "SEMAINE 2 : Évaluer les systèmes à haut risque",
+            "MOIS 1 : Mettre en place documentation minimale",
+            "MOIS 2-3 : Établir gouvernance et formation",
+            "MOIS 3 : Implémenter surveillance post-marché"
+        ],
+        "cta": "⚠️ ACTION URGENTE REQUISE. Contactez-nous pour un audit d'urgence et un plan de mise en conformité rapide."
+    },
+
+    "critique": {
+        "emoji": "🔴",
+        "title": "CRITIQUE (0-39%)",
+        "description": "🚨 ALERTE ROUGE : Votre organisation est en situation de non-conformité grave avec l'AI Act (Règlement UE 2024/1689).",
+        "severity": "Votre score indique une absence quasi-totale de mesures de conformité. Si vous utilisez des systèmes IA en Europe, vous êtes actuellement en violation potentielle de l'AI Act européen.",
+        "immediate_risks": [
+            "⛔ Amendes maximales en cas d'inspection : jusqu'à 35M€ ou 7% du CA mondial",
+            "⛔ Violation Article 5 (pratiques interdites) : amendes jusqu'à 35M€",
+            "⛔ Interdiction immédiate de mise sur le marché",
+            "⛔ Responsabilité pénale en cas d'incident grave",
+            "⛔ Impossibilité de commercer avec clients européens",
+            "⛔ Atteinte majeure à votre réputation",
+            "⛔ Systèmes haut risque non conformes (Annexe III) : sanctions immédiates"
+        ],
+        "emergency_plan": [
+            "🚨 AUJOURD'HUI : Vérifier pratiques interdites (manipulation, scoring social, émotions au travail) - Article 5",
+            "🚨 AUJOURD'HUI : Recenser tous vos systèmes IA",
+            "🚨 CETTE SEMAINE : Classifier systèmes selon Annexe III (haut risque vs limité)",
+            "🚨 SEMAINE 2 : Évaluer les systèmes à haut risque",
+            "🚨 CE MOIS : Suspendre ou documenter les systèmes critiques",
+            "🚨 90 JOURS : Établir conformité minimale viable (documentation, risques, gouvernance)"
+        ],
+        "legal_note": "Note importante : L'AI Act (Règlement UE 2024/1689) entre en pleine application en août 2026. Les pratiques interdites (Article 5) sont déjà en vigueur depuis février 2025. Toute non-conformité expose à des sanctions immédiates. Vous avez encore du temps pour agir, mais la situation nécessite une intervention urgente.",
+        "cta": "🆘 AIDE D'URGENCE NÉCESSAIRE. Contactez-nous IMMÉDIATEMENT pour un diagnostic d'urgence gratuit et un plan de sauvetage."
+    }
+}
+
+
+def _freeze(value):
+    """Convertit récursivement dicts et listes en MappingProxyType et tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+RECOMMENDATIONS = _freeze(_CATALOGUE)
+del _CATALOGUE
+
+CATEGORIES = tuple(RECOMMENDATIONS)
+
+
+def get_recommendations(score, responses, category):
+    """
+    Retourne les recommandations selon le score et les réponses.
+    Version v1.0 : textes pré-écrits par catégorie
+    """
+    return RECOMMENDATIONS[category]
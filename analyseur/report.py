@@ -0,0 +1,153 @@
+"""
+Génération du rapport PDF du Quiz AI Act.
+
+Les parties statiques du rapport (en-tête, ligne de catégorie, résumé, listes
+de recommandations, avertissement, CTA) ne dépendent que de la catégorie :
+elles sont parsées une seule fois par catégorie et par processus. Chaque
+rapport ne construit que les parties dynamiques (entreprise, secteur, taille,
+score) et assemble des copies superficielles des fragments en cache.
+
+Les copies sont nécessaires car reportlab stocke l'état de mise en page
+(wrap/split) sur les flowables ; le texte parsé (frags), lui, est partagé.
+"""
+
+import copy
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from analyseur.pdf_cache import PdfCache, report_key
+from analyseur.recommendations import RECOMMENDATIONS
+from analyseur.styles import get_stylesheet
+
+# À incrémenter à chaque changement de mise en page : invalide le cache disque
+REPORT_VERSION = "quiz-v1"
+
+PDF_CACHE = PdfCache.from_env()
+
+DISCLAIMER = "Ce rapport est une auto-évaluation indicative basée sur l'AI Act (Règlement UE 2024/1689). Il ne constitue pas un avis juridique. Consultez un avocat spécialisé en droit européen pour une analyse complète."
+
+# Sections de recommandations par catégorie : (titre, clé du catalogue)
+_SECTIONS = {
+    "excellent": (
+        ("Points forts:", "strengths"),
+        ("Prochaines étapes:", "next_steps"),
+    ),
+    "moyen": (
+        ("Lacunes identifiées:", "gaps"),
+        ("Risques:", "risks"),
+        ("Actions recommandées:", "next_steps"),
+    ),
+    "faible": (
+        ("Lacunes critiques:", "gaps"),
+        ("Risques:", "risks"),
+        ("Plan d'action:", "urgent_actions"),
+    ),
+    "critique": (
+        ("Lacunes critiques:", "gaps"),
+        ("Risques:", "immediate_risks"),
+        ("Plan d'action:", "emergency_plan"),
+    ),
+}
+
+
+def _bullet_section(title, items, styles):
+    flowables = [Paragraph(f"<b>{title}</b>", styles['Heading3']), Spacer(1, 8)]
+    for item in items:
+        flowables.append(Paragraph(f"• {item}", styles['Normal']))
+    return flowables
+
+
+@lru_cache(maxsize=None)
+def header_fragment():
+    """Titre et sous-titre, communs à tous les rapports."""
+    styles = get_stylesheet()
+    return (
+        Paragraph("Rapport de Conformité AI Act", styles['Title']),
+        Paragraph("Règlement (UE) 2024/1689", styles['Heading3']),
+        Spacer(1, 20),
+    )
+
+
+@lru_cache(maxsize=None)
+def category_fragment(category):
+    """Tout ce qui suit le score : catégorie, résumé, recommandations, avertissement, CTA."""
+    styles = get_stylesheet()
+    recommendations = RECOMMENDATIONS[category]
+    story = [
+        Paragraph(f"<b>Catégorie:</b> {recommendations['title']}", styles['Heading3']),
+        Spacer(1, 20),
+        Paragraph("<b>Résumé:</b>", styles['Heading3']),
+        Spacer(1, 8),
+        Paragraph(recommendations['description'], styles['Normal']),
+        Spacer(1, 20),
+    ]
+
+    if category == "critique":
+        story.append(Paragraph(recommendations['severity'], styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    sections = _SECTIONS[category]
+    for i, (title, key) in enumerate(sections):
+        story.extend(_bullet_section(title, recommendations.get(key, ()), styles))
+        if i < len(sections) - 1:
+            story.append(Spacer(1, 12))
+
+    # Disclaimer
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("<b>Avertissement:</b>", styles['Heading3']))
+    story.append(Spacer(1, 8))
+    story.append(Paragraph(DISCLAIMER, styles['Normal']))
+
+    # CTA
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("<b>Besoin d'aide ?</b>", styles['Heading3']))
+    story.append(Spacer(1, 8))
+    story.append(Paragraph(recommendations['cta'], styles['Normal']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Contact: https://aiconforme.com", styles['Normal']))
+    return tuple(story)
+
+
+def warm_up():
+    """Prépare les fragments de toutes les catégories (à appeler au démarrage si souhaité)."""
+    header_fragment()
+    for category in RECOMMENDATIONS:
+        category_fragment(category)
+
+
+def build_quiz_story(score, category, company_name="", company_sector="", company_size=""):
+    """Assemble la story du rapport : fragments statiques copiés + parties dynamiques."""
+    styles = get_stylesheet()
+    story = [copy.copy(f) for f in header_fragment()]
+
+    if company_name:
+        story.append(Paragraph(f"<b>Entreprise:</b> {escape(company_name)}", styles['Normal']))
+    if company_sector:
+        story.append(Paragraph(f"<b>Secteur:</b> {escape(company_sector)}", styles['Normal']))
+    if company_size:
+        story.append(Paragraph(f"<b>Taille:</b> {escape(company_size)}", styles['Normal']))
+
+    story.append(Spacer(1, 20))
+    story.append(Paragraph(f"<b>Score global:</b> {score}/100", styles['Heading2']))
+    story.extend(copy.copy(f) for f in category_fragment(category))
+    return story
+
+
+def build_quiz_report(score, category, company_name="", company_sector="", company_size=""):
+    """Retourne le rapport PDF du quiz (bytes)."""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc.build(build_quiz_story(score, category, company_name, company_sector, company_size))
+    return buffer.getvalue()
+
+
+def get_quiz_report(score, category, company_name="", company_sector="", company_size=""):
+    """Rapport PDF du quiz via PDF_CACHE : reportlab n'est sollicité qu'en cas de miss."""
+    key = report_key(REPORT_VERSION, score, category, company_name, company_sector, company_size)
+    return PDF_CACHE.get_or_build(
+        key, lambda: build_quiz_report(score, category, company_name, company_sector, company_size)
+    )
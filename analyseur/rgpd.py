@@ -0,0 +1,358 @@
+"""
+Vérifications RGPD déterministes sur les pages explorées (analyseur.crawler).
+
+    report = check_site(site)
+    report.text()                  # constats + preuves, score RGPD
+    if report.ambiguous():
+        report = report.resolve(llm_answer_to(report.prompt(url)))
+
+Cinq points, ceux que le prompt RGPD demandait au modèle de deviner :
+bandeau cookies, politique de confidentialité, mentions légales, formulaires
+avec consentement, droit d'accès. Chaque page est lue en une seule passe
+html.parser ; texte, liens et attributs sont confrontés à une expression
+compilée par canal (une alternative nommée par signal) ; traceurs et
+plateformes de consentement viennent de analyseur.trackers, les constats
+formulaire par formulaire de analyseur.forms. Chaque
+constat cite ses preuves (URL + extrait). Seuls les points ambigus sont
+soumis au LLM ; sans point ambigu, l'étape RGPD ne fait aucun appel.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import NamedTuple, Tuple
+
+from analyseur.forms import AMBIGU, CONFORME, NON_CONFORME, analyse_forms
+from analyseur.trackers import scan_site
+
+MAX_EVIDENCE = 3  # extraits conservés par signal
+
+
+class Check(NamedTuple):
+    key: str
+    label: str
+    weight: int  # points sur 100
+
+
+CHECKS = (
+    Check("cookies", "Bandeau cookies", 25),
+    Check("politique", "Politique de confidentialite", 25),
+    Check("mentions", "Mentions legales", 15),
+    Check("formulaires", "Formulaires avec consentement", 20),
+    Check("droits", "Droit d'acces aux donnees", 15),
+)
+
+
+class _Channel:
+    """
+    Signaux d'un canal : une expression compilée (une alternative nommée par signal),
+    tentée seulement si l'un des mots-clés littéraux est présent. Le test `in` est
+    bien plus rapide que le moteur d'expressions sur du texte sans rapport (articles,
+    archives), qui est l'essentiel du volume.
+    """
+
+    def __init__(self, signals):
+        self.regex = re.compile("|".join(f"(?P<{name}>{pattern})" for name, (pattern, _) in signals.items()), re.I)
+        self.keywords = tuple(keyword for _, keywords in signals.values() for keyword in keywords)
+
+    def finditer(self, text):
+        lowered = text.lower()
+        if not any(keyword in lowered for keyword in self.keywords):
+            return ()
+        return self.regex.finditer(text)
+
+    def search(self, text):
+        return next(iter(self.finditer(text)), None)
+
+
+# Texte visible, par bloc (paragraphe, bouton, pied de page...)
+_TEXT = _Channel({
+    "banner_text": (r"(?:accepter|refuser|personnaliser|param[ée]trer|g[ée]rer)(?: tous| tout)?(?: les)? cookies"
+                    r"|(?:nous utilisons|ce site utilise|utilise des) (?:des )?cookies|we use cookies|accept (?:all )?cookies",
+                    ("cookie",)),
+    "rights_text": (r"droit d['’]acc[èe]s|droit de rectification|droit [àa] l['’]effacement|droit d['’]opposition"
+                    r"|droit [àa] la portabilit[ée]|exercer vos droits|d[ée]l[ée]gu[ée] [àa] la protection des donn[ée]es"
+                    r"|\bdpo\b",
+                    ("droit", "protection des donn", "dpo")),
+    "policy_content": (r"responsable du traitement|finalit[ée]s? du traitement|dur[ée]e de conservation|base l[ée]gale",
+                       ("traitement", "conservation", "base l")),
+    "legal_identity": (r"\brcs\b|\bsiren\b|\bsiret\b|capital (?:social )?de|h[ée]bergeur|directeur de (?:la )?publication",
+                       ("rcs", "sire", "capital", "bergeur", "directeur")),
+    "policy_mention": (r"confidentialit[ée]|donn[ée]es personnelles|vie priv[ée]e",
+                       ("confidentialit", "es personnelles", "vie priv")),
+    "legal_mention": (r"mentions l[ée]gales", ("mentions l",)),
+})
+
+# href + texte du lien
+_LINK = _Channel({
+    "policy_link": (r"confidentialit|privacy|donnees-personnelles|donn[ée]es personnelles|protection des donn[ée]es"
+                    r"|vie[- ]priv[ée]e|\brgpd\b|\bgdpr\b",
+                    ("confidentialit", "privacy", "personnelles", "protection des donn", "vie", "rgpd", "gdpr")),
+    "legal_link": (r"mentions[- _]l[ée]gales|legal[- _]notice|impressum|informations[- _]l[ée]gales",
+                   ("mentions", "legal", "impressum", "informations")),
+})
+
+# id, class, aria-label et data-* des éléments
+_ATTR = _Channel({
+    "banner_attr": (r"cookie[-_ ]?(?:banner|consent|notice|bar|law|popup|modal)|consent[-_ ]?(?:banner|manager|popup)"
+                    r"|tarteaucitron|axeptio|didomi|onetrust|cookiebot|cmplz|cky-consent",
+                    ("cookie", "consent", "tarteaucitron", "axeptio", "didomi", "onetrust", "cmplz")),
+})
+
+# Blocs après lesquels le texte accumulé est analysé
+_BLOCKS = {"p", "div", "section", "article", "aside", "header", "footer", "nav", "main", "li", "ul", "ol",
+           "button", "label", "form", "h1", "h2", "h3", "h4", "h5", "h6", "td", "th", "tr", "table", "br", "dialog"}
+_SKIPPED = {"script", "style", "svg", "template", "noscript"}
+_MAX_BLOCK = 2000
+
+
+class Finding(NamedTuple):
+    check: Check
+    status: str
+    detail: str
+    evidence: Tuple[str, ...]  # "url : extrait"
+    by_llm: bool = False  # point ambigu tranché par le LLM
+
+
+def _snippet(text, match, context=60):
+    """Extrait autour de la correspondance, coupé aux espaces."""
+    start = text.rfind(" ", 0, max(match.start() - context, 0)) + 1
+    end = text.find(" ", match.end() + context)
+    return " ".join(text[start:end if end != -1 else len(text)].split())
+
+
+class EvidenceScanner(HTMLParser):
+    """Une passe sur le HTML d'une page ; signals : nom -> {extrait: preuve}."""
+
+    def __init__(self, url, signals):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.signals = signals
+        self._text = []
+        self._size = 0
+        self._skip = 0
+        self._link = None  # [href, texte]
+
+    def _record(self, channel, text):
+        seen = set()
+        for match in channel.finditer(text):
+            if match.lastgroup in seen:
+                continue  # un extrait par signal et par bloc
+            seen.add(match.lastgroup)
+            found = self.signals.setdefault(match.lastgroup, {})
+            snippet = _snippet(text, match)
+            # un même extrait (lien du pied de page, répété sur chaque page) n'est cité qu'une fois
+            if len(found) < MAX_EVIDENCE and snippet not in found:
+                found[snippet] = f"{self.url} : {snippet}"
+
+    def _flush(self):
+        if self._text:
+            self._record(_TEXT, " ".join("".join(self._text).split()))
+            self._text = []
+            self._size = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCKS:
+            self._flush()
+        attrs = dict(attrs)
+        marks = " ".join(v for k, v in attrs.items() if v and (k in ("id", "class", "aria-label") or k.startswith("data-")))
+        if marks:
+            self._record(_ATTR, marks)
+        if tag in _SKIPPED:
+            self._skip += 1
+        elif tag == "a":
+            self._link = [attrs.get("href") or "", []]
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in _SKIPPED:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "a" and self._link is not None:
+            href, text = self._link
+            self._record(_LINK, f"{href} {' '.join(''.join(text).split())}")
+            self._link = None
+        if tag in _BLOCKS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._link is not None:
+            self._link[1].append(data)
+        self._text.append(data)
+        self._size += len(data)
+        if self._size > _MAX_BLOCK:
+            self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def scan_pages(pages):
+    """Signaux trouvés sur l'ensemble des pages : nom -> {extrait: preuve}."""
+    signals = {}
+    for page in pages:
+        if page.html:
+            scanner = EvidenceScanner(page.url, signals)
+            scanner.feed(page.html)
+            scanner.close()
+    return signals
+
+
+def check_site(site, trackers=None, forms=None):
+    """Rapport RGPD déterministe d'un SiteModel ; trackers (TrackerInventory) et forms
+    (constats de analyse_forms) sont recalculés s'ils ne sont pas fournis."""
+    pages = site.pages if site else ()
+    signals = scan_pages(pages)
+    get = lambda *names: tuple(e for name in names for e in signals.get(name, {}).values())
+    checks = {check.key: check for check in CHECKS}
+    findings = []
+
+    if not pages:
+        for check in CHECKS:
+            findings.append(Finding(check, AMBIGU, "site non exploré", ()))
+        return RGPDReport(tuple(findings))
+
+    # Bandeau cookies : plateforme de consentement connue ou bandeau dans le HTML. Des traceurs
+    # (analyseur/trackers.py) chargés sans neutralisation priment : un bandeau ne suffit pas.
+    trackers = trackers if trackers is not None else scan_site(site)
+    platforms = trackers.consent_platforms()
+    required = trackers.requiring_consent()
+    tracker_evidence = tuple(f"{vendor} : {found[0].source} {found[0].evidence} ({found[0].page})"
+                             for vendor, found in list(required.items())[:MAX_EVIDENCE])
+    early_cookies = tuple(f"{d.signature.vendor} : cookie {d.evidence} ({d.page})"
+                          for found in required.values() for d in found if d.source == "cookie")
+    known = {d.evidence for d in trackers.detections}
+    unknown = tuple(f"cookie persistant {c.name} ({page.url})" for page in pages for c in page.cookies
+                    if c.persistent and c.name not in known)[:MAX_EVIDENCE]
+    banner = get("banner_attr", "banner_text")
+    if early_cookies:
+        findings.append(Finding(checks["cookies"], NON_CONFORME, "cookies de traceurs déposés avant tout consentement",
+                                early_cookies[:MAX_EVIDENCE] + banner))
+    elif required and platforms:
+        # la plateforme peut neutraliser les scripts à l'exécution (blocage automatique) : à confirmer
+        findings.append(Finding(checks["cookies"], AMBIGU,
+                                f"{len(required)} traceur(s) chargé(s) sans neutralisation malgré "
+                                + ", ".join(platforms), tracker_evidence))
+    elif required:
+        reason = "malgré le bandeau" if banner else "sans bandeau de consentement"
+        findings.append(Finding(checks["cookies"], NON_CONFORME,
+                                f"{len(required)} traceur(s) chargé(s) avant consentement {reason}",
+                                tracker_evidence + banner))
+    elif platforms:
+        findings.append(Finding(checks["cookies"], CONFORME, "plateforme de consentement : " + ", ".join(platforms),
+                                tuple(f"{vendor} : {found[0].evidence} ({found[0].page})" for vendor, found in platforms.items())))
+    elif get("banner_attr") and get("banner_text"):
+        findings.append(Finding(checks["cookies"], CONFORME, "bandeau cookies dans la page", banner))
+    elif banner:
+        findings.append(Finding(checks["cookies"], AMBIGU, "indices partiels de bandeau", banner))
+    elif unknown:
+        findings.append(Finding(checks["cookies"], AMBIGU, "cookies persistants non identifiés, sans bandeau", unknown))
+    else:
+        findings.append(Finding(checks["cookies"], CONFORME, "aucun traceur détecté, bandeau non requis", ()))
+
+    # Politique de confidentialité
+    if get("policy_link"):
+        findings.append(Finding(checks["politique"], CONFORME, "lien vers la politique", get("policy_link", "policy_content")))
+    elif get("policy_mention", "policy_content"):
+        findings.append(Finding(checks["politique"], AMBIGU, "mention sans lien identifié", get("policy_mention", "policy_content")))
+    else:
+        findings.append(Finding(checks["politique"], NON_CONFORME, "aucune politique de confidentialité trouvée", ()))
+
+    # Mentions légales : lien dédié, ou page titrée comme telle avec l'identité de l'éditeur (RCS, hébergeur...)
+    if get("legal_link") or (get("legal_identity") and get("legal_mention")):
+        findings.append(Finding(checks["mentions"], CONFORME, "mentions légales trouvées", get("legal_link", "legal_identity")))
+    elif get("legal_mention", "legal_identity"):
+        findings.append(Finding(checks["mentions"], AMBIGU, "indices partiels", get("legal_mention", "legal_identity")))
+    else:
+        findings.append(Finding(checks["mentions"], NON_CONFORME, "aucune mention légale trouvée", ()))
+
+    # Formulaires collectant des données personnelles
+    forms = forms if forms is not None else analyse_forms(site)
+    statuses = {form.status for form in forms}
+    # non conformes d'abord : ce sont les preuves à citer
+    evidence = tuple(form.line() for form in sorted(forms, key=lambda form: form.status != NON_CONFORME))
+    if not forms:
+        findings.append(Finding(checks["formulaires"], CONFORME, "aucun formulaire de données personnelles", ()))
+    elif NON_CONFORME in statuses:
+        findings.append(Finding(checks["formulaires"], NON_CONFORME,
+                                f"{sum(form.status == NON_CONFORME for form in forms)} formulaire(s) non conforme(s)",
+                                evidence))
+    elif AMBIGU in statuses:
+        findings.append(Finding(checks["formulaires"], AMBIGU, "consentement à confirmer", evidence))
+    else:
+        findings.append(Finding(checks["formulaires"], CONFORME, f"{len(forms)} formulaire(s) avec consentement", evidence))
+
+    # Droit d'accès : attendu dans la politique ; si elle n'a pas été explorée, ambigu
+    # seule une URL de politique compte : une page de mentions légales explorée ne dit rien des droits
+    policy_crawled = any(m.lastgroup == "policy_link" for page in pages for m in _LINK.finditer(page.url))
+    if get("rights_text"):
+        findings.append(Finding(checks["droits"], CONFORME, "modalités d'exercice des droits", get("rights_text")))
+    elif get("policy_link") and not policy_crawled:
+        findings.append(Finding(checks["droits"], AMBIGU, "politique non explorée", get("policy_link")))
+    else:
+        findings.append(Finding(checks["droits"], NON_CONFORME, "aucune mention du droit d'accès", ()))
+
+    return RGPDReport(tuple(findings))
+
+
+_ANSWER = re.compile(r"^\W*(?P<key>\w+)\W*:\s*(?P<status>non conforme|conforme)\b\W*(?P<reason>.*)$", re.I | re.M)
+
+
+class RGPDReport(NamedTuple):
+    findings: Tuple[Finding, ...]
+
+    def ambiguous(self):
+        return [f for f in self.findings if f.status == AMBIGU]
+
+    def partial_score(self):
+        """(points obtenus, points vérifiés) sur les points tranchés (automatiquement ou par le LLM)."""
+        decided = [f for f in self.findings if f.status != AMBIGU]
+        return sum(f.check.weight for f in decided if f.status == CONFORME), sum(f.check.weight for f in decided)
+
+    def score(self):
+        """Score /100 ; un point resté ambigu compte pour moitié."""
+        points, _ = self.partial_score()
+        return round(points + sum(f.check.weight / 2 for f in self.ambiguous()))
+
+    def prompt(self, url, context=""):
+        """Prompt limité aux points ambigus, avec leurs indices ; context : extraits des pages (analyseur.digest)."""
+        lines = [f"Analyse RGPD du site {url}. Les points suivants n'ont pas pu etre tranches automatiquement.",
+                 'Pour chacun, reponds sur une ligne "<cle>: conforme" ou "<cle>: non conforme", '
+                 "suivi d'une justification courte.", ""]
+        for finding in self.ambiguous():
+            lines.append(f"- {finding.check.key} ({finding.check.label}) : {finding.detail}")
+            lines.extend(f"  Indice: {e}" for e in finding.evidence)
+        if context:
+            lines.extend(["", "Extraits du site:", context])
+        return "\n".join(lines)
+
+    def resolve(self, answer):
+        """Rapport où les points ambigus tranchés par la réponse du LLM prennent son statut."""
+        verdicts = {m["key"].lower(): (m["status"].lower(), m["reason"].strip()) for m in _ANSWER.finditer(answer)}
+        findings = []
+        for finding in self.findings:
+            if finding.status == AMBIGU and finding.check.key in verdicts:
+                status, reason = verdicts[finding.check.key]
+                detail = f"{finding.detail} ; avis LLM" + (f" : {reason}" if reason else "")
+                finding = finding._replace(status=status, detail=detail[:300], by_llm=True)
+            findings.append(finding)
+        return RGPDReport(tuple(findings))
+
+    def text(self):
+        automatic = sum(f.check.weight for f in self.findings if f.status != AMBIGU and not f.by_llm)
+        by_llm = sum(f.check.weight for f in self.findings if f.by_llm)
+        lines = [f"Verifications RGPD ({automatic}/100 points verifies automatiquement"
+                 + (f", {by_llm} par le LLM" if by_llm else "") + "):"]
+        for finding in self.findings:
+            lines.append(f"- {finding.check.label}: {finding.status.upper()} - {finding.detail}")
+            lines.extend(f"  Preuve: {e}" for e in finding.evidence)
+        violations = [f.check.label for f in self.findings if f.status == NON_CONFORME]
+        if violations:
+            lines.append("Violations critiques: " + ", ".join(violations))
+        lines.append(f"Score RGPD: {self.score()}/100")
+        return "\n".join(lines)
@@ -0,0 +1,141 @@
+"""
+Scoring hors ligne du Quiz AI Act sur des fichiers de soumissions.
+
+Usage :
+    python -m analyseur.score soumissions.jsonl -o scores.jsonl
+    python -m analyseur.score soumissions.csv --output-format csv
+    cat soumissions.jsonl | python -m analyseur.score -
+
+Chaque enregistrement contient les réponses q1..q10, soit en libellés (comme
+dans le quiz), soit en indices d'option (0, 1, ...). Les fichiers sont lus et
+écrits en flux : la mémoire reste constante quelle que soit la taille.
+N'importe ni streamlit ni reportlab.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from analyseur.scoring import OPTIONS, QUESTION_KEYS, calculate_score, get_category
+
+
+def read_records(stream, fmt):
+    """
+    Itère sur les enregistrements bruts d'un flux : dicts pour CSV, lignes non vides pour JSONL.
+    Le décodage JSON est fait par parse_record pour qu'une ligne invalide n'arrête pas le flux.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def parse_record(raw):
+    """Décode un enregistrement brut renvoyé par read_records."""
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    if not isinstance(raw, dict):
+        raise TypeError(f"objet JSON attendu, reçu {type(raw).__name__}")
+    return raw
+
+
+class InvalidAnswer(ValueError):
+    """Réponse hors des options de la question : ni libellé connu, ni indice 0..n-1."""
+
+
+def to_responses(record):
+    """
+    Extrait les réponses q1..q10 d'un enregistrement ; accepte libellés ou indices d'option.
+    Lève InvalidAnswer pour un booléen, un indice hors bornes ou un libellé inconnu.
+    """
+    responses = {}
+    for key in QUESTION_KEYS:
+        value = record[key]
+        options = OPTIONS[key]
+        # bool est une sous-classe d'int : True ne doit pas valoir l'option 1
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise InvalidAnswer(f"{key} : libellé ou indice d'option attendu, reçu {type(value).__name__}")
+        if isinstance(value, int) or value.isdigit():
+            index = int(value)
+            if not 0 <= index < len(options):
+                raise InvalidAnswer(f"{key} : indice {index} hors de 0..{len(options) - 1}")
+            value = options[index]
+        elif value not in options:
+            raise InvalidAnswer(f"{key} : réponse inconnue {value!r}")
+        responses[key] = value
+    return responses
+
+
+def score_record(record, id_field="id"):
+    """Retourne le résultat d'un enregistrement : id (si présent), score et catégorie."""
+    result = {}
+    if id_field in record:
+        result[id_field] = record[id_field]
+    score = calculate_score(to_responses(record))
+    result["score"] = score
+    result["category"] = get_category(score)
+    return result
+
+
+def _detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m analyseur.score",
+        description="Calcule score et catégorie AI Act pour un fichier de soumissions JSONL ou CSV.",
+    )
+    parser.add_argument("input", help="fichier de soumissions (.jsonl ou .csv), '-' pour stdin")
+    parser.add_argument("-o", "--output", default="-", help="fichier de résultats, '-' pour stdout (défaut)")
+    parser.add_argument("--input-format", choices=["jsonl", "csv"], help="défaut : d'après l'extension, sinon jsonl")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], help="défaut : d'après l'extension, sinon jsonl")
+    parser.add_argument("--id-field", default="id", help="champ recopié tel quel dans les résultats (défaut : id)")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or _detect_format(args.input)
+    output_format = args.output_format or _detect_format(args.output)
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    scored = errors = 0
+    try:
+        if output_format == "csv":
+            writer = csv.DictWriter(target, fieldnames=[args.id_field, "score", "category", "error"])
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            def write(row):
+                target.write(json.dumps(row, ensure_ascii=False))
+                target.write("\n")
+
+        for record_number, raw in enumerate(read_records(source, input_format), start=1):
+            record = None
+            try:
+                record = parse_record(raw)
+                result = score_record(record, args.id_field)
+                scored += 1
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                result = {"record": record_number, "error": f"{type(e).__name__}: {e}"}
+                if isinstance(record, dict) and args.id_field in record:
+                    result[args.id_field] = record[args.id_field]
+                errors += 1
+            if output_format == "csv":
+                result.pop("record", None)
+            write(result)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"{scored} soumission(s) scorée(s), {errors} erreur(s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
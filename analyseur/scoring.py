@@ -0,0 +1,254 @@
+"""
+Moteur de scoring du Quiz AI Act.
+
+Les questions et leurs barèmes sont définis une seule fois dans QUESTIONS,
+puis compilés au chargement du module en tables indexées par entier :
+- calculate_score() pour un jeu de réponses (dict de libellés)
+- score_batch() pour N jeux de réponses encodés en indices (vectorisé numpy)
+"""
+
+from bisect import bisect_right
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Question(NamedTuple):
+    key: str
+    label: str
+    options: tuple  # ((libellé de réponse, points), ...)
+    help: str
+
+
+# ============================================
+# LES 10 QUESTIONS ET LEUR BARÈME
+# ============================================
+
+QUESTIONS = (
+    # Q1: Usage IA (10 points - contexte basique)
+    Question(
+        "q1",
+        "**1. Utilisez-vous des systèmes d'IA dans vos opérations ?**",
+        (
+            ("Oui, plusieurs systèmes", 10),
+            ("Oui, quelques-uns", 7),
+            ("En projet/développement", 3),
+            ("Non, aucun", 10),  # Pas d'IA = pas de risque de non-conformité
+        ),
+        "Exemples : chatbots, recommandations, analyse prédictive, génération de contenu, vision par ordinateur, etc.",
+    ),
+    # Q2: Pratiques interdites - CRITIQUE (pondération 2x = 20 points)
+    # Article 5 de l'AI Act
+    Question(
+        "q2",
+        "**2. Utilisez-vous l'IA pour des pratiques potentiellement interdites par l'Article 5 de l'AI Act ?**",
+        (
+            ("Oui, pour manipulation des comportements", 0),  # Score zéro = violation critique
+            ("Oui, pour surveillance émotionnelle au travail/école", 0),
+            ("Oui, pour notation sociale (scoring social)", 0),
+            ("Non, aucune de ces pratiques", 20),
+            ("Pas sûr", 5),  # Très risqué de ne pas savoir
+        ),
+        "⚠️ CRITIQUE : Ces pratiques sont INTERDITES par l'Article 5. Amendes jusqu'à 35M€ ou 7% CA mondial.",
+    ),
+    # Q3: Systèmes haut risque - CRITIQUE (pondération 2x = 20 points)
+    # Annexe III de l'AI Act
+    Question(
+        "q3",
+        "**3. Vos systèmes IA relèvent-ils d'une catégorie à haut risque selon l'Annexe III de l'AI Act ?**",
+        (
+            ("Oui, au moins un système haut risque (recrutement, crédit, biométrie, éducation, santé)", 5),  # Obligations lourdes
+            ("Peut-être (décisions automatisées affectant des personnes)", 10),
+            ("Non, seulement faible risque", 20),
+            ("Pas sûr", 3),  # Très risqué
+        ),
+        "Annexe III : Biométrie, recrutement/RH, crédit/assurance, éducation, santé, infrastructures critiques, justice. Ces systèmes ont obligations lourdes.",
+    ),
+    # Q4: Biométrie - HAUT RISQUE (pondération 1.5x = 15 points)
+    Question(
+        "q4",
+        "**4. Collectez-vous ou traitez-vous des données biométriques ?**",
+        (
+            ("Oui, identification en temps réel (visage, voix dans espaces publics)", 2),  # Possiblement interdit
+            ("Oui, mais anonymisées ou vérification uniquement", 8),
+            ("Non", 15),
+            ("Pas sûr", 4),
+        ),
+        "Identification biométrique en temps réel dans espaces publics = potentiellement INTERDITE (Article 5). Autres usages biométriques = haut risque (Annexe III).",
+    ),
+    # Q5: Opérations UE (10 points - contexte)
+    Question(
+        "q5",
+        "**5. Opérez-vous dans l'UE ou vendez-vous à des clients européens ?**",
+        (
+            ("Oui, principalement UE", 10),  # Compliance nécessaire mais reconnu
+            ("Oui, quelques clients UE", 5),
+            ("Non, hors UE uniquement", 10),  # AI Act ne s'applique pas
+            ("Pas sûr", 3),
+        ),
+        "L'AI Act s'applique si vos systèmes IA sont utilisés dans l'UE ou affectent des personnes en UE (Article 2).",
+    ),
+    # Q6: Documentation (pondération 1.5x = 15 points)
+    # Article 11
+    Question(
+        "q6",
+        "**6. Avez-vous documenté vos systèmes IA (design, données, algorithmes, tests) ?**",
+        (
+            ("Oui, documentation complète et à jour", 15),
+            ("Partiellement documenté", 7),
+            ("Non, pas documenté", 0),
+            ("Aucun système IA", 15),
+        ),
+        "Documentation technique OBLIGATOIRE pour systèmes haut risque (Article 11, Annexe IV). Doit être tenue à jour sur tout le cycle de vie.",
+    ),
+    # Q7: Gestion risques + surveillance post-marché (pondération 1.5x = 15 points)
+    # Articles 9 et 72
+    Question(
+        "q7",
+        "**7. Effectuez-vous des évaluations de risques IA avec surveillance post-marché continue ?**",
+        (
+            ("Oui, processus continu avec surveillance post-marché", 15),
+            ("Ponctuellement", 6),
+            ("Non, jamais fait", 0),
+            ("Aucun système IA", 15),
+        ),
+        "Gestion des risques = processus ITÉRATIF CONTINU sur tout le cycle de vie (Article 9). Surveillance post-marché obligatoire (Article 72).",
+    ),
+    # Q8: Transparence + deepfakes (10 points)
+    # Article 50
+    Question(
+        "q8",
+        "**8. Vos systèmes IA respectent-ils les obligations de transparence ?**",
+        (
+            ("Oui, utilisateurs informés et contenus IA marqués (deepfakes/textes)", 10),
+            ("Partiellement transparent", 5),
+            ("Non, pas mentionné", 0),
+            ("Aucun système IA", 10),
+        ),
+        "Obligation d'informer utilisateurs qu'ils interagissent avec IA (Article 50). Contenus générés par IA (deepfakes, textes) doivent être marqués.",
+    ),
+    # Q9: Gouvernance et contrôle humain (10 points)
+    # Articles 14 et 17
+    Question(
+        "q9",
+        "**9. Avez-vous un système de gouvernance IA avec contrôle humain effectif ?**",
+        (
+            ("Oui, gouvernance structurée avec contrôle humain", 10),
+            ("Partiellement (contrôle humain existe)", 6),
+            ("Non, rien de formel", 0),
+            ("Aucun système IA", 10),
+        ),
+        "Contrôle humain OBLIGATOIRE pour systèmes haut risque (Article 14). Système de gestion qualité requis (Article 17). Pas besoin d'un 'responsable IA' dédié.",
+    ),
+    # Q10: Formation (10 points)
+    # Article 14
+    Question(
+        "q10",
+        "**10. Formez-vous vos employés sur l'utilisation des systèmes IA ?**",
+        (
+            ("Oui, formation des opérateurs de systèmes IA", 10),
+            ("Formation ponctuelle passée", 5),
+            ("Non, pas de formation", 0),
+            ("Aucun système IA", 10),
+        ),
+        "Formation OBLIGATOIRE pour opérateurs de systèmes haut risque (Article 14) : comprendre capacités/limites, surveiller, prévenir biais automatisation.",
+    ),
+)
+
+MAX_SCORE = 100
+
+# Seuils de catégorie : score < 40 critique, < 60 faible, < 80 moyen, sinon excellent
+CATEGORY_THRESHOLDS = (40, 60, 80)
+_CATEGORIES = ("critique", "faible", "moyen", "excellent")
+
+# Indice réservé aux réponses inconnues : dernière colonne de la matrice, toujours à 0 point.
+UNKNOWN = -1
+
+
+# ============================================
+# COMPILATION DES TABLES
+# ============================================
+
+QUESTION_KEYS = tuple(q.key for q in QUESTIONS)
+
+# Libellés des options par question (pour st.radio et le décodage)
+OPTIONS = {q.key: tuple(answer for answer, _ in q.options) for q in QUESTIONS}
+
+# libellé de réponse -> indice, par question
+_ANSWER_INDEX = tuple({answer: i for i, (answer, _) in enumerate(q.options)} for q in QUESTIONS)
+
+
+def build_points_matrix(questions=QUESTIONS):
+    """Compile les barèmes en matrice (questions, options + 1) en lecture seule."""
+    matrix = np.zeros((len(questions), max(len(q.options) for q in questions) + 1), dtype=np.int32)
+    for row, q in enumerate(questions):
+        matrix[row, :len(q.options)] = [points for _, points in q.options]
+    matrix.setflags(write=False)
+    return matrix
+
+
+POINTS_MATRIX = build_points_matrix()
+
+_ROW_INDEX = np.arange(len(QUESTIONS))
+
+# Nombre d'options par question : indices valides 0..n-1, ou UNKNOWN
+_OPTION_COUNTS = np.array([len(q.options) for q in QUESTIONS], dtype=np.intp)
+
+# Lookup direct libellé -> points, pour le chemin unitaire (sans passer par numpy)
+_ANSWER_POINTS = tuple(dict(q.options) for q in QUESTIONS)
+_SCORED_QUESTIONS = tuple(zip(QUESTION_KEYS, _ANSWER_POINTS))
+
+
+# ============================================
+# API
+# ============================================
+
+def calculate_score(responses):
+    """
+    Calcule le score de conformité AI Act basé sur les réponses.
+    Version v1.0 améliorée après lecture complète de l'AI Act.
+    Retourne un score sur 100.
+    """
+    score = 0
+    for key, points in _SCORED_QUESTIONS:
+        score += points.get(responses[key], 0)
+    return min(MAX_SCORE, score)
+
+
+def get_category(score):
+    """Retourne la catégorie selon le score"""
+    return _CATEGORIES[bisect_right(CATEGORY_THRESHOLDS, score)]
+
+
+def encode_responses(responses):
+    """Convertit un dict de réponses (libellés) en tuple d'indices, UNKNOWN si libellé inconnu."""
+    return tuple(index.get(responses.get(key), UNKNOWN) for key, index in zip(QUESTION_KEYS, _ANSWER_INDEX))
+
+
+def encode_batch(responses_list):
+    """Encode une séquence de dicts de réponses en matrice (N, 10) d'indices."""
+    encoded = np.array([encode_responses(r) for r in responses_list], dtype=np.intp)
+    return encoded.reshape(-1, len(QUESTIONS))
+
+
+def score_batch(indices, points=POINTS_MATRIX):
+    """
+    Calcule N scores en une passe vectorisée.
+    indices : tableau (N, 10) d'indices entiers de réponses (UNKNOWN = 0 point).
+    points : matrice de barème (voir build_points_matrix) pour rescorer avec d'autres pondérations.
+    Retourne un tableau (N,) de scores plafonnés à 100.
+    Lève ValueError pour un tableau non entier ou un indice hors de 0..n-1 autre que UNKNOWN :
+    l'indexation numpy accepterait sinon les indices négatifs et la colonne de bourrage.
+    """
+    indices = np.asarray(indices)
+    if indices.ndim != 2 or indices.shape[1] != len(QUESTIONS):
+        raise ValueError(f"indices doit être de forme (N, {len(QUESTIONS)}), reçu {indices.shape}")
+    if indices.size and indices.dtype.kind not in "iu":
+        raise ValueError(f"indices entiers attendus, reçu le type {indices.dtype}")
+    indices = indices.astype(np.intp, copy=False)
+    invalid = ((indices < 0) | (indices >= _OPTION_COUNTS)) & (indices != UNKNOWN)
+    if invalid.any():
+        row, column = (int(i) for i in np.argwhere(invalid)[0])
+        raise ValueError(f"ligne {row}, {QUESTION_KEYS[column]} : indice {indices[row, column]} "
+                         f"hors de 0..{_OPTION_COUNTS[column] - 1}")
+    return np.minimum(points[_ROW_INDEX, indices].sum(axis=1), MAX_SCORE)
@@ -0,0 +1,207 @@
+"""
+Stockage partagé des soumissions et des rapports PDF.
+
+Avec plusieurs répliques derrière un équilibreur de charge, une même session
+peut être servie par un autre processus après une reconnexion. Rien de ce
+que produit une soumission ne doit donc rester dans la mémoire d'un seul
+processus. Chaque soumission est enregistrée sous sa clé (report_key des
+réponses), ainsi que son PDF, dans un stockage que toutes les répliques lisent.
+
+Backends (STORAGE_URL) :
+- sqlite:///chemin/storage.sqlite3  (défaut : sqlite:///storage.sqlite3)
+- file:///chemin/dossier            un fichier par objet, écritures atomiques
+
+Les deux conviennent à plusieurs processus sur une même machine ou un volume
+partagé. Un autre backend n'a qu'à fournir les méthodes put_submission,
+get_submission, put_report, get_report et purge.
+
+Rétention : une soumission contient l'email et l'entreprise du répondant.
+Soumissions et PDF sont supprimés STORAGE_RETENTION secondes après leur
+écriture (défaut 30 jours) : purge opportuniste lors d'un put_submission, au
+plus une fois par heure et par processus ; une entrée expirée mais pas encore
+purgée n'est plus lue.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+_KEY = re.compile(r"^[0-9a-f]{16,128}$")
+
+DEFAULT_RETENTION = 30 * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    key TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def _check_key(key):
+    # Les clés viennent aussi de l'URL (?resultat=...) : hexadécimal uniquement
+    if not isinstance(key, str) or not _KEY.match(key):
+        raise ValueError(f"clé de stockage invalide : {key!r}")
+    return key
+
+
+class _Retention:
+    """Purge opportuniste : au plus une par purge_interval et par processus (DELETE idempotent entre répliques)."""
+
+    def __init__(self, retention, purge_interval):
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    def _cutoff(self, now=None):
+        return (time.time() if now is None else now) - self.retention
+
+    def _purge_due(self):
+        now = time.time()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.purge_interval
+        self.purge(now)
+
+
+class SQLiteStore(_Retention):
+    def __init__(self, path, retention=DEFAULT_RETENTION, purge_interval=3600.0):
+        super().__init__(retention, purge_interval)
+        self.path = path
+        with self._transaction() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextmanager
+    def _transaction(self):
+        db = self._connect()
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def put_submission(self, key, record):
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO submissions (key, record, created_at) VALUES (?, ?, ?)",
+                       (_check_key(key), json.dumps(record), time.time()))
+        self._purge_due()
+
+    def get_submission(self, key):
+        """Retourne l'enregistrement (dict) ou None."""
+        with self._transaction() as db:
+            row = db.execute("SELECT record FROM submissions WHERE key = ? AND created_at >= ?",
+                             (_check_key(key), self._cutoff())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_report(self, key, data):
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO reports (key, data, created_at) VALUES (?, ?, ?)",
+                       (_check_key(key), data, time.time()))
+
+    def get_report(self, key):
+        """Retourne les bytes du PDF ou None."""
+        with self._transaction() as db:
+            row = db.execute("SELECT data FROM reports WHERE key = ? AND created_at >= ?",
+                             (_check_key(key), self._cutoff())).fetchone()
+        return bytes(row[0]) if row else None
+
+    def purge(self, now=None):
+        """Supprime soumissions et PDF plus vieux que `retention` secondes ; retourne le nombre d'entrées."""
+        cutoff = self._cutoff(now)
+        with self._transaction() as db:
+            return sum(db.execute(f"DELETE FROM {table} WHERE created_at < ?", (cutoff,)).rowcount
+                       for table in ("submissions", "reports"))
+
+
+class FilesystemStore(_Retention):
+    def __init__(self, directory, retention=DEFAULT_RETENTION, purge_interval=3600.0):
+        super().__init__(retention, purge_interval)
+        self.directory = directory
+        for kind in ("submissions", "reports"):
+            os.makedirs(os.path.join(directory, kind), exist_ok=True)
+
+    def _path(self, kind, key, suffix):
+        return os.path.join(self.directory, kind, _check_key(key) + suffix)
+
+    def _write(self, path, data):
+        # Écriture atomique : une autre réplique ne lit jamais un fichier partiel
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_mtime < self._cutoff():
+                    return None  # expiré, pas encore purgé
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put_submission(self, key, record):
+        self._write(self._path("submissions", key, ".json"), json.dumps(record).encode("utf-8"))
+        self._purge_due()
+
+    def get_submission(self, key):
+        """Retourne l'enregistrement (dict) ou None."""
+        data = self._read(self._path("submissions", key, ".json"))
+        return json.loads(data) if data is not None else None
+
+    def put_report(self, key, data):
+        self._write(self._path("reports", key, ".pdf"), data)
+
+    def get_report(self, key):
+        """Retourne les bytes du PDF ou None."""
+        return self._read(self._path("reports", key, ".pdf"))
+
+    def purge(self, now=None):
+        """Supprime les fichiers (et temporaires orphelins) plus vieux que `retention` secondes."""
+        cutoff = self._cutoff(now)
+        purged = 0
+        for kind in ("submissions", "reports"):
+            with os.scandir(os.path.join(self.directory, kind)) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file() and entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                            purged += 1
+                    except FileNotFoundError:
+                        pass  # purgé par une autre réplique
+        return purged
+
+
+def open_store(url, retention=DEFAULT_RETENTION):
+    """Ouvre un stockage d'après son URL : sqlite:///chemin, file:///dossier ou chemin de dossier."""
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):], retention=retention)
+    if url.startswith("file:///"):
+        return FilesystemStore(url[len("file://"):], retention=retention)
+    if "://" in url:
+        raise ValueError(f"STORAGE_URL non supportée : {url}")
+    return FilesystemStore(url, retention=retention)
+
+
+def store_from_env():
+    """Stockage configuré par STORAGE_URL (défaut : sqlite:///storage.sqlite3) et STORAGE_RETENTION (secondes)."""
+    return open_store(os.getenv("STORAGE_URL", "sqlite:///storage.sqlite3"),
+                      retention=float(os.getenv("STORAGE_RETENTION", str(DEFAULT_RETENTION))))
@@ -0,0 +1,26 @@
+"""
+Styles reportlab partagés par tous les rapports PDF.
+
+getSampleStyleSheet() reconstruit une vingtaine de ParagraphStyle à chaque
+appel : la feuille de styles est construite une seule fois par processus,
+puis partagée entre toutes les sessions. Les styles sont en lecture seule :
+pour une variante, créer un nouveau ParagraphStyle(parent=...) plutôt que
+modifier un style partagé.
+"""
+
+import threading
+
+from reportlab.lib.styles import getSampleStyleSheet
+
+_stylesheet = None
+_lock = threading.Lock()
+
+
+def get_stylesheet():
+    """Feuille de styles reportlab standard, partagée."""
+    global _stylesheet
+    if _stylesheet is None:
+        with _lock:
+            if _stylesheet is None:
+                _stylesheet = getSampleStyleSheet()
+    return _stylesheet
@@ -0,0 +1,301 @@
+"""
+Index de signatures des traceurs et services tiers (analytics, publicité,
+réseaux sociaux, chat, IA, consentement), appliqué aux pages explorées.
+
+    inventory = scan_site(site)
+    inventory.requiring_consent()   # traceurs chargés avant tout consentement
+    inventory.ai_vendors()          # inventaire des fournisseurs IA
+
+Sources, telles que relevées par analyseur.crawler : src des scripts et des
+iframes, scripts inline, en-têtes Set-Cookie. L'index est compilé une fois :
+- domaines : trie sur les labels inversés (com -> hotjar -> static), le
+  sous-domaine le plus précis l'emporte, coût proportionnel au nombre de labels
+- scripts inline : une expression tokenise le texte (en C), les jetons
+  uniques sont confrontés au trie (domaines) et à l'ensemble des
+  identifiants de snippets (fbq, _paq...) ; coût linéaire dans la taille du
+  script, indépendant du nombre de signatures
+- cookies : nom exact ou préfixe (_ga_*, _hj*...). Le crawler ne voit que les
+  Set-Cookie du site analysé : seuls les cookies que les scripts des
+  fournisseurs déposent sur le domaine du site sont listés, avec des noms
+  distinctifs. Les cookies posés sur le domaine du fournisseur (fr, datr,
+  IDE, bcookie...) n'y apparaissent jamais, et un nom court ou un préfixe
+  large ferait passer un cookie du site (fr pour la langue) pour un traceur.
+
+Un script neutralisé en attente de consentement (type="text/plain", pratique
+des plateformes de consentement) est relevé mais pas compté comme chargé.
+"""
+
+import re
+from typing import NamedTuple, Tuple
+
+ANALYTICS = "analytics"
+PUBLICITE = "publicite"
+SOCIAL = "reseaux sociaux"
+CHAT = "chat"
+IA = "ia"
+VIDEO = "video"
+CONSENTEMENT = "consentement"
+
+
+class Signature(NamedTuple):
+    vendor: str
+    category: str
+    domains: Tuple[str, ...] = ()
+    identifiers: Tuple[str, ...] = ()  # globales distinctives des snippets inline, en minuscules
+    cookies: Tuple[str, ...] = ()  # noms exacts, ou préfixes terminés par *
+    ai_usage: str = ""  # usage IA du service, vide sinon
+    exempt: bool = False  # mesure d'audience exemptée de consentement (CNIL)
+
+
+SIGNATURES = (
+    # Mesure d'audience
+    Signature("Google Analytics / Tag Manager", ANALYTICS, ("google-analytics.com", "googletagmanager.com", "analytics.google.com"),
+              ("gtag",), ("_ga", "_ga_*", "_gid", "_gat", "_gat_*")),
+    Signature("Hotjar", ANALYTICS, ("hotjar.com", "hotjar.io"), ("_hjsettings",), ("_hj*",)),
+    Signature("Microsoft Clarity", ANALYTICS, ("clarity.ms",), (), ("_clck", "_clsk")),
+    Signature("Matomo", ANALYTICS, ("matomo.cloud",), ("_paq",), ("_pk_*",)),
+    Signature("Plausible", ANALYTICS, ("plausible.io",), (), (), exempt=True),
+    Signature("Mixpanel", ANALYTICS, ("mxpnl.com", "mixpanel.com"), (), ()),
+    Signature("Amplitude", ANALYTICS, ("amplitude.com",), (), ()),
+    Signature("Heap", ANALYTICS, ("heap.io", "heapanalytics.com"), (), ("_hp2_*",)),
+    Signature("FullStory", ANALYTICS, ("fullstory.com",), ("_fs_namespace",), ("fs_uid",)),
+    Signature("Segment", ANALYTICS, ("segment.com", "segment.io"), (), ("ajs_anonymous_id", "ajs_user_id")),
+    Signature("HubSpot", ANALYTICS, ("hs-scripts.com", "hs-analytics.net", "hsforms.net", "hubspot.com", "hs-banner.com"),
+              ("_hsq",), ("__hstc", "__hssc", "__hssrc", "hubspotutk")),
+    # Publicité
+    Signature("Google Ads / DoubleClick", PUBLICITE, ("doubleclick.net", "googleadservices.com", "googlesyndication.com",
+                                                      "adservice.google.com"), (), ("_gcl_au", "_gcl_*")),
+    Signature("Meta Pixel", PUBLICITE, ("connect.facebook.net",), ("fbq",), ("_fbp", "_fbc")),
+    Signature("LinkedIn Insight", PUBLICITE, ("snap.licdn.com", "px.ads.linkedin.com"), ("_linkedin_partner_id",),
+              ()),
+    Signature("TikTok Pixel", PUBLICITE, ("analytics.tiktok.com",), (), ("_ttp", "_tt_enable_cookie")),
+    Signature("X (Twitter) Ads", PUBLICITE, ("static.ads-twitter.com", "ads-twitter.com"), ("twq",), ()),
+    Signature("Pinterest Tag", PUBLICITE, ("ct.pinterest.com", "s.pinimg.com"), ("pintrk",), ("_pin_unauth",)),
+    Signature("Snap Pixel", PUBLICITE, ("sc-static.net",), ("snaptr",), ("_scid", "_sctr")),
+    Signature("Microsoft Advertising", PUBLICITE, ("bat.bing.com",), ("uetq",), ("_uetsid", "_uetvid")),
+    Signature("Criteo", PUBLICITE, ("criteo.net", "criteo.com"), ("criteo_q",), ("cto_bundle",)),
+    Signature("Taboola", PUBLICITE, ("taboola.com",), ("_tfa",), ()),
+    Signature("Outbrain", PUBLICITE, ("outbrain.com",), ("obapi",), ()),
+    # Réseaux sociaux et vidéo
+    Signature("Facebook (widgets)", SOCIAL, ("facebook.com", "facebook.net"), (), ()),
+    Signature("X (Twitter) widgets", SOCIAL, ("platform.twitter.com",), ("twttr",), ()),
+    Signature("YouTube", VIDEO, ("youtube.com", "ytimg.com"), (), ()),
+    Signature("Vimeo", VIDEO, ("vimeo.com", "vimeocdn.com"), (), ()),
+    # Chat et support (assistants IA proposés par l'éditeur)
+    Signature("Intercom", CHAT, ("intercom.io", "intercomcdn.com"), ("intercomsettings",), ("intercom-*",),
+              ai_usage="chatbot de support (agent IA Fin)"),
+    Signature("Zendesk", CHAT, ("zdassets.com", "zendesk.com"), ("zesettings",), ("__zlcmid",),
+              ai_usage="chatbot de support (agents IA Zendesk)"),
+    Signature("Drift", CHAT, ("driftt.com", "drift.com"), (), ("driftt_aid", "drift_aid"),
+              ai_usage="chatbot conversationnel IA"),
+    Signature("Tidio", CHAT, ("tidio.co", "tidiochat.com"), ("tidiochatapi",), ("tidio_*",),
+              ai_usage="chatbot IA (Lyro)"),
+    Signature("Crisp", CHAT, ("crisp.chat",), ("$crisp",), ("crisp-client*",), ai_usage="chatbot (réponses IA)"),
+    Signature("LiveChat", CHAT, ("livechatinc.com",), ("livechatwidget",), ()),
+    Signature("tawk.to", CHAT, ("tawk.to",), ("tawk_api",), ()),
+    # Fournisseurs d'IA
+    Signature("OpenAI", IA, ("openai.com", "oaiusercontent.com"), (), (), ai_usage="API OpenAI (GPT) appelée depuis le navigateur"),
+    Signature("Azure OpenAI", IA, ("openai.azure.com",), (), (), ai_usage="API Azure OpenAI appelée depuis le navigateur"),
+    Signature("Anthropic", IA, ("anthropic.com",), (), (), ai_usage="API Anthropic (Claude)"),
+    Signature("Mistral AI", IA, ("mistral.ai",), (), (), ai_usage="API Mistral"),
+    Signature("Google Gemini / Vertex AI", IA, ("generativelanguage.googleapis.com", "aiplatform.googleapis.com"), (), (),
+              ai_usage="API Gemini / Vertex AI"),
+    Signature("Dialogflow", IA, ("dialogflow.com", "dialogflow.cloud.google.com"), (), (), ai_usage="chatbot Dialogflow"),
+    Signature("IBM watsonx Assistant", IA, ("watsonplatform.net", "assistant.watson.cloud.ibm.com"),
+              ("watsonassistantchatoptions",), (), ai_usage="chatbot watsonx Assistant"),
+    Signature("Microsoft Bot Framework", IA, ("botframework.com",), (), (), ai_usage="chatbot Bot Framework / Copilot Studio"),
+    Signature("Botpress", IA, ("botpress.cloud",), ("botpresswebchat",), (), ai_usage="chatbot LLM Botpress"),
+    Signature("Voiceflow", IA, ("voiceflow.com",), (), (), ai_usage="agent conversationnel Voiceflow"),
+    Signature("Chatbase", IA, ("chatbase.co",), (), (), ai_usage="chatbot GPT entraîné sur le site"),
+    Signature("Landbot", IA, ("landbot.io",), (), (), ai_usage="chatbot Landbot"),
+    Signature("ElevenLabs", IA, ("elevenlabs.io",), (), (), ai_usage="agent vocal IA"),
+    Signature("Algolia", IA, ("algolia.net", "algolianet.com", "algolia.io"), ("algoliasearch",), ("_algolia",),
+              ai_usage="recherche et recommandations IA"),
+    Signature("Dynamic Yield", IA, ("dynamicyield.com",), (), ("_dyid", "_dyjsession"), ai_usage="personnalisation par IA"),
+    Signature("Nosto", IA, ("nosto.com",), (), ("2c.cid",), ai_usage="recommandations produits par IA"),
+    # Plateformes de consentement (CMP)
+    Signature("tarteaucitron", CONSENTEMENT, ("tarteaucitron.io",), ("tarteaucitron",), ("tarteaucitron",)),
+    Signature("Axeptio", CONSENTEMENT, ("axept.io", "axeptio.eu"), ("axeptiosettings",), ("axeptio_*",)),
+    Signature("Didomi", CONSENTEMENT, ("didomi.io", "privacy-center.org"), ("didomiconfig",), ("didomi_token",)),
+    Signature("OneTrust", CONSENTEMENT, ("cookielaw.org", "onetrust.com"), ("optanonwrapper",), ("optanonconsent",)),
+    Signature("Cookiebot", CONSENTEMENT, ("cookiebot.com",), (), ("cookieconsent",)),
+    Signature("Usercentrics", CONSENTEMENT, ("usercentrics.eu",), (), ()),
+    Signature("Sirdata", CONSENTEMENT, ("sddan.com", "sirdata.com"), (), ()),
+    Signature("Iubenda", CONSENTEMENT, ("iubenda.com",), (), ("_iub_cs-*",)),
+    Signature("CookieYes", CONSENTEMENT, ("cookieyes.com",), (), ("cookieyes-consent",)),
+    Signature("Quantcast Choice", CONSENTEMENT, ("quantcast.mgr.consensu.org", "quantcast.com"), (), ()),
+)
+
+_TOKEN = re.compile(r"[a-z0-9_$][a-z0-9_$.-]*")
+
+# Types de scripts inline analysés : code (ou code neutralisé) ; JSON-LD et
+# templates contiennent du texte éditorial, source de faux positifs
+_EXECUTABLE = {"", "text/javascript", "application/javascript", "module", "text/plain"}
+
+
+class _Index:
+    """Trie des domaines (labels inversés), identifiants et cookies de SIGNATURES."""
+
+    def __init__(self, signatures):
+        self.domains = {}
+        self.identifiers = {}
+        self.cookies = {}
+        self.cookie_prefixes = {}
+        for signature in signatures:
+            for domain in signature.domains:
+                node = self.domains
+                for label in reversed(domain.split(".")):
+                    node = node.setdefault(label, {})
+                node[None] = signature
+            for identifier in signature.identifiers:
+                self.identifiers[identifier] = signature
+            for cookie in signature.cookies:
+                if cookie.endswith("*"):
+                    self.cookie_prefixes[cookie[:-1]] = signature
+                else:
+                    self.cookies[cookie] = signature
+        self.prefixes = tuple(sorted(self.cookie_prefixes, key=len, reverse=True))
+        self.identifier_set = frozenset(self.identifiers)
+
+    def host(self, host):
+        """Signature du domaine (ou d'un domaine parent) ; la plus précise gagne."""
+        node, found = self.domains, None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    def text(self, text):
+        """[(signature, jeton)] trouvés dans un script inline."""
+        tokens = set(_TOKEN.findall(text.lower()))
+        found = [(self.identifiers[token], token) for token in tokens & self.identifier_set]
+        for token in tokens:
+            if "." in token:
+                signature = self.host(token.strip(".-"))
+                if signature is None:
+                    # `window.fbq`, `w._hjSettings` : identifiant après un accès de propriété
+                    signature = next((self.identifiers[label] for label in token.split(".")[1:]
+                                      if label in self.identifiers), None)
+                if signature is not None:
+                    found.append((signature, token))
+        return found
+
+    def cookie(self, name):
+        name = name.lower()
+        if name in self.cookies:
+            return self.cookies[name]
+        if name.startswith(self.prefixes):
+            return next(self.cookie_prefixes[p] for p in self.prefixes if name.startswith(p))
+        return None
+
+
+INDEX = _Index(SIGNATURES)
+
+
+_HOST = re.compile(r"[a-z][a-z0-9+.-]*://(?:[^@/?#]*@)?([^:/?#]+)", re.I)
+
+
+def _host(url):
+    """Hôte d'une URL absolue (une expression plutôt qu'urlsplit : appelé pour chaque script)."""
+    match = _HOST.match(url)
+    return match.group(1).lower() if match else ""
+
+
+class Detection(NamedTuple):
+    signature: Signature
+    source: str  # script, inline, iframe, cookie
+    page: str
+    evidence: str
+    blocked: bool  # script neutralisé (type="text/plain") en attente de consentement
+
+
+class TrackerInventory(NamedTuple):
+    detections: Tuple[Detection, ...]
+
+    def by_vendor(self):
+        """{fournisseur: [détections]}, dans l'ordre de première apparition."""
+        vendors = {}
+        for detection in self.detections:
+            vendors.setdefault(detection.signature.vendor, []).append(detection)
+        return vendors
+
+    def loaded(self):
+        """Détections actives dès le chargement (hors scripts neutralisés)."""
+        return [d for d in self.detections if not d.blocked]
+
+    def requiring_consent(self):
+        """Fournisseurs chargés sans consentement préalable qui en exigent un : {fournisseur: [détections]}."""
+        vendors = {}
+        for detection in self.loaded():
+            if detection.signature.category != CONSENTEMENT and not detection.signature.exempt:
+                vendors.setdefault(detection.signature.vendor, []).append(detection)
+        return vendors
+
+    def consent_platforms(self):
+        return {vendor: found for vendor, found in self.by_vendor().items()
+                if found[0].signature.category == CONSENTEMENT}
+
+    def ai_vendors(self):
+        return {vendor: found for vendor, found in self.by_vendor().items() if found[0].signature.ai_usage}
+
+    def summary(self):
+        """Traceurs et services tiers, par catégorie, pour les prompts."""
+        if not self.detections:
+            return "Aucun traceur ni service tiers connu detecte."
+        lines = []
+        for vendor, found in self.by_vendor().items():
+            sources = ", ".join(sorted({d.source for d in found}))
+            state = " (neutralise avant consentement)" if all(d.blocked for d in found) else ""
+            lines.append(f"- {vendor} [{found[0].signature.category}] via {sources}{state}")
+        return "\n".join(lines)
+
+    def ai_summary(self):
+        """Inventaire des fournisseurs IA détectés, avec preuves."""
+        vendors = self.ai_vendors()
+        if not vendors:
+            return "Aucun fournisseur d'IA connu detecte dans les scripts, iframes et cookies."
+        lines = []
+        for vendor, found in vendors.items():
+            lines.append(f"- {vendor}: {found[0].signature.ai_usage} (preuve: {found[0].page} {found[0].source} "
+                         f"{found[0].evidence[:120]})")
+        return "\n".join(lines)
+
+
+def scan_site(site):
+    """Inventaire des traceurs et services tiers d'un SiteModel ; une détection par (fournisseur, source, page)."""
+    detections = {}
+
+    def add(signature, source, page, evidence, blocked=False):
+        key = (signature.vendor, source, page)
+        if key not in detections or (detections[key].blocked and not blocked):
+            detections[key] = Detection(signature, source, page, evidence, blocked)
+
+    # Les scripts du gabarit (en-tête, pied de page) se répètent sur chaque page : un calcul par src et par contenu
+    sources, inlines = {}, {}
+    for page in site.pages if site else ():
+        own = _host(page.url)
+        for script in page.scripts:
+            blocked = script.type.lower() == "text/plain"
+            if script.src:
+                if script.src not in sources:
+                    host = _host(script.src)
+                    sources[script.src] = INDEX.host(host) if host and host != own else None
+                if sources[script.src] is not None:
+                    add(sources[script.src], "script", page.url, script.src, blocked)
+            if script.inline and script.type.lower() in _EXECUTABLE:
+                if script.inline not in inlines:
+                    inlines[script.inline] = INDEX.text(script.inline)
+                for signature, token in inlines[script.inline]:
+                    add(signature, "inline", page.url, token, blocked)
+        for src in page.iframes:
+            host = _host(src)
+            signature = INDEX.host(host) if host and host != own else None
+            if signature is not None:
+                add(signature, "iframe", page.url, src)
+        for cookie in page.cookies:
+            signature = INDEX.cookie(cookie.name)
+            if signature is not None:
+                add(signature, "cookie", page.url, cookie.name)
+    return TrackerInventory(tuple(detections.values()))
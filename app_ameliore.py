@@ -4,10 +4,22 @@ from dotenv import load_dotenv
 import os
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet
 from io import BytesIO
+from html import escape
 import re
 
+from analyseur.attachments import build_attachment
+from analyseur.crawler import crawl
+from analyseur.digest import AI_FOCUS, PRIVACY_FOCUS, digest_site
+from analyseur.forms import analyse_forms, forms_summary
+from analyseur.llm_cache import LLMCache
+from analyseur.metrics import start_exporters_from_env
+from analyseur.pipeline import Step, run_pipeline
+from analyseur.profiling import start_run
+from analyseur.rgpd import check_site
+from analyseur.styles import get_stylesheet
+from analyseur.trackers import scan_site
+
 load_dotenv()
 
 # Configuration Azure OpenAI
@@ -23,6 +35,18 @@ llm = AzureChatOpenAI(
 import resend
 resend.api_key = os.getenv('RESEND_API_KEY')
 
+# Export des métriques de latence (METRICS_PORT, METRICS_FILE), une fois par processus
+@st.cache_resource
+def start_metrics():
+    return start_exporters_from_env()
+
+start_metrics()
+
+# Cache des réponses LLM (LLM_CACHE_DB, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES)
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache.from_env()
+
 st.set_page_config(page_title="Analyseur Conformite RGPD / AI Act", page_icon="🔒")
 
 st.title("🔒 Analyseur Conformite RGPD / AI Act")
@@ -46,81 +70,80 @@ with st.expander("📧 Recevoir aussi le rapport par email (optionnel)", expande
     )
     st.caption("🔒 Vos donnees restent privees. Pas de spam.")
 
+force_refresh = st.checkbox(
+    "🔄 Forcer une nouvelle analyse (ignorer le cache)",
+    help="Refait tous les appels IA, par exemple apres une mise a jour du site"
+)
+
 if st.button("🚀 Analyser mon site", type="primary"):
     if not url:
         st.error("Veuillez entrer une URL")
     else:
-        # Conteneur pour les résultats
-        results = {}
-        
-        # Étape 1 - Crawl
-        with st.status("Analyse en cours...", expanded=True) as status:
-            st.write("📡 Etape 1/5: Exploration du site...")
-            crawl_prompt = f"""Analyse la structure du site web {url}.
+        # Analyse conservée en session, par URL : télécharger le PDF ou toute autre
+        # interaction relance le script sans refaire les 5 appels LLM.
+        # Entre sessions, les réponses LLM identiques viennent du cache persistant.
+        analysis = st.session_state.get("analysis")
+        if analysis is None or analysis['url'] != url or force_refresh:
+            # Profilage opt-in du pipeline (PROFILE_DIR, PROFILE_SAMPLE_RATE, ?profile=<PROFILE_TOKEN>)
+            run_profile = start_run("analyse", requested=st.query_params.get("profile"))
+            try:
+                # Étape 1 : exploration HTTP réelle du site (analyseur/crawler.py), sans LLM ;
+                # le modèle du site (pages, formulaires, scripts, cookies) est conservé en session.
+                site = {}
             
-Retourne:
-- Pages principales trouvees
-- Formulaires detectes
-- Technologies utilisees
-- Points d'attention
-
-Sois concis (max 200 mots)."""
-
-            crawl_result = llm.invoke(crawl_prompt)
-            results['crawl'] = crawl_result.content
-            st.success("Exploration terminee")
+                async def explore(results, ask):
+                    site['model'] = await crawl(url)
+                    site['trackers'] = scan_site(site['model'])  # traceurs et fournisseurs IA (analyseur/trackers.py)
+                    site['forms'] = analyse_forms(site['model'])  # constats par formulaire (analyseur/forms.py)
+                    # texte des pages sans scripts ni gabarit répété, extraits bornés par étape (analyseur/digest.py)
+                    site['digest'] = digest_site(site['model'])
+                    return f"{site['model'].summary()}\n{forms_summary(site['forms'])}"
+            
+                # Étape 3 : les cinq points RGPD vérifiés sur le HTML (analyseur/rgpd.py), avec preuves ;
+                # le LLM n'est consulté que pour les points restés ambigus.
+                async def analyse_rgpd(results, ask):
+                    report = check_site(site['model'], site['trackers'], site['forms'])
+                    if report.ambiguous():
+                        context = site['digest'].excerpt("rgpd", focus=PRIVACY_FOCUS, only_focus=True).text
+                        report = report.resolve(await ask(report.prompt(url, context)))
+                    site['rgpd'] = report
+                    return report.text()
             
-            # Étape 2 - Détection IA
-            st.write("🤖 Etape 2/5: Detection usage d'IA...")
-            ia_prompt = f"""Analyse ce site et detecte s'il utilise de l'IA:
+                # Étapes LLM et dépendances (analyseur/pipeline.py) : détection IA et RGPD ne
+                # lisent que le crawl et tournent en parallèle, la durée suit le chemin critique.
+                steps = [
+                    Step("crawl", (), "📡 Etape 1/5: Exploration du site...", "Exploration terminee", None, explore),
+                    Step("ia", ("crawl",), "🤖 Etape 2/5: Detection usage d'IA...", "Detection IA terminee",
+                         lambda results: f"""Analyse ce site et detecte s'il utilise de l'IA:
 
 Site: {url}
 Structure: {results['crawl']}
 
+Fournisseurs d'IA detectes (signatures dans les scripts, iframes et cookies):
+{site['trackers'].ai_summary()}
+
+Services tiers detectes:
+{site['trackers'].summary()}
+
+Contenu des pages (extraits):
+{site['digest'].excerpt("ia", focus=AI_FOCUS).text}
+
 Cherche: chatbots, recommandations, analytics IA, generation de contenu, etc.
+Appuie-toi sur l'inventaire ci-dessus: ne cite pas d'outil absent de l'inventaire et de la structure.
 
 Retourne:
 - IA detectee: OUI ou NON
 - Si oui, quels usages
 - Niveau de risque (faible/moyen/eleve)
 
-Sois concis (max 150 mots)."""
-
-            ia_result = llm.invoke(ia_prompt)
-            results['ia'] = ia_result.content
-            st.success("Detection IA terminee")
-            
-            # Étape 3 - Analyse RGPD
-            st.write("🔐 Etape 3/5: Analyse RGPD...")
-            rgpd_prompt = f"""Analyse la conformite RGPD de ce site:
-
-Site: {url}
-Structure: {results['crawl']}
-
-Verifie:
-1. Bandeau cookies present?
-2. Politique de confidentialite?
-3. Mentions legales?
-4. Formulaires avec consentement?
-5. Droit d'acces aux donnees?
-
-Retourne:
-- Points conformes
-- Violations critiques
-- Score RGPD /100
-
-Format: liste claire."""
-
-            rgpd_result = llm.invoke(rgpd_prompt)
-            results['rgpd'] = rgpd_result.content
-            st.success("Analyse RGPD terminee")
-            
-            # Étape 4 - AI Act
-            st.write("⚖️ Etape 4/5: Verification AI Act...")
-            aiact_prompt = f"""Verifie la conformite AI Act europeen:
+Sois concis (max 150 mots)."""),
+                    Step("rgpd", ("crawl",), "🔐 Etape 3/5: Analyse RGPD...", "Analyse RGPD terminee", None, analyse_rgpd),
+                    Step("aiact", ("ia",), "⚖️ Etape 4/5: Verification AI Act...", "Verification AI Act terminee",
+                         lambda results: f"""Verifie la conformite AI Act europeen:
 
 Site: {url}
 Usage IA: {results['ia']}
+Mentions de l'IA sur le site: {site['digest'].excerpt("aiact", focus=AI_FOCUS, only_focus=True).text or "aucune"}
 
 Si IA detectee, verifie:
 - Classification du systeme IA (risque minimal/limite/eleve/inacceptable)
@@ -130,15 +153,9 @@ Si IA detectee, verifie:
 
 Si pas d'IA detectee, retourne exactement: "AI Act: Non applicable - Aucune IA detectee sur ce site."
 
-Sois concis (max 150 mots)."""
-
-            aiact_result = llm.invoke(aiact_prompt)
-            results['aiact'] = aiact_result.content
-            st.success("Verification AI Act terminee")
-            
-            # Étape 5 - Rapport final
-            st.write("📊 Etape 5/5: Generation du rapport...")
-            rapport_prompt = f"""Cree un rapport de conformite final:
+Sois concis (max 150 mots)."""),
+                    Step("rapport", ("rgpd", "aiact"), "📊 Etape 5/5: Generation du rapport...", "",
+                         lambda results: f"""Cree un rapport de conformite final:
 
 Site: {url}
 Analyse RGPD: {results['rgpd']}
@@ -150,118 +167,107 @@ Retourne:
 3. Suggestions prioritaires (3 principales max)
 
 Format clair, professionnel, concis (max 250 mots).
-IMPORTANT: Commence par "Score: XX/100" """
-
-            rapport_result = llm.invoke(rapport_prompt)
-            results['rapport'] = rapport_result.content
+IMPORTANT: Commence par "Score: XX/100" """),
+                ]
             
-            status.update(label="Analyse terminee!", state="complete", expanded=False)
-        
-        # Extraction du score
-        score_match = re.search(r'[Ss]core[:\s]+(\d+)', results['rapport'])
-        score = int(score_match.group(1)) if score_match else 75
-        
-        # Affichage des résultats
-        st.markdown("---")
-        st.header(f"📊 Resultats pour {url}")
-        
-        # Score avec couleur
-        col1, col2, col3 = st.columns(3)
-        with col2:
-            if score >= 80:
-                st.success(f"### Score: {score}/100")
-            elif score >= 60:
-                st.warning(f"### Score: {score}/100")
-            else:
-                st.error(f"### Score: {score}/100")
-        
-        # Rapport détaillé
-        with st.expander("📄 Rapport complet", expanded=True):
-            st.markdown(results['rapport'])
-        
-        with st.expander("🔍 Details de l'analyse"):
-            st.subheader("Exploration du site")
-            st.write(results['crawl'])
+                with st.status("Analyse en cours...", expanded=True) as status:
+                    # Appelé dans la boucle asyncio, sur le thread du script
+                    def show_progress(event, step):
+                        if event == "start":
+                            st.write(step.label)
+                        elif step.done:
+                            st.success(step.done)
+                
+                    results = run_pipeline(steps, llm, show_progress,
+                                           cache=get_llm_cache(), refresh=force_refresh)
+                
+                    status.update(label="Analyse terminee!", state="complete", expanded=False)
             
-            st.subheader("Detection IA")
-            st.write(results['ia'])
+                # Extraction du score
+                score_match = re.search(r'[Ss]core[:\s]+(\d+)', results['rapport'])
+                score = int(score_match.group(1)) if score_match else 75
             
-            st.subheader("Analyse RGPD")
-            st.write(results['rgpd'])
+                # Génération PDF AMÉLIORÉ
+                buffer = BytesIO()
+                doc = SimpleDocTemplate(buffer, pagesize=A4)
+                styles = get_stylesheet()
+                story = []
             
-            st.subheader("AI Act")
-            st.write(results['aiact'])
-        
-        # Génération PDF AMÉLIORÉ
-        st.markdown("---")
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Page 1 - En-tête et résumé
-        story.append(Paragraph("Rapport Conformite RGPD / AI Act", styles['Title']))
-        story.append(Spacer(1, 20))
-        story.append(Paragraph(f"<b>Site analyse:</b> {url}", styles['Normal']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<b>Score global:</b> {score}/100", styles['Heading2']))
-        story.append(Spacer(1, 20))
-        
-        # Résumé exécutif
-        story.append(Paragraph("<b>Résumé exécutif:</b>", styles['Heading3']))
-        story.append(Spacer(1, 8))
-        rapport_clean = results['rapport'].replace('\n', '<br/>')
-        story.append(Paragraph(rapport_clean, styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Nouvelle page pour RGPD
-        story.append(PageBreak())
-        story.append(Paragraph("<b>Analyse détaillée RGPD:</b>", styles['Heading2']))
-        story.append(Spacer(1, 12))
-        rgpd_clean = results['rgpd'].replace('\n', '<br/>')
-        story.append(Paragraph(rgpd_clean, styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Section AI Act (TOUJOURS incluse)
-        story.append(Paragraph("<b>Analyse AI Act:</b>", styles['Heading2']))
-        story.append(Spacer(1, 12))
-        aiact_clean = results['aiact'].replace('\n', '<br/>')
-        story.append(Paragraph(aiact_clean, styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Nouvelle page pour détails techniques
-        story.append(PageBreak())
-        story.append(Paragraph("<b>Annexe - Détails techniques:</b>", styles['Heading2']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<b>Structure du site:</b>", styles['Heading3']))
-        story.append(Spacer(1, 8))
-        crawl_clean = results['crawl'].replace('\n', '<br/>')
-        story.append(Paragraph(crawl_clean, styles['Normal']))
-        story.append(Spacer(1, 12))
-        
-        story.append(Paragraph("<b>Détection IA:</b>", styles['Heading3']))
-        story.append(Spacer(1, 8))
-        ia_clean = results['ia'].replace('\n', '<br/>')
-        story.append(Paragraph(ia_clean, styles['Normal']))
-        
-        doc.build(story)
-        pdf_bytes = buffer.getvalue()
-        
-        # Bouton téléchargement (toujours disponible)
-        st.download_button(
-            label="📥 Telecharger le rapport PDF",
-            data=pdf_bytes,
-            file_name=f"rapport_conformite_{url.replace('https://', '').replace('http://', '').replace('/', '_')[:30]}.pdf",
-            mime="application/pdf",
-            type="primary"
-        )
+                # Page 1 - En-tête et résumé
+                story.append(Paragraph("Rapport Conformite RGPD / AI Act", styles['Title']))
+                story.append(Spacer(1, 20))
+                story.append(Paragraph(f"<b>Site analyse:</b> {url}", styles['Normal']))
+                story.append(Spacer(1, 12))
+                story.append(Paragraph(f"<b>Score global:</b> {score}/100", styles['Heading2']))
+                story.append(Spacer(1, 20))
+            
+                # Résumé exécutif
+                story.append(Paragraph("<b>Résumé exécutif:</b>", styles['Heading3']))
+                story.append(Spacer(1, 8))
+                rapport_clean = results['rapport'].replace('\n', '<br/>')
+                story.append(Paragraph(rapport_clean, styles['Normal']))
+                story.append(Spacer(1, 20))
+            
+                # Nouvelle page pour RGPD
+                story.append(PageBreak())
+                story.append(Paragraph("<b>Analyse détaillée RGPD:</b>", styles['Heading2']))
+                story.append(Spacer(1, 12))
+                rgpd_clean = escape(results['rgpd']).replace('\n', '<br/>')
+                story.append(Paragraph(rgpd_clean, styles['Normal']))
+                story.append(Spacer(1, 20))
+            
+                # Section AI Act (TOUJOURS incluse)
+                story.append(Paragraph("<b>Analyse AI Act:</b>", styles['Heading2']))
+                story.append(Spacer(1, 12))
+                aiact_clean = results['aiact'].replace('\n', '<br/>')
+                story.append(Paragraph(aiact_clean, styles['Normal']))
+                story.append(Spacer(1, 20))
+            
+                # Nouvelle page pour détails techniques
+                story.append(PageBreak())
+                story.append(Paragraph("<b>Annexe - Détails techniques:</b>", styles['Heading2']))
+                story.append(Spacer(1, 12))
+                story.append(Paragraph("<b>Structure du site:</b>", styles['Heading3']))
+                story.append(Spacer(1, 8))
+                crawl_clean = escape(results['crawl']).replace('\n', '<br/>')
+                story.append(Paragraph(crawl_clean, styles['Normal']))
+                story.append(Spacer(1, 12))
+            
+                story.append(Paragraph("<b>Détection IA:</b>", styles['Heading3']))
+                story.append(Spacer(1, 8))
+                ia_clean = results['ia'].replace('\n', '<br/>')
+                story.append(Paragraph(ia_clean, styles['Normal']))
+            
+                doc.build(story)
+                pdf_bytes = buffer.getvalue()
+            
+                analysis = {
+                    'url': url,
+                    'results': results,
+                    # HTML des pages (plusieurs Mo) écarté : règles, traceurs et extraits sont déjà calculés
+                    'site': site['model'].without_html() if site.get('model') else None,
+                    'rgpd': site.get('rgpd'),
+                    'trackers': site.get('trackers'),
+                    'forms': site.get('forms'),
+                    'digest': site.get('digest'),
+                    'score': score,
+                    'pdf_bytes': pdf_bytes,
+                    'emails': {},  # adresse -> envoyé (True) ou échec (False)
+                }
+                st.session_state["analysis"] = analysis
+            finally:
+                # même si le crawl, un appel LLM ou le PDF échoue : cProfile et tracemalloc arrêtés
+                if run_profile:
+                    run_profile.stop()
         
-        # Envoi email si fourni
-        if email and "@" in email:
+        # Envoi email si fourni (une seule fois par adresse pour une analyse donnée)
+        if email and "@" in email and email not in analysis['emails']:
+            score = analysis['score']
+            pdf_bytes = analysis['pdf_bytes']
             try:
                 from resend import Emails
                 
+                attachment, _ = build_attachment("rapport_conformite.pdf", pdf_bytes)
                 Emails.send({
                     "from": "no-reply@guillaumepicard.ca",
                     "to": [email],
@@ -279,24 +285,79 @@ IMPORTANT: Commence par "Score: XX/100" """
                         <br>
                         <p>Cordialement,<br>L'equipe AI Conforme</p>
                     """,
-                    "attachments": [{
-                        "filename": "rapport_conformite.pdf",
-                        "content": list(pdf_bytes),
-                    }],
+                    "attachments": [attachment],
                 })
                 
-                st.success(f"📧 Rapport egalement envoye a {email}")
+                analysis['emails'][email] = True
                 
                 # TODO: Sauvegarder le lead (email, url, newsletter) dans un fichier CSV ou DB
                 
             except Exception as e:
-                st.warning(f"Le rapport n'a pas pu etre envoye par email, mais vous pouvez le telecharger ci-dessus.")
+                analysis['emails'][email] = False
+
+# Affichage des résultats (depuis la session, survit aux reruns)
+analysis = st.session_state.get("analysis")
+if analysis:
+    url = analysis['url']
+    results = analysis['results']
+    score = analysis['score']
+    pdf_bytes = analysis['pdf_bytes']
+    
+    st.markdown("---")
+    st.header(f"📊 Resultats pour {url}")
+    
+    # Score avec couleur
+    col1, col2, col3 = st.columns(3)
+    with col2:
+        if score >= 80:
+            st.success(f"### Score: {score}/100")
+        elif score >= 60:
+            st.warning(f"### Score: {score}/100")
+        else:
+            st.error(f"### Score: {score}/100")
+    
+    # Rapport détaillé
+    with st.expander("📄 Rapport complet", expanded=True):
+        st.markdown(results['rapport'])
+    
+    with st.expander("🔍 Details de l'analyse"):
+        st.subheader("Exploration du site")
+        st.write(results['crawl'])
+        if analysis.get('digest'):
+            st.caption(analysis['digest'].summary())
+        
+        st.subheader("Detection IA")
+        st.write(results['ia'])
         
-        # CTA Premium + Services IA
-        st.markdown("---")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.info("""
+        st.subheader("Analyse RGPD")
+        st.write(results['rgpd'])
+        
+        st.subheader("AI Act")
+        st.write(results['aiact'])
+    
+    st.markdown("---")
+    
+    # Bouton téléchargement (toujours disponible, sans relancer le script)
+    st.download_button(
+        label="📥 Telecharger le rapport PDF",
+        data=pdf_bytes,
+        file_name=f"rapport_conformite_{url.replace('https://', '').replace('http://', '').replace('/', '_')[:30]}.pdf",
+        mime="application/pdf",
+        on_click="ignore",
+        type="primary"
+    )
+    
+    if email in analysis['emails']:
+        if analysis['emails'][email]:
+            st.success(f"📧 Rapport egalement envoye a {email}")
+        else:
+            st.warning("Le rapport n'a pas pu etre envoye par email, mais vous pouvez le telecharger ci-dessus.")
+    
+    # CTA Premium + Services IA
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.info("""
             ### 🔓 Passez a Premium
             
             Debloquez le rapport complet avec :
@@ -307,8 +368,8 @@ IMPORTANT: Commence par "Score: XX/100" """
             
             **49$/mois** | [Essayer Premium →](#)
             """)
-        with col2:
-            st.success("""
+    with col2:
+        st.success("""
             ### 💎 Besoin d'IA sur-mesure ?
             
             Automatisez vos processus metier
@@ -318,8 +379,8 @@ IMPORTANT: Commence par "Score: XX/100" """
             
             [Demander une demo →](#)
             """)
-        
-        st.success("Analyse terminee! Vous pouvez telecharger le rapport ci-dessus.")
+    
+    st.success("Analyse terminee! Vous pouvez telecharger le rapport ci-dessus.")
 
 # Sidebar
 with st.sidebar:
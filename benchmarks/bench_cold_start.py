@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark - démarrage à froid de app.py (Railway : redémarrages, mise en veille)
+Pour chaque essai, un processus Python neuf exécute le premier run du script
+Streamlit (AppTest, page d'accueil sans soumission) sous `python -X importtime`.
+
+Mesures :
+- first_run_ms : durée du premier run du script
+- script_import_ms : coût des imports déclenchés par le script (hors streamlit lui-même)
+- modules lourds chargés sur la page d'accueil
+
+Les résultats sont comparés au budget benchmarks/cold_start_budget.json ;
+code de sortie 1 en cas de dépassement.
+
+Usage : python benchmarks/bench_cold_start.py [--runs N] [--script app.py] [--budget FICHIER]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "cold_start_budget.json")
+MARKER = "--- premier run du script ---"
+
+# Exécuté dans le processus neuf : streamlit est importé avant le marqueur,
+# tout ce qui est importé après est imputable au script.
+RUNNER = f"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+at.run()
+first_run_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"first_run_ms": first_run_ms, "exception": bool(at.exception), "modules": sorted(sys.modules)}}))
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Retourne [(module, cumulé µs)] des imports de premier niveau après le marqueur."""
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    imports = []
+    for line in lines:
+        match = IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            imports.append((match.group(4), int(match.group(2))))
+    return imports
+
+
+def run_once(script):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUNNER, script],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(proc.stderr)
+    result["script_import_ms"] = sum(us for _, us in imports) / 1000
+    result["top_imports"] = sorted(imports, key=lambda item: -item[1])[:10]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--script", default="app.py")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET)
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    runs = [run_once(args.script) for _ in range(args.runs)]
+    first_run_ms = statistics.median(r["first_run_ms"] for r in runs)
+    script_import_ms = statistics.median(r["script_import_ms"] for r in runs)
+    loaded = set(runs[-1]["modules"])
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+    heavy = {m: m in loaded for m in budget["forbidden_modules"]}
+
+    print(f"📊 Démarrage à froid de {args.script} ({args.runs} processus neufs, médiane)\n")
+    print(f"Premier run du script : {first_run_ms:8.1f} ms (budget {budget['first_run_ms']} ms)")
+    print(f"Imports du script     : {script_import_ms:8.1f} ms (budget {budget['script_import_ms']} ms)")
+    print("\nImports les plus coûteux :")
+    for name, us in runs[-1]["top_imports"]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    print("\nModules lourds sur la page d'accueil :")
+    for name, is_loaded in heavy.items():
+        print(f"  {'❌ chargé' if is_loaded else '✅ absent'}  {name}")
+
+    failures = []
+    if any(r["exception"] for r in runs):
+        failures.append("exception pendant le run du script")
+    if first_run_ms > budget["first_run_ms"]:
+        failures.append(f"premier run {first_run_ms:.0f} ms > {budget['first_run_ms']} ms")
+    if script_import_ms > budget["script_import_ms"]:
+        failures.append(f"imports {script_import_ms:.0f} ms > {budget['script_import_ms']} ms")
+    failures.extend(f"{name} importé au démarrage" for name, is_loaded in heavy.items() if is_loaded)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"first_run_ms": first_run_ms, "script_import_ms": script_import_ms,
+                       "heavy_modules": heavy, "failures": failures}, f, indent=2)
+
+    if failures:
+        print("\n❌ Régression :\n  - " + "\n  - ".join(failures))
+        return 1
+    print("\n✅ Dans le budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
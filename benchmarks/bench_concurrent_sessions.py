@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark - charge de sessions simultanées sur un serveur `streamlit run app.py`
+Chaque session simulée parle le protocole websocket de Streamlit comme un
+navigateur : chargement de la page, réponses aux 10 questions + email,
+soumission du formulaire, téléchargement du PDF (/media/...). Plusieurs
+paliers de concurrence sont enchaînés pour repérer le point où la latence
+s'effondre.
+
+Par palier :
+- latence de soumission p50/p95/p99 (envoi du formulaire -> fin du script)
+- débit (quiz complets/s), taux d'erreur
+- RSS du serveur : pic du palier et surcoût par session connectée
+
+Par défaut le serveur est lancé par le benchmark (stockage et outbox
+temporaires, emails envoyés au faux Resend local). --url vise un serveur
+existant ; --pid permet alors de suivre sa RSS.
+
+Usage : python benchmarks/bench_concurrent_sessions.py [--concurrency 1,5,10,20] [--sessions N] [--think S]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+
+from analyseur.fake_resend import start_server
+
+EMAIL_LABEL = "Votre email professionnel"
+
+
+class SessionError(Exception):
+    pass
+
+
+def rss_kb(pid):
+    """RSS d'un processus (Linux, /proc) ; None si indisponible."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def start_app(port, tmp, resend_url):
+    env = dict(os.environ)
+    env.update({
+        "STORAGE_URL": "sqlite:///" + os.path.join(tmp, "storage.sqlite3"),
+        "OUTBOX_DB": os.path.join(tmp, "outbox.sqlite3"),
+        "RESEND_API_URL": resend_url,
+        "RESEND_API_KEY": "re_bench",
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.port", str(port),
+         "--server.address", "127.0.0.1", "--server.headless", "true"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + "/_stcore/health", timeout=1):
+                return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("le serveur Streamlit n'a pas démarré")
+
+
+class Session:
+    """Une session navigateur simulée sur /_stcore/stream."""
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.widgets = {}
+
+    async def connect(self):
+        ws_url = self.url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.ws = await websocket_connect(HTTPRequest(ws_url, headers={"Origin": self.url}),
+                                          subprotocols=["streamlit"])
+
+    async def run_script(self, widget_states=()):
+        """Envoie un rerun_script et lit les deltas jusqu'à la fin du script ; retourne les éléments."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        elements = []
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise SessionError("websocket fermé par le serveur")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                elements.append((element.WhichOneof("type"), element))
+            elif kind == "session_event" and forward.session_event.WhichOneof("type") == "script_compilation_exception":
+                raise SessionError("erreur de compilation du script")
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    elements = []
+                    continue
+                break
+        if any(kind == "exception" for kind, _ in elements):
+            raise SessionError("exception dans le script")
+        return elements
+
+    def submission(self, email):
+        """Widget states d'un quiz rempli (2e option partout) + clic sur le bouton du formulaire."""
+        states = []
+        for kind, element in self.widgets:
+            state = WidgetState()
+            if kind == "radio":
+                state.id = element.radio.id
+                state.int_value = 1
+            elif kind == "text_input" and element.text_input.label == EMAIL_LABEL:
+                state.id = element.text_input.id
+                state.string_value = email
+            elif kind == "button" and element.button.is_form_submitter:
+                state.id = element.button.id
+                state.trigger_value = True
+            else:
+                continue
+            states.append(state)
+        return states
+
+    async def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+async def quiz_session(url, index, think, stats, http):
+    session = Session(url)
+    try:
+        await session.connect()
+        elements = await session.run_script()  # chargement de la page
+        session.widgets = [(k, e) for k, e in elements if k in ("radio", "text_input", "button")]
+        if think:
+            await asyncio.sleep(think)
+
+        start = time.perf_counter()
+        elements = await session.run_script(session.submission(f"charge{index}@example.com"))
+        stats["submit_ms"].append((time.perf_counter() - start) * 1000)
+
+        downloads = [e.download_button.url for k, e in elements if k == "download_button"]
+        if not downloads:
+            raise SessionError("pas de bouton de téléchargement après soumission")
+        response = await http.fetch(url + downloads[0])
+        if not response.body.startswith(b"%PDF"):
+            raise SessionError("téléchargement : PDF invalide")
+        stats["completed"] += 1
+    except Exception as e:
+        stats["errors"][f"{type(e).__name__}: {e}"] = stats["errors"].get(f"{type(e).__name__}: {e}", 0) + 1
+    finally:
+        await session.close()
+
+
+async def run_level(url, concurrency, sessions, think, pid):
+    stats = {"submit_ms": [], "completed": 0, "errors": {}}
+    http = AsyncHTTPClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    baseline_rss = rss_kb(pid) if pid else None
+    peak_rss = baseline_rss
+    counter = int(time.time() * 1000)
+
+    async def one(i):
+        async with semaphore:
+            await quiz_session(url, counter + i, think, stats, http)
+
+    async def sample_rss():
+        nonlocal peak_rss
+        while True:
+            current = rss_kb(pid)
+            if current:
+                peak_rss = max(peak_rss or 0, current)
+            await asyncio.sleep(0.1)
+
+    sampler = asyncio.ensure_future(sample_rss()) if pid else None
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    if sampler:
+        sampler.cancel()
+
+    timings = sorted(stats["submit_ms"])
+
+    def percentile(p):
+        return round(timings[min(len(timings) - 1, int(p / 100 * len(timings)))], 1) if timings else None
+
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "completed": stats["completed"],
+        "error_rate": round(1 - stats["completed"] / sessions, 4),
+        "errors": stats["errors"],
+        "throughput_per_s": round(stats["completed"] / elapsed, 2),
+        "submit_ms_p50": percentile(50),
+        "submit_ms_p95": percentile(95),
+        "submit_ms_p99": percentile(99),
+        "submit_ms_mean": round(statistics.fmean(timings), 1) if timings else None,
+        "rss_peak_mb": round(peak_rss / 1024, 1) if peak_rss else None,
+        "rss_per_session_kb": round((peak_rss - baseline_rss) / concurrency) if peak_rss and baseline_rss else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,5,10,20", help="paliers de sessions simultanées")
+    parser.add_argument("--sessions", type=int, default=40, help="quiz complets par palier")
+    parser.add_argument("--think", type=float, default=0.0, help="pause entre chargement et soumission (s)")
+    parser.add_argument("--url", help="serveur existant (sinon lancé par le benchmark)")
+    parser.add_argument("--pid", type=int, help="pid du serveur existant, pour la RSS")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    resend = start_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        process = None
+        url, pid = args.url, args.pid
+        if not url:
+            process, url = start_app(args.port, tmp, resend.url)
+            pid = process.pid
+        try:
+            asyncio.run(run_level(url, 1, 2, 0, None))  # chauffe : imports, caches de ressources
+            print(f"📊 Sessions simultanées sur {url} ({args.sessions} quiz par palier)\n")
+            print(f"{'sessions':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'quiz/s':>7} {'erreurs':>8} {'RSS Mo':>7} {'Ko/sess':>8}")
+            results = []
+            for concurrency in levels:
+                result = asyncio.run(run_level(url, concurrency, max(args.sessions, concurrency), args.think, pid))
+                results.append(result)
+                print(f"{concurrency:8d} {result['submit_ms_p50'] or 0:9.1f} {result['submit_ms_p95'] or 0:9.1f} "
+                      f"{result['submit_ms_p99'] or 0:9.1f} {result['throughput_per_s']:7.2f} "
+                      f"{result['error_rate'] * 100:7.1f}% {result['rss_peak_mb'] or 0:7.1f} "
+                      f"{result['rss_per_session_kb'] or 0:8d}")
+                for error, count in result["errors"].items():
+                    print(f"           ❌ {count} x {error}")
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+    resend.shutdown()
+
+    print(f"\nFaux Resend : {json.dumps(resend.stats.snapshot())}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "levels": results, "resend": resend.stats.snapshot()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
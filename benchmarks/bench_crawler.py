@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark - crawler HTTP de l'analyseur contre le site de démonstration local
+(analyseur/fixture_site.py), sans réseau.
+
+Mesures : durée du crawl, pages, octets, requêtes et connexions TCP ouvertes
+(réutilisation keep-alive). Vérifie aussi le comportement attendu du crawler :
+robots.txt respecté, page du sitemap trouvée, page lente abandonnée au délai,
+page énorme tronquée, budget de pages tenu. Code de sortie 1 si une
+vérification échoue.
+
+Usage : python benchmarks/bench_crawler.py [--runs N] [--max-pages N] [--per-host N] [--slow S]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyseur.crawler import CrawlLimits, crawl_site
+from analyseur.fixture_site import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-pages", type=int, default=15)
+    parser.add_argument("--per-host", type=int, default=4)
+    parser.add_argument("--slow", type=float, default=3.0, help="délai de /lent (s)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="délai par requête du crawler (s)")
+    args = parser.parse_args()
+
+    limits = CrawlLimits(max_pages=args.max_pages, per_host=args.per_host, timeout=args.timeout,
+                         max_page_bytes=256 * 1024)
+    server = start_server(slow=args.slow)
+    durations = []
+    for _ in range(args.runs):
+        before = server.stats.snapshot()
+        start = time.perf_counter()
+        site = crawl_site(server.url, limits, allow_private=True)
+        durations.append((time.perf_counter() - start) * 1000)
+        after = server.stats.snapshot()
+    server.shutdown()
+
+    requests = after["requests"] - before["requests"]
+    connections = after["connections"] - before["connections"]
+    paths = {page.url.replace(server.url, "") for page in site.pages}
+
+    print(f"🕷️  Crawl de {server.url} ({args.runs} essais, per_host={args.per_host})\n")
+    print(f"Durée                 : {statistics.median(durations):8.1f} ms médiane "
+          f"({min(durations):.1f} - {max(durations):.1f})")
+    print(f"Pages                 : {len(site.pages):8d} (budget {limits.max_pages})")
+    print(f"Octets téléchargés    : {site.stats['bytes']:8d}")
+    print(f"Requêtes / connexions : {requests:8d} / {connections} "
+          f"({requests / max(connections, 1):.1f} requêtes par connexion)")
+    print(f"Erreurs               : {len(site.errors):8d}")
+    for url, message in site.errors:
+        print(f"  - {url}: {message}")
+
+    checks = {
+        "robots.txt respecté (/prive/ jamais demandé)": "/prive/admin" not in after["paths"],
+        "page non liée trouvée via le sitemap": "/mentions-legales" in paths,
+        "page lente abandonnée au délai": any(url.endswith("/lent") for url, _ in site.errors),
+        "page énorme tronquée": any(page.truncated for page in site.pages if page.url.endswith("/enorme")),
+        "budget de pages tenu": len(site.pages) <= limits.max_pages,
+        "connexions réutilisées (keep-alive)": connections < requests,
+        "formulaire de contact extrait": any(form.fields for page in site.pages for form in page.forms
+                                             if page.url.endswith("/contact")),
+        "cookies de la page d'accueil relevés": bool(site.pages and site.pages[0].cookies),
+    }
+    print()
+    for label, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {label}")
+    if not all(checks.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark - réduction du HTML avant le modèle (analyseur/digest.py)
+Site synthétique de N pages au gabarit réaliste (en-tête, menu, pied de page
+et bandeau répétés, scripts et styles inline, SVG, <select> de pays) : durée
+de digest_site(), tokens du HTML brut, du contenu réduit et des extraits par
+étape. Vérifie que chaque extrait tient dans son budget, que le gabarit
+n'apparaît qu'une fois et qu'aucun script ne passe.
+
+Usage : python benchmarks/bench_digest.py [--pages N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyseur.crawler import Page, SiteModel
+from analyseur.digest import AI_FOCUS, BUDGETS, PRIVACY_FOCUS, budget, digest_site, estimate_tokens
+
+SCRIPT = "<script>" + "window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)};" * 200 + "</script>"
+STYLE = "<style>" + ".btn-primary{color:#fff;background:#0d6efd;border-color:#0d6efd}" * 300 + "</style>"
+ICON = "<svg viewBox='0 0 24 24'><path d='" + "M12 2L2 7l10 5 10-5-10-5z " * 40 + "'/></svg>"
+COUNTRIES = "<select name='pays'>" + "".join(f"<option>Pays {i}</option>" for i in range(200)) + "</select>"
+HEADER = f"""<header>{ICON}<nav><a href="/">Accueil</a> <a href="/offres">Offres</a> <a href="/blog">Blog</a>
+<a href="/contact">Contact</a></nav></header>"""
+FOOTER = f"""<footer>{ICON}<p>Boutique Exemple SAS - 1 rue de Paris</p>
+<a href="/mentions-legales">Mentions légales</a> <a href="/politique-confidentialite">Confidentialité</a>
+<div id="cookie-banner"><p>Nous utilisons des cookies pour mesurer l'audience.</p><button>Accepter</button></div></footer>"""
+
+
+def page_html(n):
+    body = "".join(f"<p>Paragraphe {k} de la page {n} : présentation du produit, délais et garanties.</p>"
+                   for k in range(8))
+    extra = ("<p>Notre assistant virtuel, propulsé par l'intelligence artificielle, répond 24h/24.</p>"
+             if n % 10 == 3 else "")
+    form = (f"<form action='/devis' method='post'><label>Email <input type='email' name='email'></label>{COUNTRIES}"
+            "<label><input type='checkbox' name='rgpd'> J'accepte le traitement de mes données personnelles</label>"
+            "</form>" if n % 5 == 0 else "")
+    return (f"<html><head><title>Page {n}</title>{STYLE}{SCRIPT}</head><body>{HEADER}<main><h1>Produit {n}</h1>"
+            f"{body}{extra}{form}</main>{FOOTER}{SCRIPT}</body></html>")
+
+
+def synthetic_site(pages):
+    site_pages = tuple(Page(f"https://exemple.com/produit-{n}", 200, "text/html", 0, f"Page {n}", page_html(n),
+                            (), (), (), (), (), (), False, 0.0) for n in range(pages))
+    return SiteModel("https://exemple.com/", site_pages, (), False, (), {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    site = synthetic_site(args.pages)
+    size = sum(len(page.html) for page in site.pages)
+    seconds = min(timeit.repeat(lambda: digest_site(site), number=1, repeat=args.repeat))
+    digest = digest_site(site)
+    text = digest.text()
+    excerpts = {"ia": digest.excerpt("ia", focus=AI_FOCUS),
+                "rgpd": digest.excerpt("rgpd", focus=PRIVACY_FOCUS, only_focus=True),
+                "aiact": digest.excerpt("aiact", focus=AI_FOCUS, only_focus=True)}
+
+    print(f"📊 digest_site() - {args.pages} pages, meilleur de {args.repeat} essais\n")
+    print(f"HTML brut        : {size / 1024:8.0f} Ko  {digest.raw_tokens:8d} tokens "
+          f"(estimation caractères/4 : {size // 4})")
+    print(f"Contenu réduit   : {len(text) / 1024:8.1f} Ko  {digest.tokens:8d} tokens "
+          f"({digest.duplicates} blocs répétés écartés)")
+    print(f"Durée            : {seconds * 1000:8.1f} ms ({size / seconds / 1e6:.1f} Mo/s)")
+    print()
+    for step, excerpt in excerpts.items():
+        print(f"  extrait {step:<6} : {excerpt.tokens:5d} / {budget(step)} tokens, {excerpt.omitted} lignes écartées")
+    print(f"\n📝 {digest.summary()}")
+
+    checks = {
+        "extraits dans leur budget": all(excerpt.tokens <= budget(step) for step, excerpt in excerpts.items()),
+        "budgets par défaut lus": set(excerpts) <= set(BUDGETS),
+        "pied de page gardé une fois": text.count("Boutique Exemple SAS") == 1,
+        "menu gardé une fois": text.count("[Offres](/offres)") == 1,
+        "ni script, ni style, ni SVG, ni options": not any(s in text for s in ("dataLayer", "btn-primary", "M12", "Pays 1")),
+        "formulaires résumés": "[formulaire POST /devis : email, pays, rgpd]" in text,
+        "mentions de l'IA transmises à l'AI Act": "assistant virtuel" in excerpts["aiact"].text,
+        "comptage cohérent": 0 < estimate_tokens(text) == digest.tokens < digest.raw_tokens,
+    }
+    print()
+    for label, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {label}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
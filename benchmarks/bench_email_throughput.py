@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark - débit du chemin email du quiz (outbox + SDK Resend) contre le faux Resend local
+Aucun accès réseau, aucun email réel.
+
+Usage : python benchmarks/bench_email_throughput.py [--emails N] [--workers W] [--latency S] [--rate-429 P] [--rate-5xx P]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resend
+
+from analyseur.attachments import build_attachment
+from analyseur.fake_resend import start_server
+from analyseur.outbox import Outbox
+from analyseur.report import build_quiz_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, rate_429=args.rate_429, rate_5xx=args.rate_5xx, seed=1)
+    resend.api_url = server.url
+    resend.api_key = "re_bench"
+
+    attachment, attachment_stats = build_attachment("rapport.pdf", build_quiz_report(42, "faible", "Acme"))
+    payload = {
+        "from": "no-reply@guillaumepicard.ca",
+        "to": ["bench@example.com"],
+        "subject": "Votre rapport de conformité AI Act - Score: 42/100",
+        "html": "<p>Benchmark</p>",
+        "attachments": [attachment],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Outbox(os.path.join(tmp, "outbox.sqlite3"), workers=args.workers,
+                        max_attempts=10, base_delay=0.05, max_delay=1.0, poll_interval=0.05)
+
+        start = time.perf_counter()
+        job_ids = [outbox.enqueue(payload) for _ in range(args.emails)]
+        enqueue_s = time.perf_counter() - start
+        outbox.start()
+
+        while time.perf_counter() - start < args.timeout:
+            counts = outbox.counts()
+            if counts.get("sent", 0) + counts.get("dead", 0) >= len(job_ids):
+                break
+            time.sleep(0.05)
+        total_s = time.perf_counter() - start
+        outbox.stop()
+        counts = outbox.counts()
+
+    server.shutdown()
+
+    print("📊 Débit email (outbox -> faux Resend)\n")
+    print(f"Pièce jointe     : {attachment_stats['payload_bytes']} octets ({attachment_stats['encoding']})")
+    print(f"Enqueue          : {enqueue_s / args.emails * 1000:.3f} ms/email (temps vu par la soumission)")
+    print(f"Livraison totale : {total_s:.2f} s pour {args.emails} emails, {args.workers} workers "
+          f"-> {counts.get('sent', 0) / total_s:.1f} emails/s")
+    print(f"Statuts          : {counts}")
+    print(f"Serveur          : {json.dumps(server.stats.snapshot())}")
+
+
+if __name__ == "__main__":
+    main()
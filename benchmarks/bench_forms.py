@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark - classification des formulaires (analyseur/forms.py)
+Pages synthétiques de N formulaires variés (contact, newsletter, connexion,
+santé, case pré-cochée, recherche) : durée de analyse_forms() pour N puis 2N
+formulaires (le coût doit rester linéaire), constats attendus, et taille
+du texte envoyé au modèle : constats compacts contre détail des champs.
+
+Usage : python benchmarks/bench_forms.py [--forms N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyseur.crawler import Page, PageParser, SiteModel
+from analyseur.forms import AMBIGU, CONFORME, NON_CONFORME, analyse_forms, forms_summary
+
+TEMPLATES = {
+    "contact": """<form action="/contact-{i}" method="post">
+  <label for="nom-{i}">Nom</label><input id="nom-{i}" name="nom">
+  <input type="email" name="email" autocomplete="email"><input name="telephone">
+  <textarea name="message"></textarea>
+  <label><input type="checkbox" name="rgpd" required> J'accepte la
+  <a href="/politique-confidentialite">politique de confidentialité</a></label>
+</form>""",
+    "newsletter": """<form action="/newsletter-{i}" method="post">
+  <input type="email" name="email" placeholder="Votre email"><button>S'abonner</button>
+</form><a href="/blog">Blog</a>""",
+    "connexion": """<form action="/login-{i}" method="post">
+  <input name="login" autocomplete="username"><input type="password" name="password">
+</form>""",
+    "sante": """<form action="/rdv-{i}" method="post">
+  <input name="prenom" autocomplete="given-name"><input name="allergies" placeholder="Allergies connues">
+  <p>Vos données sont traitées par le cabinet pour gérer votre rendez-vous.</p>
+</form>""",
+    "precoche": """<form action="/offres-{i}" method="post">
+  <input name="email" type="email"><input type="checkbox" name="consentement" checked> J'accepte de recevoir les offres
+</form>""",
+    "recherche": """<form action="/recherche-{i}"><input name="q" placeholder="Rechercher"></form>""",
+}
+EXPECTED = {"contact": CONFORME, "newsletter": NON_CONFORME, "connexion": CONFORME, "sante": NON_CONFORME,
+            "precoche": NON_CONFORME, "recherche": None}
+
+
+def synthetic_site(forms, pages=1):
+    """`pages` pages portant chacune les mêmes `forms` formulaires (en-tête et pied de page répétés)."""
+    kinds = list(TEMPLATES)
+    html = "<html><body>" + "\n<p>Texte entre les formulaires.</p>\n".join(
+        TEMPLATES[kinds[i % len(kinds)]].format(i=i) for i in range(forms)) + "</body></html>"
+    parser = PageParser("https://exemple.com/")
+    parser.feed(html)
+    parser.close()
+    site_pages = tuple(Page(f"https://exemple.com/page-{n}", 200, "text/html", 0, "", html, (), (),
+                            tuple(parser.forms), (), (), (), False, 0.0) for n in range(pages))
+    return SiteModel("https://exemple.com/", site_pages, (), False, (), {})
+
+
+def field_dump(site):
+    """Détail des champs tel qu'il était envoyé au modèle avant les constats."""
+    return "\n".join(f"- {page.url} -> {form.method} {form.action}: "
+                     + ", ".join(f"{f.name or f.id or '?'} ({f.type})" for f in form.fields if f.type != "hidden")
+                     for page in site.pages for form in page.forms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--forms", type=int, default=3000, help="formulaires sur la page synthétique")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"📊 analyse_forms() - meilleur de {args.repeat} essais\n")
+    timings = {}
+    for count in (args.forms, args.forms * 2):
+        site = synthetic_site(count)
+        timings[count] = min(timeit.repeat(lambda: analyse_forms(site), number=1, repeat=args.repeat))
+        print(f"{count:>6} formulaires : {timings[count] * 1000:8.1f} ms "
+              f"({timings[count] / count * 1e6:.1f} µs par formulaire)")
+    ratio = timings[args.forms * 2] / timings[args.forms]
+
+    site = synthetic_site(len(TEMPLATES))
+    # action "/xxx-{i}" : i est le rang du modèle dans TEMPLATES
+    findings = {list(TEMPLATES)[int(f.action.rsplit("-", 1)[1])]: f for f in analyse_forms(site)}
+    print()
+    for kind in TEMPLATES:
+        finding = findings.get(kind)
+        print(f"  {kind:<11} -> {finding.line() if finding else 'pas de donnees personnelles'}")
+
+    # site de 20 pages portant les mêmes formulaires ; l'ancien détail était plafonné à 15 lignes
+    site = synthetic_site(len(TEMPLATES), pages=20)
+    summary = forms_summary(analyse_forms(site))
+    dump = "\n".join(field_dump(site).splitlines()[:15])
+    print(f"\nTexte pour le modèle (20 pages) : {len(summary)} caractères de constats, "
+          f"contre {len(dump)} pour le détail des 15 premiers formulaires")
+
+    checks = {
+        f"coût linéaire (x2 formulaires -> x{ratio:.1f})": ratio < 3,
+        "statuts attendus": all((findings[kind].status if kind in findings else None) == expected
+                                for kind, expected in EXPECTED.items()),
+        "aucun constat ambigu sur ces cas tranchés": all(f.status != AMBIGU for f in findings.values()),
+        "constats plus courts que le détail des champs": len(summary) < len(dump),
+    }
+    print()
+    for label, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {label}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
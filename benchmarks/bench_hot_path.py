@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark - chemin critique du quiz, référence pour chaque changement de performance
+Mesure (timeit, meilleur temps par appel sur plusieurs séries) :
+- calculate_score, get_category, get_recommendations
+- construction complète du PDF pour chacune des quatre catégories (sans cache)
+- construction du payload email (pièce jointe base64 + sérialisation JSON de l'outbox)
+- soumission complète du quiz via AppTest (calcul, PDF, stockage, mise en file)
+
+Les résultats sont écrits en JSON (commit, date, µs par appel) pour comparer
+les runs entre commits, et confrontés à :
+- un budget absolu : benchmarks/hot_path_budget.json
+- optionnellement un run précédent : --baseline FICHIER --tolerance 0.25
+Code de sortie 1 en cas de régression.
+
+Usage : python benchmarks/bench_hot_path.py [--repeat N] [--only NOM] [--json FICHIER] [--baseline FICHIER]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "hot_path_budget.json")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+from analyseur.recommendations import CATEGORIES, get_recommendations
+from analyseur.scoring import QUESTIONS, calculate_score, get_category
+
+# Une réponse représentative : deuxième option partout (score "faible")
+RESPONSES = {q.key: q.options[1][0] for q in QUESTIONS}
+SAMPLE_SCORES = {"critique": 25, "faible": 50, "moyen": 70, "excellent": 90}
+
+
+def bench_scoring():
+    score = calculate_score(RESPONSES)
+    category = get_category(score)
+    return {
+        "calculate_score": lambda: calculate_score(RESPONSES),
+        "get_category": lambda: get_category(score),
+        "get_recommendations": lambda: get_recommendations(score, RESPONSES, category),
+    }
+
+
+def bench_pdf():
+    from analyseur.report import build_quiz_report, warm_up
+
+    warm_up()  # fragments statiques parsés une fois par processus, hors mesure
+    return {
+        f"pdf_{category}": (lambda c=category: build_quiz_report(SAMPLE_SCORES[c], c, "Acme Corp", "Santé", "11-50 employés"))
+        for category in CATEGORIES
+    }
+
+
+def bench_email():
+    from analyseur.attachments import build_attachment
+    from analyseur.report import build_quiz_report
+
+    pdf_bytes = build_quiz_report(50, "faible", "Acme Corp")
+
+    def build_payload():
+        attachment, _ = build_attachment("rapport.pdf", pdf_bytes)
+        payload = {
+            "from": "no-reply@guillaumepicard.ca",
+            "to": ["bench@example.com"],
+            "subject": "Votre rapport de conformité AI Act - Score: 50/100",
+            "html": "<p>Benchmark</p>",
+            "attachments": [attachment],
+        }
+        return json.dumps(payload)  # sérialisation faite par Outbox.enqueue
+
+    return {"email_payload": build_payload}
+
+
+def bench_submit(tmp):
+    from streamlit.testing.v1 import AppTest
+
+    from analyseur import report
+    from analyseur.pdf_cache import PdfCache
+
+    # Stockage et outbox jetables
+    os.environ["STORAGE_URL"] = "sqlite:///" + os.path.join(tmp, "storage.sqlite3")
+    os.environ["OUTBOX_DB"] = os.path.join(tmp, "outbox.sqlite3")
+    # Cache PDF désactivé pour mesurer la génération : report.PDF_CACHE est construit à l'import
+    # du module (déjà fait par bench_pdf), PDF_CACHE_MAX_ITEMS n'y changerait plus rien
+    report.PDF_CACHE = PdfCache(max_items=0)
+    os.environ.setdefault("RESEND_API_URL", "http://127.0.0.1:9")  # aucun envoi réel
+    counter = iter(range(10 ** 9))
+
+    def submit():
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+        for radio in at.radio:
+            radio.set_value(radio.options[1])
+        at.text_input[1].set_value(f"bench{next(counter)}@example.com")  # nouvelle soumission à chaque fois
+        at.button[0].click().run()
+        if at.exception or not at.header:
+            raise RuntimeError("soumission en échec")
+
+    submit()  # chauffe : imports, caches de ressources
+    if report.PDF_CACHE.stats()["hits"]:
+        raise RuntimeError("cache PDF actif : la soumission ne mesurerait pas la génération")
+    return {"app_submit": submit}
+
+
+def measure(func, repeat):
+    """Meilleur temps par appel (µs), médiane des séries, nombre d'appels par série."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = sorted(t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number))
+    return {"best_us": round(runs[0], 3), "median_us": round(runs[len(runs) // 2], 3), "number": number}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def check(results, budget, baseline, tolerance):
+    failures = []
+    for name, result in results.items():
+        limit = budget.get(name)
+        if limit is not None and result["best_us"] > limit:
+            failures.append(f"{name} : {result['best_us']:.1f} µs > budget {limit} µs")
+        previous = (baseline or {}).get(name)
+        if previous and result["best_us"] > previous["best_us"] * (1 + tolerance):
+            failures.append(f"{name} : {result['best_us']:.1f} µs > référence "
+                            f"{previous['best_us']:.1f} µs +{tolerance * 100:.0f}%")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", help="ne mesurer que ces benchmarks (préfixe)")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET)
+    parser.add_argument("--baseline", help="résultats JSON d'un run précédent à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="régression tolérée vs --baseline (défaut 25%%)")
+    parser.add_argument("--json", help=f"fichier de résultats (défaut : {os.path.relpath(RESULTS_DIR, ROOT)}/hot_path-<commit>.json)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks = {**bench_scoring(), **bench_pdf(), **bench_email(), **bench_submit(tmp)}
+        if args.only:
+            benchmarks = {name: func for name, func in benchmarks.items()
+                          if any(name.startswith(prefix) for prefix in args.only)}
+
+        print(f"📊 Chemin critique du quiz (commit {commit}, meilleur de {args.repeat} séries)\n")
+        results = {}
+        for name, func in benchmarks.items():
+            results[name] = measure(func, args.repeat)
+            print(f"{name:20} : {results[name]['best_us']:12.1f} µs/appel "
+                  f"(médiane {results[name]['median_us']:.1f}, {results[name]['number']} appels/série)")
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    failures = check(results, budget, baseline, args.tolerance)
+
+    output = args.json or os.path.join(RESULTS_DIR, f"hot_path-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "commit": commit,
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "results": results,
+            "failures": failures,
+        }, f, indent=2)
+    print(f"\nRésultats : {output}")
+
+    if failures:
+        print("\n❌ Régression :\n  - " + "\n  - ".join(failures))
+        return 1
+    print("\n✅ Dans le budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark - reruns serveur par quiz complété, mode "live" vs mode "form" (QUIZ_MODE)
+Simule via AppTest un utilisateur qui remplit l'entreprise, les 10 questions
+et l'email puis soumet (nom d'entreprise différent à chaque quiz, stockage
+temporaire : chaque soumission est calculée, jamais dédupliquée). En mode live, le navigateur déclenche un run complet
+du script à chaque changement de widget ; en mode form, les changements
+restent côté navigateur jusqu'à la soumission. On compte les runs et on
+mesure le temps serveur cumulé par quiz.
+
+Usage : python benchmarks/bench_quiz_reruns.py [--quizzes N]
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+# Une entreprise par quiz : un jeu de réponses déjà stocké ne serait ni recalculé ni mesuré
+_QUIZ_NUMBERS = itertools.count(1)
+
+
+def complete_quiz(mode):
+    """Un quiz complet ; retourne (nombre de runs, temps serveur ms)."""
+    os.environ["QUIZ_MODE"] = mode
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    runs = []
+    company = f"Acme Corp {next(_QUIZ_NUMBERS)}"
+
+    def run():
+        start = time.perf_counter()
+        at.run()
+        runs.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    run()  # chargement de la page
+
+    # Interactions utilisateur : un run chacune en mode live, aucune en mode form
+    interactions = [lambda: at.text_input[0].set_value(company),
+                    lambda: at.selectbox[0].set_value("Santé"),
+                    lambda: at.selectbox[1].set_value("11-50 employés")]
+    for i in range(len(at.radio)):
+        interactions.append(lambda i=i: at.radio[i].set_value(at.radio[i].options[1]))
+    interactions.append(lambda: at.text_input[1].set_value(""))
+    for interact in interactions:
+        interact()
+        if mode == "live":
+            run()
+
+    at.button[0].click()
+    run()  # soumission
+    return len(runs), sum(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quizzes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("PDF_CACHE_MAX_ITEMS", "0")  # mesurer la génération PDF à chaque quiz
+        os.environ["STORAGE_URL"] = "sqlite:///" + os.path.join(tmp, "storage.sqlite3")
+        os.environ["OUTBOX_DB"] = os.path.join(tmp, "outbox.sqlite3")
+        complete_quiz("form")  # chauffe (imports, caches de module)
+
+        print("📊 Reruns par quiz complété\n")
+        results = {}
+        for mode in ("live", "form"):
+            samples = [complete_quiz(mode) for _ in range(args.quizzes)]
+            results[mode] = (samples[0][0], statistics.median(ms for _, ms in samples))
+            print(f"Mode {mode:4} : {results[mode][0]:3d} runs/quiz, {results[mode][1]:7.1f} ms serveur/quiz")
+
+    live, form = results["live"], results["form"]
+    print(f"\n✅ {live[0] - form[0]} runs évités par quiz, temps serveur -{(1 - form[1] / live[1]) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
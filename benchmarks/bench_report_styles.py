@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark - coût des styles reportlab par rapport PDF
+Compare getSampleStyleSheet() à chaque rapport (ancien code) et la feuille
+partagée analyseur.styles.get_stylesheet().
+
+Usage : python benchmarks/bench_report_styles.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from analyseur.styles import get_stylesheet
+
+
+def build_report(styles):
+    """Rapport type analyseur (app_final.py) avec la feuille de styles fournie."""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = [
+        Paragraph("Rapport Conformite RGPD / AI Act", styles['Title']),
+        Spacer(1, 20),
+        Paragraph("<b>Site analyse:</b> https://exemple.com", styles['Normal']),
+        Spacer(1, 12),
+        Paragraph("<b>Score global:</b> 75/100", styles['Heading2']),
+        Spacer(1, 20),
+        Paragraph("<b>Rapport:</b>", styles['Heading3']),
+        Spacer(1, 8),
+        Paragraph("Pas de bandeau cookies<br/>Politique de confidentialite absente", styles['Normal']),
+    ]
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    get_stylesheet()  # construction unique, hors mesure
+
+    stylesheet_fresh = min(timeit.repeat(getSampleStyleSheet, number=args.number, repeat=3)) / args.number
+    stylesheet_shared = min(timeit.repeat(get_stylesheet, number=args.number, repeat=3)) / args.number
+    report_fresh = min(timeit.repeat(lambda: build_report(getSampleStyleSheet()), number=args.number // 5, repeat=3)) / (args.number // 5)
+    report_shared = min(timeit.repeat(lambda: build_report(get_stylesheet()), number=args.number // 5, repeat=3)) / (args.number // 5)
+
+    print("📊 Styles reportlab par rapport\n")
+    print(f"getSampleStyleSheet()      : {stylesheet_fresh * 1e6:8.1f} µs")
+    print(f"get_stylesheet() (partagé) : {stylesheet_shared * 1e6:8.1f} µs")
+    print(f"Rapport complet (ancien)   : {report_fresh * 1e3:8.2f} ms")
+    print(f"Rapport complet (partagé)  : {report_shared * 1e3:8.2f} ms")
+    print(f"\n✅ Gain par rapport : {(report_fresh - report_shared) * 1e3:.2f} ms "
+          f"({(1 - report_shared / report_fresh) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark - vérifications RGPD déterministes (analyseur/rgpd.py)
+Mesure check_site() sur le site de démonstration local (analyseur/fixture_site.py)
+puis sur une page synthétique de plusieurs Mo, et affiche les constats :
+points tranchés sans LLM, taille du prompt restant pour les points ambigus.
+
+Usage : python benchmarks/bench_rgpd_rules.py [--repeat N] [--large-mb N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyseur.crawler import Page, PageParser, SiteModel, crawl_site
+from analyseur.fixture_site import start_server
+from analyseur.rgpd import check_site
+
+
+def synthetic_site(megabytes):
+    """Une page de `megabytes` Mo : articles, scripts inline, pied de page légal à la fin."""
+    block = ('<div class="post"><h2>Titre</h2><p>' + "Texte de l'article sans rapport. " * 20 + "</p>"
+             '<script>var x = {"a": 1};</script><a href="/article">Lire</a></div>\n')
+    body = block * (megabytes * 1024 * 1024 // len(block))
+    html = (f"<html><body>{body}<footer><a href='/mentions-legales'>Mentions légales</a>"
+            f"<a href='/confidentialite'>Politique de confidentialité</a></footer></body></html>")
+    parser = PageParser("https://exemple.com/")
+    parser.feed(html)
+    parser.close()
+    page = Page("https://exemple.com/", 200, "text/html", 0, "", html, (), (), tuple(parser.forms),
+                tuple(parser.scripts), (), (), False, 0.0)
+    return SiteModel("https://exemple.com/", (page,), (), False, (), {})
+
+
+def measure(label, site, repeat):
+    size = sum(len(page.html) for page in site.pages)
+    seconds = min(timeit.repeat(lambda: check_site(site), number=1, repeat=repeat))
+    report = check_site(site)
+    print(f"{label:<28} {size / 1024:9.0f} Ko  {seconds * 1000:8.1f} ms  ({size / seconds / 1e6:.1f} Mo/s)")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--large-mb", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_server(slow=0.1)
+    site = crawl_site(server.url, allow_private=True)
+    server.shutdown()
+
+    print("📊 check_site() - meilleur de", args.repeat, "essais\n")
+    report = measure(f"site de démonstration ({len(site.pages)} p.)", site, args.repeat)
+    measure(f"page synthétique {args.large_mb} Mo", synthetic_site(args.large_mb), args.repeat)
+
+    print()
+    print(report.text())
+    ambiguous = report.ambiguous()
+    if ambiguous:
+        prompt = report.prompt(site.start_url)
+        print(f"\n❓ {len(ambiguous)} point(s) ambigu(s) : prompt LLM de {len(prompt)} caractères")
+    else:
+        print("\n✅ Aucun point ambigu : étape RGPD sans appel LLM")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
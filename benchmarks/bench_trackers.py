@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark - index de signatures des traceurs (analyseur/trackers.py)
+Pages synthétiques avec des milliers de balises <script> (src connues et
+inconnues, snippets inline) et un gros script inline minifié : durée de
+scan_site() et inventaire trouvé. Vérifie aussi que les scripts neutralisés
+(type="text/plain") ne sont pas comptés comme chargés.
+
+Usage : python benchmarks/bench_trackers.py [--scripts N] [--inline-kb N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyseur.crawler import Cookie, Page, Script, SiteModel
+from analyseur.trackers import SIGNATURES, scan_site
+
+SNIPPETS = [
+    "!function(f,b,e,v){f.fbq=function(){}}(window,document,'script','https://connect.facebook.net/en_US/fbevents.js');",
+    "(function(h,o,t,j){h.hj=h.hj||function(){};h._hjSettings={hjid:1};})(window,document,'https://static.hotjar.com/c/hotjar-');",
+    "var _paq = window._paq = window._paq || []; _paq.push(['trackPageView']);",
+    "window.intercomSettings = {app_id: 'abc'};",
+]
+
+
+def synthetic_site(scripts, inline_kb, seed=1):
+    rng = random.Random(seed)
+    domains = [d for s in SIGNATURES for d in s.domains] + [f"cdn{i}.exemple-{i}.com" for i in range(200)]
+    page_scripts = []
+    for i in range(scripts):
+        if i % 10 == 0:
+            page_scripts.append(Script("", rng.choice(SNIPPETS), ""))
+        else:
+            page_scripts.append(Script(f"https://{rng.choice(domains)}/lib/{i}.js", "",
+                                       "text/plain" if i % 7 == 0 else ""))
+    # Gros bundle minifié : identifiants courts, aucune signature
+    words = ["a", "b", "e", "t", "n", "r", "i", "o", "function", "return", "var", "this", "null"]
+    bundle = ";".join(f"{rng.choice(words)}.{rng.choice(words)}({rng.randint(0, 999)})"
+                      for _ in range(inline_kb * 1024 // 12))
+    page_scripts.append(Script("", bundle, ""))
+    cookies = (Cookie("_ga", "", "/", False, False, "Lax", True), Cookie("_fbp", "", "/", False, False, "Lax", True),
+               Cookie("session", "", "/", True, True, "Strict", False))
+    pages = tuple(Page(f"https://exemple.com/page-{n}", 200, "text/html", 0, "", "", (), (), (),
+                       tuple(page_scripts), ("https://www.youtube.com/embed/x",), cookies, False, 0.0)
+                  for n in range(3))
+    return SiteModel("https://exemple.com/", pages, (), False, (), {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scripts", type=int, default=5000, help="balises <script> par page (3 pages)")
+    parser.add_argument("--inline-kb", type=int, default=1024, help="taille du bundle inline par page (Ko)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    site = synthetic_site(args.scripts, args.inline_kb)
+    seconds = min(timeit.repeat(lambda: scan_site(site), number=1, repeat=args.repeat))
+    inventory = scan_site(site)
+    total_scripts = sum(len(page.scripts) for page in site.pages)
+    inline_bytes = sum(len(s.inline) for page in site.pages for s in page.scripts)
+
+    print(f"📊 scan_site() - {len(SIGNATURES)} signatures, meilleur de {args.repeat} essais\n")
+    print(f"Pages / scripts       : {len(site.pages)} / {total_scripts}")
+    print(f"Scripts inline        : {inline_bytes / 1024:.0f} Ko")
+    print(f"Durée                 : {seconds * 1000:.1f} ms "
+          f"({seconds / total_scripts * 1e6:.2f} µs par script, inline compris)")
+    print(f"Fournisseurs trouvés  : {len(inventory.by_vendor())}, dont {len(inventory.requiring_consent())} "
+          f"exigeant un consentement, {len(inventory.ai_vendors())} d'IA")
+
+    blocked_only = [vendor for vendor, found in inventory.by_vendor().items() if all(d.blocked for d in found)]
+    loaded = inventory.requiring_consent()
+    checks = {
+        "snippets inline reconnus (Meta Pixel, Hotjar, Matomo, Intercom)":
+            all(v in loaded for v in ("Meta Pixel", "Hotjar", "Matomo", "Intercom")),
+        "cookies reconnus (_ga, _fbp)": any(d.source == "cookie" for d in inventory.detections),
+        "scripts neutralisés non comptés": not any(vendor in loaded for vendor in blocked_only),
+    }
+    print()
+    for label, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {label}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,9 @@
 """
 Test Resend - Environnement propre sans CrewAI
 Teste si l'envoi PDF fonctionne maintenant
+
+Sans envoi réel : lancer `python -m analyseur.fake_resend` puis
+RESEND_API_URL=http://127.0.0.1:8025 python test_resend_clean_env.py
 """
 
 import os
@@ -11,6 +14,8 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from io import BytesIO
 
+from analyseur.attachments import build_attachment
+
 load_dotenv()
 
 print("🧪 Test Resend - Environnement propre\n")
@@ -59,12 +64,15 @@ doc.build(story)
 pdf_bytes = buffer.getvalue()
 print(f"✅ PDF généré ({len(pdf_bytes)} octets)")
 
-# 4. Test envoi Resend (METHODE 2 qui fonctionnait)
+# 4. Test envoi Resend (pièce jointe en base64)
 print("\n📧 Test envoi email...")
 
 try:
     from resend import Emails
     
+    attachment, stats = build_attachment("rapport_test.pdf", pdf_bytes)
+    print(f"   Pièce jointe : {stats['payload_bytes']} octets en {stats['encode_ms']} ms ({stats['encoding']})")
+    
     result = Emails.send({
         "from": "no-reply@guillaumepicard.ca",
         "to": ["info.guillaume@gmail.com"],  # Ton email
@@ -75,10 +83,7 @@ try:
             alors Resend fonctionne parfaitement dans le nouvel environnement!</p>
             <p>✅ Pas de CrewAI = Pas de bugs!</p>
         """,
-        "attachments": [{
-            "filename": "rapport_test.pdf",
-            "content": list(pdf_bytes),  # Méthode 2 qui fonctionnait
-        }],
+        "attachments": [attachment],
     })
     
     print(f"✅ Email envoyé avec succès!")